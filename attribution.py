@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""
+Created on         : 17/10/2026
+Last modified on   : 17/10/2026
+Author             : Satyabrat Borgohain
+Description :
+
+    This class attributes works to authors from their stopword, character and
+    word length profiles. The relative frequencies of the features are
+    z-scored across the corpus and compared with the centroid of each author
+    using Burrows' Delta (mean absolute difference of the z-scores) or the
+    cosine distance, computed for all the works and authors at once as NumPy
+    matrix operations.
+
+    Objects of this class can be created for standalone puposes.
+"""
+
+
+
+import os
+import numpy as np
+
+#Statistics used for the profiles by default
+DEFAULT_STATISTICS = ('stop_freq', 'char_freq', 'word_len_freq')
+#Maximum number of elements of the temporary arrays of Burrows' Delta
+BLOCK_ELEMENTS = 1 << 24
+
+def author_from_name(work):
+    """Extracts the author from the name of a work, e.g. Hamlet_Shakespeare.tok.
+
+    Arguments:
+        work (string): The name or path of the work.
+
+    Returns:
+        author (string): The part of the name after the last underscore.
+
+    """
+
+    name = os.path.splitext(os.path.basename(work))[0]
+    return name.rsplit('_', 1)[-1]
+
+
+def profile_matrix(store, statistics=DEFAULT_STATISTICS):
+    """Builds the works x features relative frequency matrix of a store.
+
+    Arguments:
+        store (FeatureStore): The store of the works.
+        statistics (tuple): The statistics used as features.
+
+    Returns:
+        profiles (numpy array): The relative frequencies, one row per work.
+        features (list): The (statistic, label) of each column.
+
+    """
+
+    profiles = np.hstack([store.get_frequencies(name) for name in statistics])
+    features = [(name, label) for name in statistics
+                for label in store.vocabularies[name].labels]
+    return profiles, features
+
+
+class AuthorshipAttributor:
+    """An attributor class comparing works with the centroids of known authors.
+
+    """
+
+    def __init__(self, profiles, authors):
+        """Initializes an AuthorshipAttributor object from the profiles of the
+        works of known authors.
+
+        The mean and standard deviation of every feature across these works are
+        used to z-score all the profiles, and each author's centroid is the
+        mean of the z-scores of their works.
+
+        Arguments:
+            profiles (numpy array): The works x features relative frequencies.
+            authors (list): The author of each work.
+
+        """
+
+        profiles = np.asarray(profiles, dtype=np.float64)
+        self.mean = profiles.mean(axis=0)
+        std = profiles.std(axis=0)
+        #Features constant across the corpus carry no information
+        self.std = np.where(std > 0, std, 1.0)
+        self.authors = sorted(set(authors))
+
+        ids = dict((x, i) for i, x in enumerate(self.authors))
+        self.labels = np.array([ids[x] for x in authors], dtype=np.int64)
+        self.zscores = self.standardise(profiles)
+        self.sizes = np.bincount(self.labels, minlength=len(self.authors))
+        #Summing the z-scores of each author's works, grouped by sorting
+        order = np.argsort(self.labels, kind='stable')
+        starts = np.searchsorted(self.labels[order], np.arange(len(self.authors)))
+        self.sums = np.add.reduceat(self.zscores[order], starts, axis=0)
+        self.centroids = self.sums / self.sizes[:, None]
+
+
+    def __str__(self):
+        """Prints the authors and their number of works as a formatted string.
+
+        Returns:
+            The authors as a formatted string.
+
+        """
+
+        prefix = 'Authors : \n' + "======================\n"
+        suffix = "\n======================"
+        return prefix + '\n'.join('%s (%d)' % (x, n) for x, n in
+                                  zip(self.authors, self.sizes)) + suffix
+
+
+    def standardise(self, profiles):
+        """Converts relative frequencies to z-scores across the corpus.
+
+        Arguments:
+            profiles (numpy array): The works x features relative frequencies.
+
+        Returns:
+            zscores (numpy array): The z-scores.
+
+        """
+
+        return (np.asarray(profiles, dtype=np.float64) - self.mean) / self.std
+
+
+    def distances(self, profiles, method='delta'):
+        """Computes the distances of works to the centroids of all the authors.
+
+        Function for z-scoring the profiles and comparing them with every
+        centroid. Burrows' Delta is computed in blocks of works so that the
+        temporary works x authors x features array stays small.
+
+        Arguments:
+            profiles (numpy array): The works x features relative frequencies.
+            method (string): 'delta' for Burrows' Delta or 'cosine'.
+
+        Returns:
+            distances (numpy array): The works x authors distances.
+
+        """
+
+        zscores = self.standardise(np.atleast_2d(profiles))
+        return self._distances(zscores, self.centroids, method)
+
+
+    def _distances(self, zscores, centroids, method):
+        """Computes the distances of z-scores to centroids.
+
+        Arguments:
+            zscores (numpy array): The works x features z-scores.
+            centroids (numpy array): The authors x features centroids.
+            method (string): 'delta' for Burrows' Delta or 'cosine'.
+
+        Returns:
+            distances (numpy array): The works x authors distances.
+
+        """
+
+        if method == 'cosine':
+            norms = np.linalg.norm(zscores, axis=1)[:, None] * np.linalg.norm(centroids, axis=1)
+            similarity = (zscores @ centroids.T) / np.where(norms > 0, norms, 1.0)
+            return 1.0 - similarity
+        if method != 'delta':
+            raise ValueError('Unknown distance : ' + str(method))
+
+        distances = np.empty((len(zscores), len(centroids)))
+        block = max(1, BLOCK_ELEMENTS // max(1, centroids.size))
+        for start in range(0, len(zscores), block):
+            stop = start + block
+            distances[start:stop] = np.abs(zscores[start:stop, None, :] -
+                                           centroids[None, :, :]).mean(axis=2)
+        return distances
+
+
+    def attribute(self, profiles, method='delta'):
+        """Attributes works to their nearest author.
+
+        Arguments:
+            profiles (numpy array): The works x features relative frequencies.
+            method (string): 'delta' for Burrows' Delta or 'cosine'.
+
+        Returns:
+            authors (list): The nearest author of each work.
+            distances (numpy array): The works x authors distances.
+
+        """
+
+        distances = self.distances(profiles, method)
+        return [self.authors[i] for i in distances.argmin(axis=1)], distances
+
+
+    def leave_one_out(self, method='delta'):
+        """Attributes each known work with its own work left out of its author's
+        centroid.
+
+        Function for checking the attribution on the known works. The centroid
+        of a work's own author is recomputed without it for all the works at
+        once; an author with a single work cannot be attributed to.
+
+        Arguments:
+            method (string): 'delta' for Burrows' Delta or 'cosine'.
+
+        Returns:
+            authors (list): The nearest author of each work.
+            distances (numpy array): The works x authors distances.
+
+        """
+
+        distances = self._distances(self.zscores, self.centroids, method)
+        sizes = self.sizes[self.labels]
+        #Centroid of each work's own author without the work
+        own = (self.sums[self.labels] - self.zscores) / np.maximum(sizes - 1, 1)[:, None]
+        if method == 'cosine':
+            norms = np.linalg.norm(self.zscores, axis=1) * np.linalg.norm(own, axis=1)
+            own_distances = 1.0 - ((self.zscores * own).sum(axis=1) /
+                                   np.where(norms > 0, norms, 1.0))
+        else:
+            own_distances = np.abs(self.zscores - own).mean(axis=1)
+        own_distances[sizes < 2] = np.inf
+        distances[np.arange(len(distances)), self.labels] = own_distances
+
+        return [self.authors[i] for i in distances.argmin(axis=1)], distances
@@ -0,0 +1,906 @@
+# -*- coding: utf-8 -*-
+"""
+Created on         : 17/10/2026
+Last modified on   : 17/10/2026
+Author             : Satyabrat Borgohain
+Description :
+
+    This script benchmarks the analysis pipeline on the tokenised works of a
+    dataset folder. It compares the separate CharacterAnalyser and WordAnalyser
+    passes with the single pass FeatureExtractor and checks that both produce
+    the same statistics, measures how the rolling window analysis scales
+    with the length of the text, and compares the tokeniser, which classifies every
+    distinct token once, with matching every token against the word regex.
+    The startup benchmark measures the import time of the modules with
+    python -X importtime and the run time of short counts-only invocations.
+
+    The similarity benchmark computes the distance matrix of a synthetic
+    corpus of profiles within a memory budget, and compares the queries of the
+    nearest neighbour index with full scans of the corpus, with their recall.
+
+    The sketch benchmark counts the vocabulary of the works, or of a synthetic
+    Zipfian stream of words, exactly and with a WordSketch, and compares their
+    time, memory and accuracy.
+
+    The stages benchmark times every stage of the analysis and visualisation
+    separately, with its throughput and peak memory, and the scaling benchmark
+    repeats the analysis stages on synthetic works of growing length. The
+    synthetic corpora are sampled from the vocabulary of the dataset, and the
+    results can be written to JSON to compare them across commits.
+
+    Usage : python benchmark.py [extraction] [rolling] [tokenisation] [startup]
+                                [stages] [scaling] [similarity] [sketch]
+                                [--dataset sample_dataset]
+                                [--repeat 5] [--synthetic 100000] [--works 6]
+                                [--sizes 10000 100000] [--json results.json]
+"""
+
+
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import platform
+import tempfile
+import functools
+import subprocess
+import tracemalloc
+import argparse
+import main
+import preprocessor as prpscr
+import character as char
+import word
+import extractor as extr
+import lexicon
+import rolling
+import attribution as attr
+import similarity as sim
+import sketch as skt
+from collections import Counter
+
+def separate_analysis(tokens, stopwords):
+    """Analyses the tokens with the separate character and word analysers.
+
+    Arguments:
+        tokens (list): The list of tokens.
+        stopwords (list): The stopwords to be analysed.
+
+    Returns:
+        A list of the character, punctuation, stopword and word length dataframes.
+
+    """
+
+    char_analyser = char.CharacterAnalyser()
+    char_analyser.analyse_characters(tokens)
+    word_analyser = word.WordAnalyser()
+    word_analyser.analyse_words(tokens)
+    return [char_analyser.char_occ, char_analyser.get_punctuation_frequency(),
+            word_analyser.get_stopword_frequency(stopwords),
+            word_analyser.get_word_length_frequency()]
+
+
+def fused_analysis(tokens, stopwords):
+    """Analyses the tokens with the single pass feature extractor.
+
+    Arguments:
+        tokens (list): The list of tokens.
+        stopwords (list): The stopwords to be analysed.
+
+    Returns:
+        A list of the character, punctuation, stopword and word length dataframes.
+
+    """
+
+    extractor = extr.FeatureExtractor(stopwords)
+    extractor.extract(tokens)
+    return [extractor.get_character_frequency(), extractor.get_punctuation_frequency(),
+            extractor.get_stopword_frequency(), extractor.get_word_length_frequency()]
+
+
+def split_and_match(text):
+    """Counts the words of a text by splitting it on spaces and matching every
+    token against the uncompiled word regex, as done before the tokeniser.
+
+    Arguments:
+        text (string): The tokenised text.
+
+    Returns:
+        word_count (Counter): The occurrences keyed by uppercased word.
+
+    """
+
+    tokens = text.replace('\n', ' ').split(' ')
+    return Counter([token.upper() for token in tokens if
+                    re.match("^\\d*['-]*[a-zA-Z][a-zA-Z0-9'-]*$", token)])
+
+
+def scan_and_classify(text):
+    """Counts the words of a text classified by the tokeniser.
+
+    Arguments:
+        text (string): The tokenised text.
+
+    Returns:
+        word_count (Counter): The occurrences keyed by uppercased word.
+
+    """
+
+    pre_processor = prpscr.Preprocessor()
+    pre_processor.tokenise(text)
+    words = pre_processor.get_classified_tokens('word')
+    return Counter(' '.join(words).upper().split(' ') if words else [])
+
+
+def best_time(function, args, repeat):
+    """Times a function and returns the best of a number of runs.
+
+    Arguments:
+        function (function): The function to be timed.
+        args (tuple): The arguments of the function.
+        repeat (int): The number of runs.
+
+    Returns:
+        best (float): The shortest run time in seconds.
+
+    """
+
+    best = float('inf')
+    for i in range(0, repeat):
+        start = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark_fused_extraction(paths, stopwords, repeat=5):
+    """Benchmarks the separate analysers against the feature extractor.
+
+    Function for timing both analysis paths on every work, printing a table of
+    the timings and checking that both paths give the same occurrences.
+
+    Arguments:
+        paths (list): The paths of the tokenised works.
+        stopwords (list): The stopwords to be analysed.
+        repeat (int): The number of runs per work.
+
+    Returns:
+        results (dict): The timings in seconds for each work.
+
+    """
+
+    results = {}
+    print('%-36s %12s %12s %9s' % ('work', 'separate (s)', 'fused (s)', 'speedup'))
+    for path in paths:
+        pre_processor = prpscr.Preprocessor()
+        pre_processor.tokenise(main.read_input(path))
+        tokens = pre_processor.get_tokenised_list()
+
+        #Checking that both paths produce the same occurrences
+        for expected, actual in zip(separate_analysis(tokens, stopwords),
+                                    fused_analysis(tokens, stopwords)):
+            if list(expected['occurence']) != list(actual['occurence']):
+                raise ValueError('Mismatching occurrences for ' + path)
+
+        separate = best_time(separate_analysis, (tokens, stopwords), repeat)
+        fused = best_time(fused_analysis, (tokens, stopwords), repeat)
+        results[os.path.basename(path)] = {'separate': separate, 'fused': fused}
+        print('%-36s %12.4f %12.4f %8.1fx' % (os.path.basename(path), separate,
+                                              fused, separate / fused))
+
+    return results
+
+
+def benchmark_rolling(tokens, window=5000, step=500, scales=(1, 2, 4, 8)):
+    """Benchmarks the rolling window analysis on texts of growing length.
+
+    Function for timing the incremental rolling analysis against extracting
+    every window from scratch, on the tokens repeated a number of times. The
+    incremental analysis should grow linearly with the number of tokens.
+
+    Arguments:
+        tokens (list): The tokens of a work.
+        window (int): The number of tokens in a window.
+        step (int): The number of tokens between the starts of two windows.
+        scales (tuple): The numbers of times the tokens are repeated.
+
+    Returns:
+        results (dict): The timings in seconds for each number of tokens.
+
+    """
+
+    stopwords = lexicon.get_stopwords()
+    results = {}
+    print('%10s %8s %12s %17s %12s' % ('tokens', 'windows', 'rolling (s)',
+                                       'from scratch (s)', 'tokens/s'))
+    for scale in scales:
+        text = [x for x in tokens if x != '']*scale
+        analyser = rolling.RollingAnalyser(window, step, stopwords)
+        start = time.perf_counter()
+        windows = len(analyser.analyse(text))
+        incremental = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for i in range(0, max(1, len(text) - window + 1), step):
+            extractor = extr.FeatureExtractor(stopwords)
+            extractor.extract(text[i:i + window])
+            extractor.get_counts()
+        scratch = time.perf_counter() - start
+
+        results[len(text)] = {'windows': windows, 'rolling': incremental,
+                              'scratch': scratch}
+        print('%10d %8d %12.4f %17.4f %12.0f' % (len(text), windows, incremental,
+                                                 scratch, len(text) / incremental))
+
+    return results
+
+
+def benchmark_tokenisation(paths, repeat=5):
+    """Benchmarks the tokeniser against splitting and matching every token.
+
+    Function for timing the word counts of both paths on every work, checking
+    that they find the same words, and timing the raw text tokenisation.
+
+    Arguments:
+        paths (list): The paths of the tokenised works.
+        repeat (int): The number of runs per work.
+
+    Returns:
+        results (dict): The timings in seconds for each work.
+
+    """
+
+    results = {}
+    print('%-36s %12s %12s %9s %12s %12s' % ('work', 'split (s)', 'tokenise (s)', 'speedup',
+                                             'raw (s)', 'raw tokens/s'))
+    for path in paths:
+        with open(path, 'r') as file:
+            text = file.read()
+        if split_and_match(text) != scan_and_classify(text):
+            raise ValueError('Mismatching words for ' + path)
+
+        split = best_time(split_and_match, (text,), repeat)
+        scan = best_time(scan_and_classify, (text,), repeat)
+        pre_processor = prpscr.Preprocessor()
+        raw = best_time(pre_processor.tokenise, (text, True), repeat)
+        results[os.path.basename(path)] = {'split': split, 'scan': scan, 'raw': raw}
+        print('%-36s %12.4f %12.4f %8.1fx %12.4f %12.0f' % (
+            os.path.basename(path), split, scan, split / scan, raw,
+            len(pre_processor.get_tokenised_list()) / raw))
+
+    return results
+
+
+def import_times(statement):
+    """Measures the import time of the modules loaded by a statement.
+
+    Function for running the statement in a fresh interpreter with
+    python -X importtime and reading the time reported for every module.
+
+    Arguments:
+        statement (string): The Python statement, e.g. 'import main'.
+
+    Returns:
+        times (dict): The cumulative import time in microseconds of every
+            module loaded, keyed by name.
+        total (int): The import time of the top level modules in microseconds.
+
+    """
+
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                            capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    times = {}
+    total = 0
+    for line in result.stderr.splitlines():
+        fields = line[len('import time:'):].split('|')
+        if not line.startswith('import time:') or not fields[0].strip().isdigit():
+            continue
+        times[fields[2].strip()] = int(fields[1])
+        #Nested imports are indented below the module importing them
+        if not fields[2][1:].startswith(' '):
+            total += int(fields[1])
+    return times, total
+
+
+def benchmark_startup(paths, repeat=5):
+    """Benchmarks the startup of the analyser.
+
+    Function for printing the import time of the main modules and which heavy
+    libraries they load, and the best run time of main.py on one work with
+    only the counts and with the feature store but without plots.
+
+    Arguments:
+        paths (list): The paths of the tokenised works.
+        repeat (int): The number of runs of each invocation.
+
+    Returns:
+        results (dict): The import times and run times in seconds.
+
+    """
+
+    heavy = ('numpy', 'pandas', 'matplotlib', 'requests', 'lxml')
+    results = {}
+    print('%-24s %12s   %s' % ('statement', 'import (s)', 'heavy libraries loaded'))
+    for module in ('main', 'extractor', 'featurestore', 'word', 'visualiser'):
+        times, total = import_times('import ' + module)
+        results['import ' + module] = total / 1e6
+        print('%-24s %12.4f   %s' % ('import ' + module, total / 1e6,
+                                     ', '.join(x for x in heavy if x in times) or '-'))
+
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'main.py')
+    runs = {'counts only': ['--counts-only'], 'no plot': ['--no-plot']}
+    print('%-24s %12s' % ('main.py on one work', 'run (s)'))
+    for name, options in runs.items():
+        command = [sys.executable, '-W', 'ignore', script, paths[0], '--no-cache'] + options
+        run = best_time(functools.partial(subprocess.run, stdout=subprocess.DEVNULL,
+                                          check=True), (command,), repeat)
+        results[name] = run
+        print('%-24s %12.4f' % (name, run))
+
+    return results
+
+
+def generate_corpus(directory, works=6, tokens_per_work=100000, dataset='sample_dataset',
+                    seed=0):
+    """Generates a synthetic corpus of tokenised works.
+
+    Function for writing works whose tokens are drawn from the vocabulary of
+    the works of the same author in the dataset, with the same frequencies,
+    and whose lines have the lengths of that author's lines. The authors take
+    turns, so the synthetic works can also be attributed.
+
+    Arguments:
+        directory (string): The folder the works are written to.
+        works (int): The number of works.
+        tokens_per_work (int): The number of tokens of each work.
+        dataset (string): The folder of the tokenised works sampled.
+        seed (int): The seed of the random generator.
+
+    Returns:
+        paths (list): The paths of the synthetic works.
+
+    """
+
+    #Counting the tokens and line lengths of each author once
+    vocabularies = {}
+    for path in main.find_works([dataset]):
+        author = attr.author_from_name(path)
+        token_count, line_lengths = vocabularies.setdefault(author, (Counter(), []))
+        with open(path, 'r') as file:
+            for line in file:
+                tokens = line.split()
+                if tokens:
+                    token_count.update(tokens)
+                    line_lengths.append(len(tokens))
+
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    authors = sorted(vocabularies)
+    paths = []
+    for i in range(0, works):
+        author = authors[i % len(authors)]
+        token_count, line_lengths = vocabularies[author]
+        tokens = rng.choices(list(token_count), weights=list(token_count.values()),
+                                k=tokens_per_work)
+        lengths = rng.choices(line_lengths, k=tokens_per_work // min(line_lengths) + 1)
+        path = os.path.join(directory, 'Synthetic%02d_%s.tok' % (i + 1, author))
+        with open(path, 'w') as file:
+            start = 0
+            for length in lengths:
+                if start >= len(tokens):
+                    break
+                file.write(' '.join(tokens[start:start + length]) + '\n')
+                start += length
+        paths.append(path)
+
+    return paths
+
+
+def run_stage(function, args, repeat=1, measure_memory=True):
+    """Runs a stage of the pipeline, timing it and measuring its memory.
+
+    Function for running the stage once under tracemalloc to find the peak of
+    the memory it allocates, then timing it without tracing, which would slow
+    it down.
+
+    Arguments:
+        function (function): The stage.
+        args (tuple): The arguments of the stage.
+        repeat (int): The number of timed runs.
+        measure_memory (bool): Whether the peak memory is measured.
+
+    Returns:
+        result: The result of the stage.
+        seconds (float): The shortest run time in seconds.
+        peak (int): The peak of the memory allocated in bytes, None if not
+            measured.
+
+    """
+
+    peak = None
+    if measure_memory:
+        tracemalloc.start()
+        try:
+            function(*args)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    seconds = float('inf')
+    for i in range(0, max(1, repeat)):
+        start = time.perf_counter()
+        result = function(*args)
+        seconds = min(seconds, time.perf_counter() - start)
+    return result, seconds, peak
+
+
+def render_in(visualiser, method, directory):
+    """Draws a visualisation into a new folder, so that no figure is skipped
+    as unchanged.
+
+    Arguments:
+        visualiser (AnalysisVisualiser): The visualiser.
+        method (string): The name of the visualisation method.
+        directory (string): The folder the new folder is created in.
+
+    """
+
+    visualiser.output_dir = tempfile.mkdtemp(dir=directory)
+    getattr(visualiser, method)()
+
+
+def print_stages(results):
+    """Prints the timings of the stages as a table.
+
+    Arguments:
+        results (dict): The timings of each stage, as returned by benchmark_stages.
+
+    """
+
+    print('%-32s %10s %14s %12s' % ('stage', 'time (s)', 'tokens/s', 'peak (MB)'))
+    for stage, result in results.items():
+        peak = '-' if result['peak_bytes'] is None else '%.2f' % (result['peak_bytes'] / 2**20)
+        print('%-32s %10.4f %14.0f %12s' % (stage, result['seconds'],
+                                            result['tokens_per_second'], peak))
+
+
+def benchmark_stages(paths, repeat=3, visualise=True, measure_memory=True, verbose=True):
+    """Benchmarks every stage of the analysis separately.
+
+    Function for timing the reading, tokenising and analysis of every work
+    with the CharacterAnalyser and WordAnalyser and their getters, then the
+    creation of the AnalysisVisualiser and each visualisation of all the
+    works, whose figures are saved to a temporary folder. The times of the
+    per work stages are summed over the works.
+
+    Arguments:
+        paths (list): The paths of the tokenised works.
+        repeat (int): The number of timed runs of each stage.
+        visualise (bool): Whether the visualisation stages are benchmarked.
+        measure_memory (bool): Whether the peak memory of each stage is measured.
+        verbose (bool): Whether the results are printed.
+
+    Returns:
+        results (dict): The time in seconds, throughput in tokens per second
+            and peak memory in bytes of each stage.
+
+    """
+
+    import pandas as pd
+    import visualiser as vis
+
+    stopwords = lexicon.get_stopwords()
+    totals = {}
+    tokens_count = 0
+    all_stats = []
+
+    def record(stage, seconds, peak):
+        total = totals.setdefault(stage, {'seconds': 0.0, 'peak_bytes': None})
+        total['seconds'] += seconds
+        if peak is not None:
+            total['peak_bytes'] = max(total['peak_bytes'] or 0, peak)
+
+    for path in paths:
+        text, seconds, peak = run_stage(main.read_input, (path,), repeat, measure_memory)
+        record('read_input', seconds, peak)
+        pre_processor = prpscr.Preprocessor()
+        result, seconds, peak = run_stage(pre_processor.tokenise, (text,), repeat, measure_memory)
+        record('tokenise', seconds, peak)
+        tokens = pre_processor.get_tokenised_list()
+        tokens_count += len(tokens)
+
+        char_analyser = char.CharacterAnalyser()
+        result, seconds, peak = run_stage(char_analyser.analyse_characters, (tokens,),
+                                          repeat, measure_memory)
+        record('analyse_characters', seconds, peak)
+        punc_occ, seconds, peak = run_stage(char_analyser.get_punctuation_frequency, (),
+                                            repeat, measure_memory)
+        record('get_punctuation_frequency', seconds, peak)
+
+        word_analyser = word.WordAnalyser()
+        result, seconds, peak = run_stage(word_analyser.analyse_words, (tokens,),
+                                          repeat, measure_memory)
+        record('analyse_words', seconds, peak)
+        stop_occ, seconds, peak = run_stage(word_analyser.get_stopword_frequency, (stopwords,),
+                                            repeat, measure_memory)
+        record('get_stopword_frequency', seconds, peak)
+        wl_occ, seconds, peak = run_stage(word_analyser.get_word_length_frequency, (),
+                                          repeat, measure_memory)
+        record('get_word_length_frequency', seconds, peak)
+        all_stats.append([os.path.basename(path), char_analyser.char_occ, punc_occ,
+                          stop_occ, wl_occ])
+
+    if visualise:
+        all_text_stats = pd.DataFrame(all_stats, columns=['work', 'char_freq', 'punc_freq',
+                                                          'stop_freq', 'word_len_freq'])
+        with tempfile.TemporaryDirectory() as directory:
+            visualiser, seconds, peak = run_stage(vis.AnalysisVisualiser,
+                                                  (all_text_stats, stopwords, directory),
+                                                  repeat, measure_memory)
+            record('AnalysisVisualiser', seconds, peak)
+            for method in ('visualise_character_frequency', 'visualise_punctuation_frequency',
+                           'visualise_stopword_frequency', 'visualise_word_length_frequency'):
+                result, seconds, peak = run_stage(render_in, (visualiser, method, directory),
+                                                  repeat, measure_memory)
+                record(method, seconds, peak)
+
+    for total in totals.values():
+        total['tokens_per_second'] = tokens_count / max(total['seconds'], 1e-9)
+    if verbose:
+        print('%d works, %d tokens' % (len(paths), tokens_count))
+        print_stages(totals)
+
+    return totals
+
+
+def benchmark_scaling(sizes=(10000, 50000, 100000, 500000), works=2, repeat=3,
+                      dataset='sample_dataset', measure_memory=True):
+    """Benchmarks how the per work stages scale with the length of the works.
+
+    Function for generating synthetic corpora of works of growing length and
+    timing the stages of benchmark_stages on each, without the visualisations
+    which depend on the number of works rather than their length.
+
+    Arguments:
+        sizes (tuple): The numbers of tokens per work.
+        works (int): The number of works of each corpus.
+        repeat (int): The number of timed runs of each stage.
+        dataset (string): The folder of the tokenised works sampled.
+        measure_memory (bool): Whether the peak memory of each stage is measured.
+
+    Returns:
+        results (dict): The results of benchmark_stages for each size.
+
+    """
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            paths = generate_corpus(os.path.join(directory, str(size)), works, size, dataset)
+            results[size] = benchmark_stages(paths, repeat, visualise=False,
+                                             measure_memory=measure_memory, verbose=False)
+
+    stages = list(results[sizes[0]]) if sizes else []
+    print('%-32s' % 'tokens per work' + ''.join('%12d' % size for size in sizes))
+    for stage in stages:
+        print('%-32s' % (stage + ' (s)') + ''.join('%12.4f' % results[size][stage]['seconds']
+                                                    for size in sizes))
+    print('%-32s' % 'total tokens/s' + ''.join(
+        '%12.0f' % (works * size / sum(x['seconds'] for x in results[size].values()))
+        for size in sizes))
+    if measure_memory:
+        print('%-32s' % 'largest peak (MB)' + ''.join(
+            '%12.2f' % (max(x['peak_bytes'] for x in results[size].values()) / 2**20)
+            for size in sizes))
+
+    return results
+
+
+def generate_profiles(profiles, works, noise=0.3, seed=0):
+    """Generates synthetic profiles around the profiles of real works.
+
+    Function for drawing each synthetic profile from a real one, chosen at
+    random, with every frequency multiplied by a log-normal factor.
+
+    Arguments:
+        profiles (numpy array): The works x features relative frequencies.
+        works (int): The number of synthetic profiles.
+        noise (float): The standard deviation of the logarithm of the factors.
+        seed (int): The seed of the profiles.
+
+    Returns:
+        synthetic (numpy array): The works x features synthetic profiles.
+
+    """
+
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    synthetic = profiles[rng.integers(0, len(profiles), works)]
+    return synthetic * rng.lognormal(0.0, noise, synthetic.shape)
+
+
+def benchmark_similarity(paths, works=100000, matrix_works=5000, queries=100, k=10,
+                         method='delta', memory=sim.DEFAULT_MEMORY, seed=0):
+    """Benchmarks the distance matrix and the nearest neighbour index.
+
+    Function for generating synthetic profiles around the ones of the works,
+    timing the blocked distance matrix of a part of them with the peak of the
+    memory it allocates besides the matrix, then building the index of all of
+    them and comparing its queries with full scans.
+
+    Arguments:
+        paths (list): The paths of the tokenised works.
+        works (int): The number of synthetic works of the index.
+        matrix_works (int): The number of synthetic works of the distance matrix.
+        queries (int): The number of works queried.
+        k (int): The number of neighbours of a query.
+        method (string): One of similarity.METHODS.
+        memory (int): The memory budget of the temporary arrays in bytes.
+        seed (int): The seed of the synthetic profiles and queries.
+
+    Returns:
+        results (dict): The times in seconds, the peak memory and the recall.
+
+    """
+
+    import numpy as np
+    import featurestore as fstore
+
+    stopwords = lexicon.get_stopwords()
+    store = fstore.FeatureStore(stopwords, capacity=len(paths))
+    for path in paths:
+        store.add_work(path, main.analyse_work(path, stopwords))
+    profiles = generate_profiles(attr.profile_matrix(store)[0], works, seed=seed)
+    names = [str(i) for i in range(works)]
+    results = {'works': works, 'features': profiles.shape[1], 'method': method}
+
+    matrix = np.empty((min(matrix_works, works),) * 2)
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        sim.distance_matrix(profiles[:len(matrix)], method, memory, out=matrix)
+        results['matrix_seconds'] = time.perf_counter() - start
+        results['matrix_peak_bytes'] = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    print('%d x %d %s distance matrix : %.4f s, %.2f MB allocated besides the matrix' % (
+        len(matrix), len(matrix), method, results['matrix_seconds'],
+        results['matrix_peak_bytes'] / 2**20))
+
+    start = time.perf_counter()
+    index = sim.NearestNeighbourIndex(profiles, names, method, seed=seed, memory=memory)
+    results['index_seconds'] = time.perf_counter() - start
+    queried = random.Random(seed).sample(names, min(queries, works))
+
+    start = time.perf_counter()
+    approximate = [index.query_work(name, k) for name in queried]
+    results['query_seconds'] = (time.perf_counter() - start) / len(queried)
+    start = time.perf_counter()
+    exact = [index.query_work(name, k, probes=len(index.centroids)) for name in queried]
+    results['scan_seconds'] = (time.perf_counter() - start) / len(queried)
+    results['recall'] = sum(len(set(x[0] for x in a) & set(x[0] for x in e))
+                            for a, e in zip(approximate, exact)) / float(k * len(queried))
+
+    print(index)
+    print('%-28s %12.4f' % ('index build (s)', results['index_seconds']))
+    print('%-28s %12.3f' % ('query (ms)', results['query_seconds'] * 1e3))
+    print('%-28s %12.3f' % ('full scan (ms)', results['scan_seconds'] * 1e3))
+    print('%-28s %12.1f' % ('speedup', results['scan_seconds'] / results['query_seconds']))
+    print('%-28s %12.3f' % ('recall@%d' % k, results['recall']))
+
+    return results
+
+
+def word_batches(paths=None, zipf_words=None, batch=100000, seed=0):
+    """Yields the words of works, or of a synthetic stream, in counted batches.
+
+    Arguments:
+        paths (list): The paths of the tokenised works, read a chunk at a time.
+        zipf_words (int): The number of words of a synthetic stream whose word
+            ranks follow a Zipf law, used instead of the works if given, so
+            that the vocabulary keeps growing with the stream.
+        batch (int): The number of words of a synthetic batch.
+        seed (int): The seed of the synthetic stream.
+
+    Yields:
+        word_count (Counter): The occurrences of the words of a batch.
+
+    """
+
+    import numpy as np
+
+    if zipf_words is not None:
+        rng = np.random.default_rng(seed)
+        for start in range(0, zipf_words, batch):
+            ranks = rng.zipf(1.1, min(batch, zipf_words - start))
+            yield Counter(dict(zip(('W%d' % x for x in np.unique(ranks)),
+                                   np.unique(ranks, return_counts=True)[1].tolist())))
+        return
+
+    pattern = extr.FeatureExtractor.word_pattern
+    for path in paths:
+        pre_processor = prpscr.Preprocessor()
+        for tokens in pre_processor.iter_tokens(prpscr.read_chunks(path)):
+            yield Counter(x.upper() for x in tokens if pattern.match(x))
+
+
+def benchmark_sketch(paths, zipf_words=None, epsilon=1e-4, delta=0.01, top_k=1000,
+                     precision=14, seed=0):
+    """Benchmarks the approximate vocabulary counting against the exact one.
+
+    Function for counting the same batches of words with a Counter and with a
+    WordSketch under tracemalloc, then comparing the estimated occurrences of
+    all the words, the most frequent words and the number of distinct words
+    with the exact ones.
+
+    Arguments:
+        paths (list): The paths of the tokenised works.
+        zipf_words (int): The number of words of a synthetic stream used
+            instead of the works if given.
+        epsilon (float): The error of the Count-Min sketch.
+        delta (float): The probability of exceeding that error.
+        top_k (int): The number of most frequent words kept.
+        precision (int): The precision of the HyperLogLog.
+        seed (int): The seed of the synthetic stream.
+
+    Returns:
+        results (dict): The time, memory and errors of the two ways of counting.
+
+    """
+
+    import numpy as np
+
+    def count(counter, update):
+        tracemalloc.start()
+        try:
+            start = time.perf_counter()
+            for word_count in word_batches(paths, zipf_words, seed=seed):
+                update(word_count)
+            seconds = time.perf_counter() - start
+            retained, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return {'seconds': seconds, 'retained_bytes': retained, 'peak_bytes': peak}
+
+    exact = Counter()
+    sketch = skt.WordSketch(epsilon, delta, top_k, precision)
+    results = {'exact': count(exact, exact.update),
+               'approximate': count(sketch, sketch.update_counts)}
+
+    words = list(exact)
+    occurrences = np.fromiter(exact.values(), dtype=np.int64, count=len(words))
+    errors = sketch.frequencies.estimate_hashes(skt.hash_words(words)) - occurrences
+    bound = sketch.frequencies.error_bound()
+    k = min(100, top_k, len(words))
+    top = set(x for x, n in sketch.top(k))
+    results['accuracy'] = {
+        'tokens': int(occurrences.sum()), 'types': len(words),
+        'estimated_types': sketch.distinct(),
+        'types_error': abs(sketch.distinct() - len(words)) / max(1, len(words)),
+        'mean_count_error': float(errors.mean()), 'max_count_error': int(errors.max()),
+        'count_error_bound': bound, 'within_bound': float((errors <= bound).mean()),
+        'top_recall': len(top & set(x for x, n in exact.most_common(k))) / float(max(1, k))}
+
+    accuracy = results['accuracy']
+    print('%d words, %d distinct' % (accuracy['tokens'], accuracy['types']))
+    print('%-24s %12s %16s %14s' % ('', 'time (s)', 'retained (MB)', 'peak (MB)'))
+    for name in ('exact', 'approximate'):
+        print('%-24s %12.4f %16.2f %14.2f' % (name, results[name]['seconds'],
+                                               results[name]['retained_bytes'] / 2**20,
+                                               results[name]['peak_bytes'] / 2**20))
+    print('%-24s %12.0f (error %.4f, expected %.4f)' % (
+        'estimated distinct', accuracy['estimated_types'], accuracy['types_error'],
+        sketch.types.relative_error()))
+    print('%-24s %12.3f (max %d, bound %.1f, %.5f within)' % (
+        'mean count error', accuracy['mean_count_error'], accuracy['max_count_error'],
+        bound, accuracy['within_bound']))
+    print('%-24s %12.3f' % ('top %d recall' % k, accuracy['top_recall']))
+
+    return results
+
+
+def write_json(path, results, arguments):
+    """Writes the results of the benchmarks to a JSON file.
+
+    Function for saving the results along with the commit, Python version,
+    platform and arguments of the run, so that runs on different commits can
+    be compared.
+
+    Arguments:
+        path (string): The path of the JSON file.
+        results (dict): The results of each benchmark.
+        arguments (dict): The arguments of the run.
+
+    """
+
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = ''
+    report = {'commit': commit or None, 'python': platform.python_version(),
+              'platform': platform.platform(), 'cpus': os.cpu_count(),
+              'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'), 'arguments': arguments,
+              'results': results}
+    with open(path, 'w') as file:
+        json.dump(report, file, indent=2, default=str)
+
+
+if __name__=='__main__':
+    """Function for running the benchmarks on running the module
+
+    """
+
+    parser = argparse.ArgumentParser(description='Benchmark the stylometric analyser.')
+    parser.add_argument('benchmarks', nargs='*', default=['extraction'],
+                        choices=['extraction', 'rolling', 'tokenisation', 'startup',
+                                 'stages', 'scaling', 'similarity', 'sketch'],
+                        help='benchmarks to run')
+    parser.add_argument('--dataset', default='sample_dataset',
+                        help='folder containing the tokenised works')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='number of runs per work')
+    parser.add_argument('--synthetic', type=int, default=None, metavar='TOKENS',
+                        help='benchmark a synthetic corpus with this many tokens per '+
+                        'work, sampled from the dataset, instead of the dataset')
+    parser.add_argument('--works', type=int, default=6,
+                        help='number of works of the synthetic corpora')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 50000, 100000, 500000],
+                        help='numbers of tokens per work of the scaling benchmark')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='seed of the synthetic corpora')
+    parser.add_argument('--index-works', type=int, default=100000,
+                        help='number of synthetic works of the similarity benchmark')
+    parser.add_argument('--matrix-works', type=int, default=5000,
+                        help='number of synthetic works of the distance matrix')
+    parser.add_argument('--distance', default='delta', choices=sim.METHODS,
+                        help='distance of the similarity benchmark')
+    parser.add_argument('--zipf-words', type=int, default=None,
+                        help='number of words of a synthetic Zipfian stream counted by '+
+                        'the sketch benchmark instead of the works')
+    parser.add_argument('--sketch-epsilon', type=float, default=1e-4,
+                        help='error of the Count-Min sketch of the sketch benchmark')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='skip measuring the peak memory of the stages')
+    parser.add_argument('--json', default=None,
+                        help='path of a JSON file the results are written to')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        if args.synthetic is not None:
+            paths = generate_corpus(directory, args.works, args.synthetic, args.dataset,
+                                    args.seed)
+        else:
+            paths = main.find_works([args.dataset])
+        results = {}
+        if 'extraction' in args.benchmarks:
+            results['extraction'] = benchmark_fused_extraction(paths, lexicon.get_stopwords(),
+                                                               args.repeat)
+        if 'rolling' in args.benchmarks:
+            pre_processor = prpscr.Preprocessor()
+            pre_processor.tokenise(main.read_input(paths[0]))
+            results['rolling'] = benchmark_rolling(pre_processor.get_tokenised_list())
+        if 'tokenisation' in args.benchmarks:
+            results['tokenisation'] = benchmark_tokenisation(paths, args.repeat)
+        if 'startup' in args.benchmarks:
+            results['startup'] = benchmark_startup(paths, args.repeat)
+        if 'stages' in args.benchmarks:
+            results['stages'] = benchmark_stages(paths, args.repeat,
+                                                 measure_memory=not args.no_memory)
+        if 'scaling' in args.benchmarks:
+            results['scaling'] = benchmark_scaling(args.sizes, args.works, args.repeat,
+                                                   args.dataset, not args.no_memory)
+        if 'similarity' in args.benchmarks:
+            results['similarity'] = benchmark_similarity(paths, args.index_works,
+                                                         args.matrix_works,
+                                                         method=args.distance, seed=args.seed)
+        if 'sketch' in args.benchmarks:
+            results['sketch'] = benchmark_sketch(paths, args.zipf_words, args.sketch_epsilon,
+                                                 seed=args.seed)
+
+    if args.json is not None:
+        write_json(args.json, results, vars(args))
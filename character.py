@@ -1,37 +1,142 @@
 # -*- coding: utf-8 -*-
 """
 Created on         : 19/5/2018
-Last modified on   : 27/5/2018
+Last modified on   : 17/10/2026
 Author             : Satyabrat Borgohain
 Description :
     
     This class creates objects for analysing occurrence of characters in a 
     tokenised list. Characters include alphabets, numerals and punctuations.
 
+    Characters of any script are analysed: the alphabet starts with the ASCII
+    uppercase letters, numerals and punctuations and grows with every new
+    character found, grouped by its Unicode category. Each character is
+    mapped to its row once, and ASCII texts are counted with NumPy at once.
+
     Objects of this class can be created for standalone puposes.
 """
 
 
 
 import string
-import pandas as pd
+import unicodedata
 from collections import Counter
 
+#Groups of the characters analysed, keyed by the first letter of their Unicode
+#category. Symbols are punctuations as in string.punctuation, and separators
+#and control characters are not analysed
+GROUPS = {'L': 'letter', 'N': 'numeral', 'P': 'punctuation', 'S': 'punctuation',
+          'M': 'mark'}
+
+def character_group(character):
+    """Finds the group of a character from its Unicode category.
+
+    Arguments:
+        character (string): The character.
+
+    Returns:
+        group (string): One of the values of GROUPS, None if the character is
+            not analysed.
+
+    """
+
+    return GROUPS.get(unicodedata.category(character)[0])
+
+
+class Alphabet:
+    """An alphabet class mapping the characters analysed to their rows.
+
+    """
+
+    __slots__ = ('characters', 'groups', 'ids', 'ascii_ids')
+
+    def __init__(self, characters):
+        """Initializes an Alphabet object with the characters in order.
+
+        Arguments:
+            characters (iterable): The characters the alphabet starts with.
+
+        """
+
+        import numpy as np
+
+        self.characters = []
+        self.groups = []
+        #Row of every character seen, -1 for the ones which are not analysed
+        self.ids = {}
+        #Row of every ASCII code, for counting ASCII texts with NumPy
+        self.ascii_ids = np.full(128, -1, dtype=np.int64)
+        self.extend(characters)
+
+
+    def __len__(self):
+        """Returns the number of characters analysed.
+
+        """
+
+        return len(self.characters)
+
+
+    def add(self, character):
+        """Getter for the row of a character, added at the end if it is new.
+
+        Arguments:
+            character (string): The character.
+
+        Returns:
+            row (int): The row of the character, -1 if it is not analysed.
+
+        """
+
+        row = self.ids.get(character)
+        if row is None:
+            group = character_group(character)
+            row = -1
+            if group is not None:
+                row = len(self.characters)
+                self.characters.append(character)
+                self.groups.append(group)
+                if ord(character) < 128:
+                    self.ascii_ids[ord(character)] = row
+            self.ids[character] = row
+        return row
+
+
+    def extend(self, characters):
+        """Appends the new characters at the end of the alphabet.
+
+        Arguments:
+            characters (iterable): The characters to be added.
+
+        """
+
+        for character in characters:
+            self.add(character)
+
+
 class CharacterAnalyser:
     """A analyser class for analysing tokenised input at the 'character' level.
     
     """
     
-    #Class variable for storing all the characters to be analysed
+    #Class variable for storing the characters every analysis starts with
     characters = list(string.ascii_uppercase+string.digits+string.punctuation)
     
-    def __init__(self):
+    def __init__(self, use_numpy=True):
         """Initializes a CharacterAnalyser object which is a pandas DataFrame 
         with two columns as : 'character' which contains the characters and 
         'occurrence' which holds its corresponding occurrence in the tokenised list.
         
+        Arguments:
+            use_numpy (bool): Whether ASCII texts are counted with NumPy.
+        
         """
+
+        import pandas as pd
         
+        self.use_numpy = use_numpy
+        #Instance variable for the characters found so far and their rows
+        self.alphabet = Alphabet(self.characters)
         #Instance variable for storing the occurences of corresponding characters
         self.char_occ = pd.DataFrame({'character': self.characters,
                                     'occurence': [0]*len(self.characters)})
@@ -50,6 +155,66 @@ class CharacterAnalyser:
         return prefix + self.char_occ.to_string(index=False, justify='left') + suffix
     
         
+    def _count_characters(self, tokenised_list):
+        """Counts the characters of a tokenised list.
+
+        Function for counting the characters of the uppercased tokens, adding
+        the new ones to the alphabet. ASCII texts are encoded and counted by
+        a NumPy bincount, other texts by a Counter whose distinct characters
+        are then looked up in the alphabet.
+
+        Arguments:
+            tokenised_list (iterable): The tokens.
+
+        Returns:
+            counts (numpy array): The occurrences of the characters of the
+                alphabet, in its order.
+
+        """
+
+        import numpy as np
+
+        text = ''.join(tokenised_list).upper()
+        alphabet = self.alphabet
+        if self.use_numpy and text.isascii():
+            codes = np.bincount(np.frombuffer(text.encode('ascii'), dtype=np.uint8),
+                                minlength=128)
+            counts = np.zeros(len(alphabet), dtype=np.int64)
+            analysed = alphabet.ascii_ids >= 0
+            counts[alphabet.ascii_ids[analysed]] = codes[analysed]
+            return counts
+
+        char_count = [(alphabet.add(x), n) for x, n in Counter(text).items()]
+        counts = np.zeros(len(alphabet), dtype=np.int64)
+        for row, n in char_count:
+            if row >= 0:
+                counts[row] = n
+        return counts
+
+
+    def _add_occurrences(self, characters, occurence):
+        """Adds occurrences to the instance variable, aligned by character.
+
+        Arguments:
+            characters (list): The characters, added to the alphabet if new.
+            occurence (numpy array): Their occurrences, which may be negative.
+
+        """
+
+        import numpy as np
+        import pandas as pd
+
+        self.alphabet.extend(characters)
+        rows = len(self.alphabet)
+        total = np.zeros(rows, dtype=np.int64)
+        total[:len(self.char_occ)] = self.char_occ['occurence'].values
+        total[[self.alphabet.ids[x] for x in characters]] += occurence
+        if (total < 0).any():
+            raise ValueError('Cannot subtract occurrences which were not recorded')
+        self.char_occ = pd.DataFrame({'character': list(self.alphabet.characters),
+                                      'occurence': total})
+
+    
     def analyse_characters(self, tokenised_list):
         """Analyses the tokenised list for character occurrence.
     
@@ -61,16 +226,85 @@ class CharacterAnalyser:
             tokenised_list (list): The list of tokens.
     
         """
+
+        import pandas as pd
         
         #Finding the character count in the tokenised list
-        char_count=Counter(''.join(tokenised_list).upper())
+        counts = self._count_characters(tokenised_list)
         
-        #Updating the instance variable with the character occurrences
-        for key, value in char_count.items():
-            #Finding the row index with containing the particular character
-            indices = pd.Index(self.characters)
-            index = indices.get_loc(key)
-            self.char_occ.iloc[index,1] = value
+        #Replacing the occurrences of a previous analysis
+        self.char_occ = pd.DataFrame({'character': list(self.alphabet.characters),
+                                      'occurence': counts})
+
+
+    def update_characters(self, tokenised_list):
+        """Adds the character occurrences of more tokens.
+    
+        Function for analysing a batch of tokens, e.g. a chunk from
+        Preprocessor.iter_tokens, and adding its character occurrences to the
+        ones already recorded in the instance variable.
+
+        Arguments:
+            tokenised_list (iterable): The tokens.
+    
+        """
+        
+        counts = self._count_characters(tokenised_list)
+        self._add_occurrences(self.alphabet.characters[:len(counts)], counts)
+
+
+    def merge(self, other):
+        """Adds the character occurrences recorded by another analyser.
+    
+        Function for combining the occurrences of analysers fed with different
+        texts, e.g. to build the profile of an author from their works. The
+        characters new to this analyser are appended after its own.
+
+        Arguments:
+            other (CharacterAnalyser): The analyser to be merged.
+
+        Returns:
+            self (CharacterAnalyser): The analyser, for chaining.
+    
+        """
+        
+        self._add_occurrences(list(other.char_occ['character']),
+                              other.char_occ['occurence'].values)
+        return self
+
+
+    def subtract(self, other):
+        """Removes the character occurrences recorded by another analyser.
+    
+        Function for taking a text, analysed on its own by the other analyser,
+        back out of the combined occurrences.
+
+        Arguments:
+            other (CharacterAnalyser): The analyser to be subtracted.
+
+        Returns:
+            self (CharacterAnalyser): The analyser, for chaining.
+    
+        """
+        
+        self._add_occurrences(list(other.char_occ['character']),
+                              -other.char_occ['occurence'].values)
+        return self
+
+
+    def get_group_frequency(self):
+        """Getter for the occurrences of each group of characters.
+
+        Returns:
+            group_occ (pandas DataFrame): The dataframe of group occurrence.
+
+        """
+
+        import pandas as pd
+
+        groups = self.alphabet.groups[:len(self.char_occ)]
+        group_occ = self.char_occ['occurence'].groupby(groups, sort=False).sum()
+        return pd.DataFrame({'group': group_occ.index, 'occurence': group_occ.values})
 
 
     def get_punctuation_frequency(self):
@@ -78,22 +312,19 @@ class CharacterAnalyser:
         list from the instance variable.
     
         Function for analysing the tokenised list and returning the occurrence
-        of only the punctuations contained in it.
+        of only the punctuations contained in it, the ASCII ones first.
     
         Returns:
             punc_occ (pandas DataFrame): The dataframe of punctuation occurrrence.
     
         """
+
+        import numpy as np
         
-        punctuations = list(string.punctuation)
-        #Dataframe to store the punctuation occurences only
-        punc_occ = pd.DataFrame(columns=['punctuation', 'occurence'])
-        #Loop for identifying rows with punctuations in the instance variable
-        for i, row in self.char_occ.iterrows():
-            if row['character'] in punctuations:
-                temp_df = pd.DataFrame([[row['character'],row['occurence']]], 
-                                       columns=['punctuation', 'occurence'])
-                punc_occ = punc_occ.append(temp_df, ignore_index=True)
+        #Selecting the rows with punctuations in the instance variable at once
+        groups = np.array(self.alphabet.groups[:len(self.char_occ)])
+        punc_occ = self.char_occ[groups == 'punctuation']
+        punc_occ = punc_occ.rename(columns={'character': 'punctuation'})
+        punc_occ = punc_occ.reset_index(drop=True)
         
         return punc_occ
-    
\ No newline at end of file
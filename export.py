@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+"""
+Created on         : 17/10/2026
+Last modified on   : 17/10/2026
+Author             : Satyabrat Borgohain
+Description :
+
+    This module exports the occurrences of all the analysed works to columnar
+    files, so that other jobs can use them without analysing the texts again,
+    and loads them back into a FeatureStore.
+
+    Each statistic is written as a works x features table to a Parquet or
+    Feather file when pyarrow is installed, otherwise all the statistics are
+    written to a single uncompressed .npz file. A manifest names the format
+    and statistics of the export, so that the files left by an export in
+    another format are never mixed in. The .npz files are memory mapped when
+    loaded, so reopening a large export is almost free, while the columns of
+    the Parquet and Feather tables are copied into one matrix per statistic.
+"""
+
+
+
+import os
+import json
+import struct
+import zipfile
+import numpy as np
+import featurestore as fstore
+
+#Statistics an export may hold, the punctuations being included for the
+#downstream tools even though the store reads them from the characters, and the
+#sentences and lines only if the works were segmented
+STATISTICS = list(fstore.LABELS)
+#File extensions of the formats
+EXTENSIONS = {'parquet': '.parquet', 'feather': '.feather', 'npz': '.npz'}
+#Name of the .npz export
+NPZ_NAME = 'stats.npz'
+#Name of the manifest of an export
+MANIFEST_NAME = 'manifest.json'
+
+def has_pyarrow():
+    """Checks if pyarrow, needed for Parquet and Feather, is installed.
+
+    Returns:
+        True if pyarrow can be imported.
+
+    """
+
+    try:
+        import pyarrow
+    except ImportError:
+        return False
+    return True
+
+
+def export_store(store, directory, export_format='auto'):
+    """Exports the occurrences of all the works in a store.
+
+    Arguments:
+        store (FeatureStore): The store of the works.
+        directory (string): The folder the files are written to.
+        export_format (string): 'parquet', 'feather', 'npz' or 'auto' for
+            Parquet if pyarrow is installed and .npz otherwise.
+
+    Returns:
+        paths (list): The paths of the written files.
+
+    """
+
+    if export_format == 'auto':
+        export_format = 'parquet' if has_pyarrow() else 'npz'
+    if export_format not in EXTENSIONS:
+        raise ValueError('Unknown export format : ' + str(export_format))
+    os.makedirs(directory, exist_ok=True)
+    #Removing any earlier export from the folder, whatever its format
+    _remove_export(directory)
+
+    works = [record.work for record in store.records]
+    #The sentences and lines are only exported if the works were segmented
+    statistics = store.get_statistics()
+    if export_format == 'npz':
+        arrays = {'work': np.array(works, dtype=str)}
+        for name in statistics:
+            labels = store.vocabularies[name].labels
+            arrays[name + '_labels'] = np.array(labels, dtype=np.int64 if
+                                                name in fstore.LENGTHS else str)
+            arrays[name + '_counts'] = np.ascontiguousarray(store.get_matrix(name))
+        path = os.path.join(directory, NPZ_NAME)
+        #Stored without compression so that the arrays can be memory mapped
+        np.savez(path, **arrays)
+        return [path, _write_manifest(directory, export_format, statistics, works)]
+
+    import pandas as pd
+
+    paths = []
+    for name in statistics:
+        labels = [str(x) for x in store.vocabularies[name].labels]
+        df = pd.DataFrame(store.get_matrix(name), columns=labels)
+        df.insert(0, 'work', works)
+        path = os.path.join(directory, name + EXTENSIONS[export_format])
+        if export_format == 'parquet':
+            df.to_parquet(path, index=False)
+        else:
+            #Written without compression so that the file can be memory mapped
+            df.to_feather(path, compression='uncompressed')
+        paths.append(path)
+    paths.append(_write_manifest(directory, export_format, statistics, works))
+
+    return paths
+
+
+def _remove_export(directory):
+    """Removes the files of an export in any format from a folder.
+
+    Arguments:
+        directory (string): The folder of the export.
+
+    """
+
+    names = [MANIFEST_NAME, NPZ_NAME] + [name + extension for name in STATISTICS
+                                         for extension in set(EXTENSIONS.values())]
+    for name in names:
+        path = os.path.join(directory, name)
+        if os.path.isfile(path):
+            os.remove(path)
+
+
+def _write_manifest(directory, export_format, statistics, works):
+    """Writes the manifest naming the format and statistics of an export.
+
+    It is written last, so that an interrupted export has none.
+
+    Arguments:
+        directory (string): The folder of the export.
+        export_format (string): 'parquet', 'feather' or 'npz'.
+        statistics (list): The statistics exported.
+        works (list): The names of the works exported.
+
+    Returns:
+        path (string): The path of the manifest.
+
+    """
+
+    path = os.path.join(directory, MANIFEST_NAME)
+    with open(path, 'w') as file:
+        json.dump({'format': export_format, 'statistics': list(statistics),
+                   'works': len(works)}, file, indent=2)
+    return path
+
+
+def _read_manifest(directory):
+    """Reads the manifest of an export, or guesses it for the older exports.
+
+    The older exports without a manifest are read as .npz if there is one,
+    otherwise as Feather if the first statistic is, and as Parquet otherwise.
+
+    Arguments:
+        directory (string): The folder of the export.
+
+    Returns:
+        manifest (dict): The 'format' and 'statistics' of the export.
+
+    """
+
+    path = os.path.join(directory, MANIFEST_NAME)
+    if os.path.exists(path):
+        with open(path, 'r') as file:
+            return json.load(file)
+    if os.path.exists(os.path.join(directory, NPZ_NAME)):
+        export_format = 'npz'
+    elif os.path.exists(os.path.join(directory, STATISTICS[0] + EXTENSIONS['feather'])):
+        export_format = 'feather'
+    else:
+        export_format = 'parquet'
+    #Older exports have no sentences and lines
+    statistics = [name for name in STATISTICS if name not in fstore.SEGMENTS or
+                  export_format == 'npz' or os.path.exists(os.path.join(
+                      directory, name + EXTENSIONS[export_format]))]
+    return {'format': export_format, 'statistics': statistics}
+
+
+def _load_npz(path):
+    """Loads the arrays of an uncompressed .npz file as memory maps.
+
+    Function for locating the data of every array stored in the zip archive
+    and memory mapping it in place. Arrays which cannot be mapped, e.g. if
+    the archive is compressed, are read into memory.
+
+    Arguments:
+        path (string): The path of the .npz file.
+
+    Returns:
+        arrays (dict): The arrays keyed by name.
+
+    """
+
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, 'rb') as file:
+        for info in archive.infolist():
+            name = info.filename[:-len('.npy')]
+            if info.compress_type != zipfile.ZIP_STORED:
+                arrays[name] = np.load(archive.open(info))
+                continue
+            #Skipping the local header of the member to reach the .npy data
+            file.seek(info.header_offset + 26)
+            name_length, extra_length = struct.unpack('<HH', file.read(4))
+            file.seek(info.header_offset + 30 + name_length + extra_length)
+            version = np.lib.format.read_magic(file)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(file)
+            if dtype.hasobject or 0 in shape:
+                file.seek(info.header_offset + 30 + name_length + extra_length)
+                arrays[name] = np.lib.format.read_array(file)
+            else:
+                arrays[name] = np.memmap(path, dtype=dtype, mode='r', shape=shape,
+                                         order='F' if fortran_order else 'C',
+                                         offset=file.tell())
+
+    return arrays
+
+
+def load_store(directory):
+    """Loads an export back into a FeatureStore.
+
+    Function for loading the files written by export_store, in the format
+    named by their manifest, without touching the source texts. The .npz
+    matrices are memory mapped, while the columns of the Parquet and
+    Feather tables are copied into one matrix per statistic.
+
+    Arguments:
+        directory (string): The folder the files were written to.
+
+    Returns:
+        store (FeatureStore): The store of the works.
+
+    """
+
+    manifest = _read_manifest(directory)
+    export_format = manifest['format']
+    if export_format not in EXTENSIONS:
+        raise ValueError('Unknown export format : ' + str(export_format))
+    labels = {}
+    counts = {}
+    if export_format == 'npz':
+        arrays = _load_npz(os.path.join(directory, NPZ_NAME))
+        works = arrays['work'].tolist()
+        for name in manifest['statistics']:
+            #Older exports have no sentences and lines
+            if name + '_labels' not in arrays:
+                continue
+            labels[name] = arrays[name + '_labels'].tolist()
+            counts[name] = arrays[name + '_counts']
+        return fstore.FeatureStore.from_arrays(works, labels, counts)
+
+    import pyarrow.feather as feather
+    import pyarrow.parquet as parquet
+
+    works = None
+    for name in manifest['statistics']:
+        path = os.path.join(directory, name + EXTENSIONS[export_format])
+        if export_format == 'feather':
+            table = feather.read_table(path, memory_map=True)
+        else:
+            table = parquet.read_table(path, memory_map=True)
+        if works is None:
+            works = table.column('work').to_pylist()
+        elif table.column('work').to_pylist() != works:
+            raise ValueError('The works of ' + path + ' do not match the rest of the export')
+        columns = table.column_names[1:]
+        labels[name] = [int(x) for x in columns] if name in fstore.LENGTHS else columns
+        #Stacking the feature columns into one works x features matrix
+        counts[name] = np.column_stack([table.column(x).to_numpy() for x in columns]
+                                       ) if columns else np.zeros((len(works), 0), np.int64)
+
+    return fstore.FeatureStore.from_arrays(works, labels, counts)
+
+
+def load_stats_frame(directory):
+    """Loads an export as the dataframe of dataframes of the AnalysisVisualiser.
+
+    Arguments:
+        directory (string): The folder the files were written to.
+
+    Returns:
+        all_text_stats (pandas DataFrame): The stats of all the works.
+
+    """
+
+    return load_store(directory).to_stats_frame()
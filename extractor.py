@@ -0,0 +1,344 @@
+# -*- coding: utf-8 -*-
+"""
+Created on         : 17/10/2026
+Last modified on   : 17/10/2026
+Author             : Satyabrat Borgohain
+Description :
+
+    This class creates objects for extracting all the character, punctuation,
+    word, stopword and word length occurrences of a tokenised list in a single
+    pass over the tokens. It produces the same dataframes as the getters of the
+    CharacterAnalyser and WordAnalyser classes.
+
+    The tokens are counted once and every other statistic is derived from the
+    distinct tokens (types) weighted by their counts, which are far fewer than
+    the tokens of a work.
+
+    For huge works the words can be counted by a WordSketch instead: only the
+    stopwords and the word lengths are then counted exactly, and the
+    vocabulary is approximated in memory bounded by the error of the sketch.
+
+    Objects of this class can be created for standalone puposes.
+"""
+
+
+
+import string
+from collections import Counter
+import character as char
+import preprocessor as prpscr
+import lexicon
+
+class FeatureExtractor:
+    """A fused analyser class for extracting all the statistics of a tokenised
+    input in one pass.
+
+    """
+
+    #Class variable for the regex used to identify words - allows letters of any
+    #script, numerals, ' and -
+    word_pattern = prpscr.WORD_PATTERN
+    #Class variable for the minimum number of word length buckets
+    word_lengths = 40
+    #Class variable for the version of the extraction, to be increased whenever
+    #its occurrences change so that cached results are recomputed
+    version = 5
+
+    def __init__(self, stopwords=None, sketch=None):
+        """Initializes a FeatureExtractor object with empty occurrences for the
+        characters and words.
+
+        Arguments:
+            stopwords (StopwordLexicon): The stopwords to be analysed, the
+                default lexicon if not given.
+            sketch (WordSketch): An empty sketch counting the vocabulary
+                approximately, the words being counted exactly if not given.
+
+        """
+
+        if stopwords is None:
+            stopwords = lexicon.get_stopwords()
+        elif not isinstance(stopwords, lexicon.StopwordLexicon):
+            stopwords = lexicon.StopwordLexicon(stopwords)
+        #Instance variable for storing the stopwords to be analysed
+        self.stopwords = stopwords
+        #Instance variables for storing the occurences of characters and words
+        self.char_count = Counter()
+        self.word_count = Counter()
+        #Instance variables for the vocabulary sketch and, with a sketch, the
+        #occurences of the word lengths as word_count only holds the stopwords
+        self.sketch = sketch
+        self.length_count = Counter()
+
+
+    def __str__(self):
+        """Prints the number of distinct words as a formatted string.
+
+        Returns:
+            The number of distinct words as a formatted string.
+
+        """
+
+        prefix = 'Distinct words : \n' + "======================\n"
+        suffix = "\n======================"
+        types = len(self.word_count) if self.sketch is None else round(self.sketch.distinct())
+        return prefix + str(types) + suffix
+
+
+    def extract(self, tokenised_list):
+        """Extracts the character and word occurrences of the tokenised list.
+
+        Function for counting the tokens in a single pass and deriving the
+        character and word occurrences from the distinct tokens. It replaces
+        the occurrences recorded in the instance variables.
+
+        Arguments:
+            tokenised_list (list): The list of tokens.
+
+        """
+
+        self.char_count = Counter()
+        self.word_count = Counter()
+        if self.sketch is not None:
+            self.sketch = type(self.sketch)(**self.sketch.config())
+            self.length_count = Counter()
+        self.update(tokenised_list)
+
+
+    def update(self, tokenised_list):
+        """Adds the character and word occurrences of more tokens.
+
+        Function for counting a batch of tokens, e.g. a chunk from
+        Preprocessor.iter_tokens, and adding its occurrences to the ones
+        already recorded in the instance variables.
+
+        Arguments:
+            tokenised_list (iterable): The tokens.
+
+        """
+
+        #The only pass over the tokens
+        token_count = Counter(tokenised_list)
+
+        char_count = self.char_count
+        #With a sketch, only the words of the batch are counted exactly
+        word_count = self.word_count if self.sketch is None else Counter()
+        for token, count in token_count.items():
+            upper_token = token.upper()
+            #Weighting the characters of the token by its occurence
+            for character in upper_token:
+                char_count[character] += count
+            if self.word_pattern.match(token):
+                word_count[upper_token] += count
+
+        if self.sketch is not None:
+            self.sketch.update_counts(word_count)
+            for word, count in word_count.items():
+                self.length_count[len(word)] += count
+                if word in self.stopwords:
+                    self.word_count[word] += count
+
+
+    def merge(self, other):
+        """Adds the character and word occurrences recorded by another extractor.
+
+        Function for combining the occurrences of extractors fed with different
+        texts, e.g. to build the profile of an author from their works.
+
+        Arguments:
+            other (FeatureExtractor): The extractor to be merged, with a sketch
+                of the same parameters if this one has a sketch.
+
+        Returns:
+            self (FeatureExtractor): The extractor, for chaining.
+
+        """
+
+        if (self.sketch is None) != (other.sketch is None):
+            raise ValueError('Cannot merge exact and approximate word occurrences')
+        self.char_count.update(other.char_count)
+        self.word_count.update(other.word_count)
+        if self.sketch is not None:
+            self.sketch.merge(other.sketch)
+            self.length_count.update(other.length_count)
+        return self
+
+
+    def subtract(self, other):
+        """Removes the character and word occurrences recorded by another extractor.
+
+        Function for taking a text, extracted on its own by the other extractor,
+        back out of the combined occurrences. Characters and words left without
+        any occurrence are dropped.
+
+        Arguments:
+            other (FeatureExtractor): The extractor to be subtracted.
+
+        Returns:
+            self (FeatureExtractor): The extractor, for chaining.
+
+        """
+
+        if self.sketch is not None or other.sketch is not None:
+            raise ValueError('Cannot subtract approximate word occurrences')
+        char_count = self.char_count.copy()
+        word_count = self.word_count.copy()
+        char_count.subtract(other.char_count)
+        word_count.subtract(other.word_count)
+        if any(value < 0 for value in char_count.values()) or \
+           any(value < 0 for value in word_count.values()):
+            raise ValueError('Cannot subtract occurrences which were not recorded')
+        #Unary plus drops the keys left at zero
+        self.char_count = +char_count
+        self.word_count = +word_count
+        return self
+
+
+    def get_extra_characters(self):
+        """Getter for the occurrences of the characters beyond the ASCII ones
+        every analysis starts with, e.g. accented letters.
+
+        Returns:
+            extra_count (dict): The occurrences keyed by character, in the
+                order the characters were found.
+
+        """
+
+        characters = set(char.CharacterAnalyser.characters)
+        return dict((x, n) for x, n in self.char_count.items()
+                    if x not in characters and char.character_group(x) is not None)
+
+
+    def get_character_frequency(self):
+        """Getter for the character occurrences in the tokenised list.
+
+        Returns:
+            char_occ (pandas DataFrame): The dataframe of character occurrence.
+
+        """
+
+        import pandas as pd
+
+        characters = char.CharacterAnalyser.characters
+        extra_count = self.get_extra_characters()
+        return pd.DataFrame({'character': characters + list(extra_count),
+                             'occurence': [self.char_count[x] for x in characters] +
+                                          list(extra_count.values())})
+
+
+    def get_punctuation_frequency(self):
+        """Getter for the punctuation occurrences in the tokenised list.
+
+        Returns:
+            punc_occ (pandas DataFrame): The dataframe of punctuation occurrrence.
+
+        """
+
+        import pandas as pd
+
+        punctuations = list(string.punctuation)
+        punctuations += [x for x in self.get_extra_characters()
+                         if char.character_group(x) == 'punctuation']
+        return pd.DataFrame({'punctuation': punctuations,
+                             'occurence': [self.char_count[x] for x in punctuations]})
+
+
+    def get_word_frequency(self):
+        """Getter for the word occurrences in the tokenised list.
+
+        With a sketch, only the most frequent words it kept are returned, with
+        their estimated occurrences.
+
+        Returns:
+            word_occ (pandas DataFrame): The dataframe of word occurrence.
+
+        """
+
+        import pandas as pd
+
+        words = self.word_count.items() if self.sketch is None else self.sketch.top()
+        return pd.DataFrame(list(words), columns=['word', 'occurence'])
+
+
+    def get_stopword_frequency(self):
+        """Getter for the stopword occurrences in the tokenised list.
+
+        Returns:
+            stop_occ (pandas DataFrame): The dataframe of stopword occurrence.
+
+        """
+
+        import pandas as pd
+
+        return pd.DataFrame({'stopword': list(self.stopwords.words),
+                             'occurence': [self.word_count[x] for x in self.stopwords.words]})
+
+
+    def get_word_length_frequency(self):
+        """Getter for the word length occurrences in the tokenised list.
+
+        Returns:
+            wl_occ (pandas DataFrame): The dataframe of wordlength occurrence.
+
+        """
+
+        import pandas as pd
+
+        wl_count = self._word_length_count()
+        return pd.DataFrame({'wordlength': range(0,len(wl_count)),
+                             'occurence': wl_count})
+
+
+    def _word_length_count(self):
+        """Sums the occurrences of the words of each length.
+
+        Returns:
+            wl_count (list): The occurrences of each word length, with at least
+                the default number of buckets.
+
+        """
+
+        if self.sketch is not None:
+            wl_count = [0]*max(self.word_lengths, max(self.length_count, default=0) + 1)
+            for key, value in self.length_count.items():
+                wl_count[key] += value
+            return wl_count
+
+        longest = max(map(len, self.word_count), default=0)
+        wl_count = [0]*max(self.word_lengths, longest + 1)
+        for key, value in self.word_count.items():
+            wl_count[len(key)] += value
+        return wl_count
+
+
+    def get_counts(self):
+        """Getter for the compact occurrences of the tokenised list.
+
+        Function for returning the character, punctuation, stopword and word
+        length occurrences as plain lists of integers in the order of their
+        vocabularies, which are cheap to send between processes. The
+        characters beyond the ASCII ones are returned in a dictionary. The
+        frequency spectrum of the words, the [m, V(m)] pairs of the number of
+        words V(m) occurring m times, is returned under 'spectrum' for the
+        measures of richness, or with a sketch the summary of the vocabulary
+        under 'vocabulary'.
+
+        Returns:
+            counts (dict): The lists of occurrences keyed by statistic.
+
+        """
+
+        counts = {'char_freq': [self.char_count[x] for x in char.CharacterAnalyser.characters],
+                  'punc_freq': [self.char_count[x] for x in string.punctuation],
+                  'stop_freq': [self.word_count[x] for x in self.stopwords.words],
+                  'word_len_freq': self._word_length_count(),
+                  'char_extra': self.get_extra_characters()}
+        if self.sketch is not None:
+            counts['vocabulary'] = self.sketch.summary()
+        else:
+            import richness
+
+            counts['spectrum'] = richness.spectrum_to_pairs(
+                richness.frequency_spectrum(self.word_count.values()))
+        return counts
+
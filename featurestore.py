@@ -0,0 +1,400 @@
+# -*- coding: utf-8 -*-
+"""
+Created on         : 17/10/2026
+Last modified on   : 17/10/2026
+Author             : Satyabrat Borgohain
+Description :
+
+    This class stores the statistics of all the analysed works compactly. Each
+    statistic has a vocabulary (characters, punctuations, stopwords, word
+    lengths and the lengths and punctuations of the sentences and lines)
+    mapped to integer ids, and each work is a row of a NumPy count matrix per
+    statistic. The occurrence dataframes used by the
+    AnalysisVisualiser are only built on demand.
+
+    Objects of this class can be created for standalone puposes.
+"""
+
+
+
+import numpy as np
+import character as char
+import lexicon
+import segmenter as sgm
+
+#Name of the label column of the occurrence dataframe of each statistic
+LABELS = {'char_freq': 'character', 'punc_freq': 'punctuation',
+          'stop_freq': 'stopword', 'word_len_freq': 'wordlength',
+          'sent_len_freq': 'sentencelength', 'line_len_freq': 'linelength',
+          'sent_punc_freq': 'punctuations'}
+#Minimum number of word length buckets
+WORD_LENGTHS = 40
+#Statistics whose labels are lengths, extended with buckets as needed, and
+#their minimum number of buckets
+LENGTHS = {'word_len_freq': WORD_LENGTHS, 'sent_len_freq': sgm.SENTENCE_LENGTHS,
+           'line_len_freq': sgm.LINE_LENGTHS, 'sent_punc_freq': sgm.SENTENCE_PUNCTUATIONS}
+#Statistics of the sentences and lines, counted by the Segmenter
+SEGMENTS = ('sent_len_freq', 'line_len_freq', 'sent_punc_freq')
+
+class Vocabulary:
+    """A vocabulary class mapping the labels of a statistic to integer ids.
+
+    """
+
+    __slots__ = ('labels', 'ids')
+
+    def __init__(self, labels):
+        """Initializes a Vocabulary object with the labels in order and their ids.
+
+        Arguments:
+            labels (iterable): The labels of the statistic.
+
+        """
+
+        self.labels = list(labels)
+        self.ids = dict((x, i) for i, x in enumerate(self.labels))
+
+
+    def __len__(self):
+        """Returns the number of labels.
+
+        """
+
+        return len(self.labels)
+
+
+    def extend(self, labels):
+        """Appends new labels at the end of the vocabulary.
+
+        Arguments:
+            labels (iterable): The labels to be added.
+
+        """
+
+        for label in labels:
+            if label not in self.ids:
+                self.ids[label] = len(self.labels)
+                self.labels.append(label)
+
+
+class WorkRecord:
+    """A record class for an analysed work and its row in the count matrices.
+
+    """
+
+    __slots__ = ('work', 'row')
+
+    def __init__(self, work, row):
+        """Initializes a WorkRecord object.
+
+        Arguments:
+            work (string): The name of the work.
+            row (int): The row of the work in the count matrices.
+
+        """
+
+        self.work = work
+        self.row = row
+
+
+    def __repr__(self):
+        """Returns the record as a string.
+
+        """
+
+        return 'WorkRecord(%r, %d)' % (self.work, self.row)
+
+
+class FeatureStore:
+    """A store class holding the occurrences of all the works in count matrices.
+
+    """
+
+    def __init__(self, stopwords, capacity=16):
+        """Initializes an empty FeatureStore object.
+
+        Arguments:
+            stopwords (StopwordLexicon): The stopwords the works are analysed for.
+            capacity (int): The number of rows allocated up front.
+
+        """
+
+        self.vocabularies = {'char_freq': Vocabulary(char.CharacterAnalyser.characters),
+                             'stop_freq': Vocabulary(stopwords.words)}
+        #The sentences and lines are only allocated once a work has them
+        for name, buckets in LENGTHS.items():
+            if name not in SEGMENTS:
+                self.vocabularies[name] = Vocabulary(range(0, buckets))
+        #Instance variable for the count matrices, one row per work
+        capacity = max(capacity, 1)
+        self.counts = dict((name, np.zeros((capacity, len(vocabulary)), dtype=np.int64))
+                           for name, vocabulary in self.vocabularies.items())
+        #Punctuations are a subset of the characters, so they are not stored twice
+        self._index_punctuations()
+        self.records = []
+
+
+    @classmethod
+    def from_arrays(cls, works, labels, counts):
+        """Creates a FeatureStore object from existing count matrices.
+
+        Function for wrapping count matrices, e.g. memory mapped from an
+        export, without copying them. The matrices are only copied if more
+        works are added. The sentences and lines are only stored if they
+        were exported.
+
+        Arguments:
+            works (list): The names of the works, one per row.
+            labels (dict): The labels of each statistic.
+            counts (dict): The works x features count matrix of each statistic,
+                except the punctuations which are read from the characters.
+
+        Returns:
+            store (FeatureStore): The store of the works.
+
+        """
+
+        store = cls(lexicon.StopwordLexicon(labels['stop_freq']), capacity=0)
+        store.vocabularies['char_freq'] = Vocabulary(labels['char_freq'])
+        for name in LENGTHS:
+            if name in labels and name in counts:
+                store.vocabularies[name] = Vocabulary(labels[name])
+        store._index_punctuations()
+        store.counts = dict((name, counts[name]) for name in store.vocabularies
+                            if name != 'punc_freq')
+        store.records = [WorkRecord(work, row) for row, work in enumerate(works)]
+
+        return store
+
+
+    def _index_punctuations(self):
+        """Finds the punctuations among the characters and their columns.
+
+        """
+
+        labels = [x for x in self.vocabularies['char_freq'].labels
+                  if char.character_group(x) == 'punctuation']
+        self.vocabularies['punc_freq'] = Vocabulary(labels)
+        self._punc_columns = [self.vocabularies['char_freq'].ids[x] for x in labels]
+
+
+    def __str__(self):
+        """Prints the number of works and features as a formatted string.
+
+        Returns:
+            The size of the store as a formatted string.
+
+        """
+
+        prefix = 'Feature store : \n' + "======================\n"
+        suffix = "\n======================"
+        sizes = ', '.join('%s %d' % (name, len(self.vocabularies[name]))
+                          for name in self.counts)
+        return prefix + '%d works x (%s)' % (len(self.records), sizes) + suffix
+
+
+    def __len__(self):
+        """Returns the number of works.
+
+        """
+
+        return len(self.records)
+
+
+    def add_work(self, work, counts):
+        """Adds the occurrences of a work as a new row of the count matrices.
+
+        Arguments:
+            work (string): The name of the work.
+            counts (dict): The lists of occurrences returned by
+                FeatureExtractor.get_counts, and by Segmenter.get_counts for
+                the sentences and lines, which are allocated by the first work
+                having them. The characters beyond the ASCII ones, if any, get
+                their own columns.
+
+        Returns:
+            record (WorkRecord): The record of the work.
+
+        """
+
+        row = len(self.records)
+        capacity = len(self.counts['char_freq'])
+        if row == capacity:
+            #Doubling the capacity so that adding works takes amortised constant time
+            for name in self.counts:
+                self.counts[name] = np.resize(self.counts[name], (max(2 * capacity, 1),
+                                              self.counts[name].shape[1]))
+                self.counts[name][capacity:] = 0
+
+        for name in SEGMENTS:
+            if name in counts and name not in self.counts:
+                self.vocabularies[name] = Vocabulary(range(0, LENGTHS[name]))
+                self.counts[name] = np.zeros((len(self.counts['char_freq']), LENGTHS[name]),
+                                             dtype=np.int64)
+
+        for name in LENGTHS:
+            lengths = counts.get(name, ())
+            if name in self.counts and len(lengths) > len(self.vocabularies[name]):
+                #Long words, sentences or lines need extra buckets for every work
+                self.vocabularies[name].extend(range(0, len(lengths)))
+                extra = len(lengths) - self.counts[name].shape[1]
+                self.counts[name] = np.pad(self.counts[name], ((0, 0), (0, extra)))
+
+        extra_count = counts.get('char_extra')
+        if extra_count:
+            #New characters need extra columns for every work
+            self.vocabularies['char_freq'].extend(extra_count)
+            extra = len(self.vocabularies['char_freq']) - self.counts['char_freq'].shape[1]
+            if extra:
+                self.counts['char_freq'] = np.pad(self.counts['char_freq'],
+                                                  ((0, 0), (0, extra)))
+                self._index_punctuations()
+
+        for name in self.counts:
+            if name in counts:
+                self.counts[name][row, :len(counts[name])] = counts[name]
+        if extra_count:
+            ids = self.vocabularies['char_freq'].ids
+            self.counts['char_freq'][row, [ids[x] for x in extra_count]] = list(
+                extra_count.values())
+        record = WorkRecord(work, row)
+        self.records.append(record)
+
+        return record
+
+
+    def get_statistics(self):
+        """Getter for the statistics held by the store.
+
+        Returns:
+            statistics (list): The keys of LABELS, without the sentences and
+                lines unless the works were segmented.
+
+        """
+
+        return [name for name in LABELS if name == 'punc_freq' or name in self.counts]
+
+
+    def has_segments(self):
+        """Checks if the works were segmented into sentences and lines.
+
+        Returns:
+            True if the store holds the sentences and lines.
+
+        """
+
+        return all(name in self.counts for name in SEGMENTS)
+
+
+    def get_matrix(self, name):
+        """Getter for the works x features count matrix of a statistic.
+
+        Arguments:
+            name (string): The statistic, one of the keys of LABELS.
+
+        Returns:
+            matrix (numpy array): A read-only view of the counts, one row per work.
+
+        """
+
+        if name == 'punc_freq':
+            matrix = self.counts['char_freq'][:len(self.records), self._punc_columns]
+        else:
+            matrix = self.counts[name][:len(self.records)]
+        matrix = matrix.view()
+        matrix.flags.writeable = False
+        return matrix
+
+
+    def get_frequencies(self, name):
+        """Getter for the works x features relative frequency matrix of a statistic.
+
+        Function for dividing the occurrences of each work by its total number
+        of characters for the characters and punctuations, of words for the
+        stopwords and word lengths, or of sentences or lines for their
+        distributions. Works without any get frequencies of zero.
+
+        Arguments:
+            name (string): The statistic, one of the keys of LABELS.
+
+        Returns:
+            frequencies (numpy array): The relative frequencies, one row per work.
+
+        """
+
+        if name in ('char_freq', 'punc_freq'):
+            total = 'char_freq'
+        elif name in ('stop_freq', 'word_len_freq'):
+            total = 'word_len_freq'
+        else:
+            total = name
+        totals = self.get_matrix(total).sum(axis=1, keepdims=True)
+        return self.get_matrix(name) / np.maximum(totals, 1)
+
+
+    def get_segment_summary(self):
+        """Getter for the number and mean length of the sentences and lines.
+
+        Function for summarising the distributions of the sentences and lines
+        of each work by their number and means, NaN for works without any.
+
+        Returns:
+            summary (dict): The 'sentences', 'lines', 'words_per_sentence',
+                'words_per_line' and 'punctuations_per_sentence' of each work.
+
+        """
+
+        if not self.has_segments():
+            raise ValueError('The works were not segmented into sentences and lines')
+        summary = {}
+        means = {'sent_len_freq': 'words_per_sentence', 'line_len_freq': 'words_per_line',
+                 'sent_punc_freq': 'punctuations_per_sentence'}
+        for name, mean in means.items():
+            matrix = self.get_matrix(name)
+            totals = matrix.sum(axis=1)
+            if name != 'sent_punc_freq':
+                summary['sentences' if name == 'sent_len_freq' else 'lines'] = totals
+            lengths = np.asarray(self.vocabularies[name].labels, dtype=np.float64)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                summary[mean] = matrix @ lengths / totals
+        return summary
+
+
+    def get_frame(self, name, row):
+        """Getter for the occurrence dataframe of a statistic of a work.
+
+        Arguments:
+            name (string): The statistic, one of the keys of LABELS.
+            row (int): The row of the work.
+
+        Returns:
+            occ (pandas DataFrame): The dataframe of occurrence, the same as the
+                ones returned by the getters of the analysers.
+
+        """
+
+        import pandas as pd
+
+        return pd.DataFrame({LABELS[name]: self.vocabularies[name].labels,
+                             'occurence': self.get_matrix(name)[row]})
+
+
+    def to_stats_frame(self):
+        """Builds the dataframe of dataframes of all the works.
+
+        Function for building the stats of all the works in the format expected
+        by the AnalysisVisualiser, one row per work, with the sentences and
+        lines only if the works were segmented.
+
+        Returns:
+            all_text_stats (pandas DataFrame): The stats of all the works.
+
+        """
+
+        import pandas as pd
+
+        statistics = self.get_statistics()
+        colnames = ['work'] + statistics
+        return pd.DataFrame([[record.work] + [self.get_frame(name, record.row)
+                                              for name in statistics]
+                             for record in self.records], columns=colnames)
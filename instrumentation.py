@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+"""
+Created on         : 17/10/2026
+Last modified on   : 17/10/2026
+Author             : Satyabrat Borgohain
+Description :
+
+    This class records the metrics of a run of the stylometric analyser: the
+    time spent in each stage of the pipeline, counters such as the number of
+    cached works, and the bytes, tokens and distinct words of every work with
+    the time spent reading, tokenising and extracting it. The metrics are
+    printed as a table at the end of the run and can be written to JSON.
+
+    The main process can also be profiled with cProfile, and the peak memory of
+    each stage traced with tracemalloc. Only the standard library is used, so the
+    instrumentation does not slow down the startup of the counts-only runs.
+
+    Objects of this class can be created for standalone puposes.
+"""
+
+
+
+import sys
+import json
+import time
+import traceback
+import tracemalloc
+import contextlib
+from collections import Counter
+
+def timed(iterable, timings, name):
+    """Yields the items of an iterable, timing how long each takes to produce.
+
+    Arguments:
+        iterable (iterable): The items, e.g. the chunks read from a file.
+        timings (dict): The times in seconds, the time taken being added to
+            the one under name.
+        name (string): The name of the timing.
+
+    Yields:
+        The items of the iterable.
+
+    """
+
+    iterator = iter(iterable)
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+            return
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+        yield item
+
+
+class RunMetrics:
+    """A metrics class recording the timers and counters of a run.
+
+    """
+
+    def __init__(self, trace_memory=False):
+        """Initializes a RunMetrics object, starting the clock of the run.
+
+        Arguments:
+            trace_memory (bool): Whether the peak memory of each stage is
+                traced with tracemalloc, which slows the run down.
+
+        """
+
+        #Instance variables for the time, calls and peak memory of each stage,
+        #the metrics of each work and the counters of the run
+        self.stages = {}
+        self.works = {}
+        self.counters = Counter()
+        self.status = None
+        #Instance variables for the error which failed the run, if any, and
+        #the innermost stage it was raised in
+        self.error = None
+        self.failed_stage = None
+        self.trace_memory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._start = time.perf_counter()
+        self.seconds = None
+
+
+    def __str__(self):
+        """Prints the stages, works and counters as formatted tables.
+
+        Returns:
+            The metrics as a formatted string.
+
+        """
+
+        lines = ['%-28s %10s %6s %12s' % ('stage', 'time (s)', 'calls', 'peak (MB)')]
+        for name, stage in self.stages.items():
+            peak = '-' if stage['peak_bytes'] is None else '%.2f' % (stage['peak_bytes'] / 2**20)
+            lines.append('%-28s %10.4f %6d %12s' % (name, stage['seconds'], stage['calls'], peak))
+        if self.works:
+            lines.append('')
+            lines.append('%-36s %10s %9s %8s %8s %8s %8s %12s' % (
+                'work', 'bytes', 'tokens', 'words', 'read', 'tokenise', 'extract', 'tokens/s'))
+            for work, metrics in self.works.items():
+                if metrics.get('cached'):
+                    lines.append('%-36s %10s' % (work, 'cached'))
+                    continue
+                lines.append('%-36s %10d %9d %8d %8.4f %8.4f %8.4f %12.0f' % (
+                    work, metrics['bytes'], metrics['tokens'], metrics['unique_words'],
+                    metrics['read'], metrics['tokenise'], metrics['extract'],
+                    metrics['tokens'] / max(metrics['seconds'], 1e-9)))
+        if self.counters:
+            lines.append('')
+            lines.extend('%-28s %10d' % (name, value) for name, value in self.counters.items())
+        if self.seconds is not None:
+            lines.append('')
+            lines.append('%-28s %10.4f' % ('total (s)', self.seconds))
+        if self.error is not None:
+            lines.append('%-28s %s in %s : %s' % ('error', self.error['type'],
+                                                  self.error['stage'] or 'no stage',
+                                                  self.error['message']))
+
+        prefix = 'Run metrics : \n' + "======================\n"
+        suffix = "\n======================"
+        return prefix + '\n'.join(lines) + suffix
+
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Times a stage of the run, used as a with statement.
+
+        The time of a stage entered several times is summed.
+
+        Arguments:
+            name (string): The name of the stage.
+
+        """
+
+        stage = self.stages.setdefault(name, {'seconds': 0.0, 'calls': 0, 'peak_bytes': None})
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield stage
+        except BaseException:
+            #Keeping the innermost stage when nested stages fail
+            if self.failed_stage is None:
+                self.failed_stage = name
+            raise
+        finally:
+            stage['seconds'] += time.perf_counter() - start
+            stage['calls'] += 1
+            if tracing:
+                stage['peak_bytes'] = max(stage['peak_bytes'] or 0,
+                                          tracemalloc.get_traced_memory()[1])
+
+
+    def count(self, name, value=1):
+        """Adds to a counter of the run.
+
+        Arguments:
+            name (string): The name of the counter.
+            value (int): The value added.
+
+        """
+
+        self.counters[name] += value
+
+
+    def add_work(self, work, metrics):
+        """Records the metrics of a work.
+
+        Arguments:
+            work (string): The name of the work.
+            metrics (dict): The metrics returned by main.analyse_work, or
+                {'cached': True} if the work was read from the cache.
+
+        """
+
+        self.works[work] = metrics
+        if not metrics.get('cached'):
+            for name in ('bytes', 'tokens'):
+                self.count(name, metrics[name])
+
+
+    def record_error(self, error, stream=None):
+        """Records the error which failed the run and the stage it was raised in.
+
+        Arguments:
+            error (Exception): The error.
+            stream (file): The file the traceback of the error is printed to,
+                not printed if not given.
+
+        """
+
+        self.error = {'type': type(error).__name__, 'message': str(error),
+                      'stage': self.failed_stage}
+        if stream is not None:
+            traceback.print_exception(type(error), error, error.__traceback__, file=stream)
+
+
+    def finish(self, status):
+        """Stops the clock of the run.
+
+        Arguments:
+            status (int): The exit status of the run.
+
+        """
+
+        self.status = status
+        self.seconds = time.perf_counter() - self._start
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+
+    def to_dict(self):
+        """Converts the metrics to a dictionary for JSON.
+
+        Returns:
+            report (dict): The status, total time, error, stages, works and
+                counters.
+
+        """
+
+        return {'status': self.status, 'seconds': self.seconds, 'error': self.error,
+                'stages': self.stages, 'works': self.works, 'counters': dict(self.counters)}
+
+
+    def write_json(self, path):
+        """Writes the metrics to a JSON file.
+
+        Arguments:
+            path (string): The path of the JSON file.
+
+        """
+
+        with open(path, 'w') as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+
+def start_profile():
+    """Starts profiling the current process with cProfile.
+
+    Returns:
+        profiler (cProfile Profile): The running profiler.
+
+    """
+
+    import cProfile
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return profiler
+
+
+def stop_profile(profiler, path=None, top=20, stream=None):
+    """Stops a profiler and prints the functions with the largest cumulative time.
+
+    Function for printing the profile at the end of a run, and saving its
+    statistics for pstats or snakeviz if a path is given. Only the current
+    process is profiled, not the worker processes.
+
+    Arguments:
+        profiler (cProfile Profile): The profiler returned by start_profile.
+        path (string): The path the statistics are saved to.
+        top (int): The number of functions printed.
+        stream (file): The file the functions are printed to, the standard
+            error if not given.
+
+    """
+
+    import pstats
+
+    profiler.disable()
+    if path is not None:
+        profiler.dump_stats(path)
+    pstats.Stats(profiler, stream=stream or sys.stderr).sort_stats('cumulative').print_stats(top)
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+Created on         : 17/10/2026
+Last modified on   : 17/10/2026
+Author             : Satyabrat Borgohain
+Description :
+
+    This module provides the stopword lexicons used by the word analysis and
+    the visualisation. A default list is bundled in the lexicons folder, custom
+    lists can be loaded from local files and lists published on the web can be
+    fetched from a URL and cached on disk.
+
+    A lexicon is parsed only once per process and shared by every caller.
+"""
+
+
+
+import os
+import hashlib
+
+#Path of the bundled default stopword list
+DEFAULT_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                              'lexicons', 'onix.txt')
+#Lexicons already loaded by the process, keyed by their source
+_lexicons = {}
+
+class StopwordLexicon:
+    """A lexicon class holding an ordered list of stopwords with constant time
+    lookup.
+
+    """
+
+    def __init__(self, words, source=None):
+        """Initializes a StopwordLexicon object with the uppercased stopwords in
+        their original order and a frozenset for the lookups.
+
+        Arguments:
+            words (iterable): The stopwords.
+            source (string): The file or URL the stopwords were taken from.
+
+        """
+
+        #Instance variable for the stopwords in order, without duplicates
+        self.words = tuple(dict.fromkeys(x.upper() for x in words))
+        #Instance variable for the lookups
+        self.lookup = frozenset(self.words)
+        self.source = source
+
+
+    def __str__(self):
+        """Prints the number of stopwords as a formatted string.
+
+        Returns:
+            The number of stopwords and their source as a formatted string.
+
+        """
+
+        prefix = 'Stopwords : \n' + "======================\n"
+        suffix = "\n======================"
+        return prefix + str(len(self.words)) + ' from ' + str(self.source) + suffix
+
+
+    def __contains__(self, word):
+        """Checks if an uppercased word is a stopword.
+
+        """
+
+        return word in self.lookup
+
+
+    def __iter__(self):
+        """Iterates over the stopwords in their original order.
+
+        """
+
+        return iter(self.words)
+
+
+    def __len__(self):
+        """Returns the number of stopwords.
+
+        """
+
+        return len(self.words)
+
+
+def parse_stopwords(text):
+    """Extracts the stopwords from the content of a stopword list.
+
+    Arguments:
+        text (string): One stopword per line, lines starting with # are ignored.
+
+    Returns:
+        stopwords (list): The list of stopwords.
+
+    """
+
+    stopwords = [x.strip() for x in text.split('\n')]
+    return [x for x in stopwords if x != '' and not x.startswith('#')]
+
+
+def fetch_stopwords(url, cache_dir=None):
+    """Fetches the content of a stopword list published on the web.
+
+    Function for downloading a stopword list, reading the text of the <pre>
+    element if the page is HTML. The content is stored in the cache folder if
+    one is given and read from there on the next calls.
+
+    Arguments:
+        url (string): The URL of the stopword list.
+        cache_dir (string): The folder used for caching the downloaded lists.
+
+    Returns:
+        text (string): The content of the stopword list.
+
+    """
+
+    cache_file = None
+    if cache_dir is not None:
+        name = hashlib.sha1(url.encode('utf-8')).hexdigest() + '.txt'
+        cache_file = os.path.join(cache_dir, name)
+        if os.path.exists(cache_file):
+            with open(cache_file, 'r', encoding='utf-8') as file:
+                return file.read()
+
+    #Imported here so that the offline lists do not need them
+    import requests
+    from lxml import html
+
+    html_page = requests.get(url)
+    html_page.raise_for_status()
+    if 'html' in html_page.headers.get('Content-Type', ''):
+        dom = html.fromstring(html_page.content)
+        text = dom.xpath('//pre/text()')[0]
+    else:
+        text = html_page.text
+
+    if cache_file is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        #Writing to a temporary file first so that readers never see half a list
+        with open(cache_file + '.tmp', 'w', encoding='utf-8') as file:
+            file.write(text)
+        os.replace(cache_file + '.tmp', cache_file)
+
+    return text
+
+
+def load_lexicon(source, cache_dir=None):
+    """Loads a stopword lexicon from a local file or a URL.
+
+    Arguments:
+        source (string): The path or URL of the stopword list.
+        cache_dir (string): The folder used for caching the downloaded lists.
+
+    Returns:
+        lexicon (StopwordLexicon): The stopword lexicon.
+
+    """
+
+    if source.startswith(('http://', 'https://')):
+        text = fetch_stopwords(source, cache_dir)
+    else:
+        with open(source, 'r', encoding='utf-8') as file:
+            text = file.read()
+
+    return StopwordLexicon(parse_stopwords(text), source)
+
+
+def get_stopwords(source=None, cache_dir=None):
+    """Getter for a stopword lexicon shared by the whole process.
+
+    Function for loading a stopword lexicon the first time it is requested and
+    returning the same object afterwards.
+
+    Arguments:
+        source (string): The path or URL of the stopword list, the bundled list
+            if not given.
+        cache_dir (string): The folder used for caching the downloaded lists.
+
+    Returns:
+        lexicon (StopwordLexicon): The stopword lexicon.
+
+    """
+
+    if source is None:
+        source = DEFAULT_SOURCE
+    if source not in _lexicons:
+        _lexicons[source] = load_lexicon(source, cache_dir)
+
+    return _lexicons[source]
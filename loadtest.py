@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+"""
+Created on         : 17/10/2026
+Last modified on   : 17/10/2026
+Author             : Satyabrat Borgohain
+Description :
+
+    This script load tests the analysis server locally. A number of clients
+    send analysis requests concurrently over kept alive connections, and the
+    throughput in requests per second and the median, 90th and 99th percentile
+    latencies are reported.
+
+    Usage : python loadtest.py [--spawn --workers 4] [--requests 200]
+                               [--concurrency 8] [--mode text|path]
+
+    With --spawn, a server is started for the test and stopped after it;
+    otherwise the server given by --port or --unix must already be running.
+"""
+
+
+
+import os
+import sys
+import json
+import math
+import time
+import asyncio
+import argparse
+import subprocess
+import main
+import server as srv
+
+def percentile(values, q):
+    """Computes a percentile of values by the nearest rank method.
+
+    Arguments:
+        values (list): The sorted values.
+        q (float): The percentile, between 0 and 100.
+
+    Returns:
+        The value at the percentile, None if there are no values.
+
+    """
+
+    if not values:
+        return None
+    return values[min(len(values) - 1, max(0, int(math.ceil(q / 100 * len(values))) - 1))]
+
+
+async def open_connection(args):
+    """Opens a connection to the server.
+
+    Arguments:
+        args (argparse Namespace): The parsed arguments.
+
+    Returns:
+        The reader and writer of the connection.
+
+    """
+
+    if args.unix is not None:
+        return await asyncio.open_unix_connection(args.unix)
+    return await asyncio.open_connection(args.host, args.port)
+
+
+async def request(reader, writer, method, target, payload=None):
+    """Sends a request on a kept alive connection and reads its response.
+
+    Arguments:
+        reader (asyncio StreamReader): The incoming side of the connection.
+        writer (asyncio StreamWriter): The outgoing side of the connection.
+        method (string): The HTTP method.
+        target (string): The path requested.
+        payload (bytes): The JSON body of the request.
+
+    Returns:
+        status (int): The HTTP status of the response.
+        body (bytes): The body of the response.
+
+    """
+
+    payload = payload or b''
+    writer.write(('%s %s HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n'
+                  'Content-Length: %d\r\n\r\n' % (method, target, len(payload))).encode(
+                      'latin-1') + payload)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        key, _, value = line.decode('latin-1').partition(':')
+        if key.strip().lower() == 'content-length':
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+
+async def client(args, payloads, queue, latencies, errors):
+    """Sends the requests taken from a queue one after another.
+
+    Arguments:
+        args (argparse Namespace): The parsed arguments.
+        payloads (list): The bodies of the requests, used in turn.
+        queue (asyncio Queue): The indices of the requests left.
+        latencies (list): The latencies in seconds, appended to.
+        errors (list): The statuses or errors of the failed requests, appended to.
+
+    """
+
+    reader, writer = await open_connection(args)
+    try:
+        while not queue.empty():
+            i = queue.get_nowait()
+            start = time.perf_counter()
+            try:
+                status, body = await request(reader, writer, 'POST', '/analyse',
+                                             payloads[i % len(payloads)])
+            except (ConnectionError, asyncio.IncompleteReadError) as err:
+                errors.append(str(err))
+                reader, writer = await open_connection(args)
+                continue
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def load_test(args, payloads):
+    """Runs the load test.
+
+    Arguments:
+        args (argparse Namespace): The parsed arguments.
+        payloads (list): The bodies of the requests, used in turn.
+
+    Returns:
+        report (dict): The number of requests and errors, the throughput and
+            the latencies in milliseconds.
+
+    """
+
+    #Warming up the workers so that their startup is not measured
+    reader, writer = await open_connection(args)
+    for payload in payloads[:max(1, args.warmup)]:
+        await request(reader, writer, 'POST', '/analyse', payload)
+    writer.close()
+
+    queue = asyncio.Queue()
+    for i in range(args.requests):
+        queue.put_nowait(i)
+    latencies, errors = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*[client(args, payloads, queue, latencies, errors)
+                           for _ in range(args.concurrency)])
+    seconds = time.perf_counter() - start
+
+    latencies.sort()
+    report = {'requests': args.requests, 'concurrency': args.concurrency,
+              'mode': args.mode, 'errors': len(errors), 'seconds': seconds,
+              'requests_per_second': args.requests / seconds}
+    for q in (50, 90, 99):
+        report['p%d_ms' % q] = percentile(latencies, q) * 1e3 if latencies else None
+    report['max_ms'] = latencies[-1] * 1e3 if latencies else None
+    return report
+
+
+def make_payloads(args):
+    """Builds the request bodies from the works of the dataset.
+
+    Arguments:
+        args (argparse Namespace): The parsed arguments.
+
+    Returns:
+        payloads (list): The JSON bodies, one per work.
+
+    """
+
+    works = main.find_works(args.dataset, args.pattern)
+    payloads = []
+    for work in works:
+        if args.mode == 'path':
+            payload = {'path': os.path.abspath(work)}
+        else:
+            with open(work, 'r') as file:
+                payload = {'text': file.read(args.text_bytes or -1)}
+        payload['raw'] = args.raw
+        payloads.append(json.dumps(payload).encode('utf-8'))
+    return payloads
+
+
+def spawn_server(args):
+    """Starts a server for the test and waits until it answers.
+
+    Arguments:
+        args (argparse Namespace): The parsed arguments.
+
+    Returns:
+        process (Popen): The server process.
+
+    """
+
+    command = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                            'server.py'), '--workers', str(args.workers)]
+    command += ['--unix', args.unix] if args.unix is not None else ['--host', args.host,
+                                                                    '--port', str(args.port)]
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+
+    async def ping():
+        reader, writer = await open_connection(args)
+        await request(reader, writer, 'GET', '/health')
+        writer.close()
+
+    deadline = time.monotonic() + 60
+    while True:
+        try:
+            asyncio.run(ping())
+            return process
+        except (OSError, asyncio.IncompleteReadError):
+            if process.poll() is not None or time.monotonic() > deadline:
+                process.kill()
+                raise IOError('The server did not start')
+            time.sleep(0.1)
+
+
+def parse_arguments(argv=None):
+    """Parses the command line arguments of the load test.
+
+    Arguments:
+        argv (list): The arguments to be parsed, sys.argv if not given.
+
+    Returns:
+        args (argparse Namespace): The parsed arguments.
+
+    """
+
+    parser = argparse.ArgumentParser(description='Load test of the analysis server.')
+    parser.add_argument('--host', default=srv.DEFAULT_HOST, help='address of the server')
+    parser.add_argument('--port', type=int, default=srv.DEFAULT_PORT, help='port of the server')
+    parser.add_argument('--unix', default=None, help='Unix socket of the server')
+    parser.add_argument('--spawn', action='store_true',
+                        help='start a server for the test and stop it afterwards')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='number of worker processes of the spawned server')
+    parser.add_argument('--requests', type=int, default=200, help='number of requests')
+    parser.add_argument('--concurrency', type=int, default=8,
+                        help='number of clients sending requests at the same time')
+    parser.add_argument('--warmup', type=int, default=4,
+                        help='number of requests sent before the measurement')
+    parser.add_argument('--mode', default='text', choices=['text', 'path'],
+                        help='send the texts of the works or only their paths')
+    parser.add_argument('--text-bytes', type=int, default=0,
+                        help='number of characters of each work sent, all if 0')
+    parser.add_argument('--raw', action='store_true',
+                        help='tokenise the works as raw text')
+    parser.add_argument('--dataset', nargs='+', default=[main.DEFAULT_DATASET],
+                        help='files, folders or glob patterns of the works sent')
+    parser.add_argument('--pattern', default=main.DEFAULT_PATTERN,
+                        help='glob pattern of the files in the folders given')
+    parser.add_argument('--json', default=None,
+                        help='path of a JSON file the report is written to')
+    return parser.parse_args(argv)
+
+
+if __name__=='__main__':
+    """Function for running the load test on running the module
+
+    """
+
+    args = parse_arguments()
+    payloads = make_payloads(args)
+    process = spawn_server(args) if args.spawn else None
+    try:
+        report = asyncio.run(load_test(args, payloads))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    print('%d requests, %d clients, %s mode : %d errors' % (
+        report['requests'], report['concurrency'], report['mode'], report['errors']))
+    print('%-20s %10.1f' % ('requests/s', report['requests_per_second']))
+    for key in ('p50_ms', 'p90_ms', 'p99_ms', 'max_ms'):
+        print('%-20s %10.2f' % (key.replace('_ms', ' (ms)'), report[key]))
+    if args.json is not None:
+        with open(args.json, 'w') as file:
+            json.dump(report, file, indent=2)
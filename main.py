@@ -1,134 +1,615 @@
 # -*- coding: utf-8 -*-
 """
 Created on         : 19/05/2018
-Last modified on   : 27/05/2018
+Last modified on   : 17/10/2026
 Author             : Satyabrat Borgohain
 Description :
     
     This script has the main method which drives the flow of the whole stylometric 
     analysis combining all the classes and reading the texts for their analysis.
 
+    Usage : python main.py [works or folders ...] [--workers 4] [-o results]
+                           [--export-format npz] [--plots character stopword]
+                           [--no-plot] [--attribute delta] [--neighbours 10]
+                           [--richness] [--sentences]
+
+    Run python main.py --help for all the options. With --counts-only, the
+    occurrences of the works are printed as JSON lines without importing
+    pandas or matplotlib, NumPy only being used for the frequency spectrum.
+
+    With --metrics, the time of each stage and the bytes, tokens and distinct
+    words of each work are printed at the end of the run, and --metrics-json
+    writes them to a file. --profile and --trace-memory add a cProfile report
+    and the peak memory of each stage. The error failing a run, if any, is
+    reported with the stage it was raised in, and its traceback is printed
+    to the standard error with --metrics or --profile.
+
 """
 
 
 
+import argparse
+import glob
+import json
+import os
+import sys
+import sqlite3
+import time
+from itertools import repeat
+
 try:
-    import pandas as pd
-    import requests
     import preprocessor as prpscr
-    import character as char
-    import word
-    import visualiser as vis
+    import extractor as extr
+    import segmenter as sgm
+    import lexicon
+    import resultcache as rcache
+    import instrumentation
 except ImportError as err:
     print('IMPORT ERROR :',err, '. Please check the working directory, name or '+
           'make sure that module is imported!')
     
-#Variable containing names of files to be read - can be replaced with whatever 
-#tokenised files need to be analysed
-works = ['Edward_II_Marlowe.tok','Hamlet_Shakespeare.tok', 'Henry_VI_Part1_Shakespeare.tok', 
-         'Henry_VI_Part2_Shakespeare.tok', 'Jew_of_Malta_Marlowe.tok',
-         'Richard_II_Shakespeare.tok']
+#Folder of the works analysed when none is given - the sample dataset next to
+#this script, so that it runs from any working directory
+DEFAULT_DATASET = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sample_dataset')
+#Pattern of the files analysed in the folders given
+DEFAULT_PATTERN = '*.tok'
+#Names of the visualisations, as in visualiser.VISUALISATIONS which is only
+#imported when plotting
+VISUALISATIONS = ('punctuation', 'character', 'stopword', 'wordlength')
+
+def find_works(inputs, pattern=DEFAULT_PATTERN, recursive=False):
+    """Expands the files, folders and glob patterns given into a list of works.
+
+    Arguments:
+        inputs (list): The paths of files or folders, or glob patterns.
+        pattern (string): The glob pattern of the files analysed in a folder.
+        recursive (bool): Whether the subfolders of a folder are searched too.
+
+    Returns:
+        works (list): The paths of the works, sorted within each input and
+            without duplicates.
+
+    """
+
+    works = []
+    for path in inputs:
+        if os.path.isdir(path):
+            folder = os.path.join(glob.escape(path), '**') if recursive else glob.escape(path)
+            matches = sorted(x for x in glob.glob(os.path.join(folder, pattern),
+                                                   recursive=recursive) if os.path.isfile(x))
+        elif any(x in path for x in '*?['):
+            matches = sorted(x for x in glob.glob(path, recursive=True) if os.path.isfile(x))
+        else:
+            #Missing files are reported when they are read
+            matches = [path]
+        works.extend(matches)
+    
+    if not works:
+        raise ValueError('No works found in ' + ', '.join(inputs))
+    return list(dict.fromkeys(works))
+
+
+def work_names(works):
+    """Names the works for the results, by their file names unless two works
+    share a file name.
+
+    Arguments:
+        works (list): The paths of the works.
+
+    Returns:
+        names (list): The names of the works.
+
+    """
+
+    names = [os.path.basename(work) for work in works]
+    return names if len(set(names)) == len(names) else list(works)
 
-def main():
+
+def parse_arguments(argv=None):
+    """Parses the command line arguments of the stylometric analyser.
+
+    Arguments:
+        argv (list): The arguments to be parsed, sys.argv if not given.
+
+    Returns:
+        args (argparse Namespace): The parsed arguments.
+
+    """
+
+    parser = argparse.ArgumentParser(description='Stylometric analysis of tokenised works.')
+    parser.add_argument('inputs', nargs='*', default=[DEFAULT_DATASET],
+                        help='files, folders or glob patterns of the works, the '+
+                        'sample dataset if not given')
+    parser.add_argument('--pattern', default=DEFAULT_PATTERN,
+                        help='glob pattern of the files analysed in the folders given')
+    parser.add_argument('--recursive', action='store_true',
+                        help='search the subfolders of the folders given')
+    parser.add_argument('--raw', action='store_true',
+                        help='tokenise the works as raw text instead of tokenised text')
+    parser.add_argument('--stopwords', default=None,
+                        help='path or URL of the stopword list, the bundled list '+
+                        'if not given')
+    parser.add_argument('--stopword-cache', default=None,
+                        help='folder for caching the stopword lists fetched from a URL')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='number of processes analysing the works, 0 for one '+
+                        'per CPU')
+    parser.add_argument('--chunk-size', type=int, default=prpscr.DEFAULT_CHUNK_SIZE,
+                        help='number of bytes of a work read at a time')
+    parser.add_argument('--mmap', action='store_true',
+                        help='read the works through memory maps')
+    parser.add_argument('--cache', default=rcache.DEFAULT_PATH,
+                        help='path of the database caching the analysed works')
+    parser.add_argument('--cache-size', type=int, default=rcache.DEFAULT_MAX_BYTES >> 20,
+                        help='size limit of the cache in megabytes')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='analyse every work without reading or writing the cache')
+    parser.add_argument('--rebuild', action='store_true',
+                        help='analyse every work again and refresh the cache')
+    parser.add_argument('-o', '--output-dir', default=None,
+                        help='folder the occurrences are exported to and the figures '+
+                        'saved to, in its plots subfolder')
+    parser.add_argument('--export', default=None,
+                        help='folder the occurrences of all the works are exported to')
+    parser.add_argument('--export-format', default='auto',
+                        choices=['auto', 'parquet', 'feather', 'npz'],
+                        help='format of the export, Parquet if pyarrow is installed '+
+                        'and npz otherwise by default')
+    parser.add_argument('--attribute', default=None, choices=['delta', 'cosine'],
+                        help='attribute each work to the nearest author of the other '+
+                        'works, taking the author from the name as in Hamlet_Shakespeare.tok')
+    parser.add_argument('--neighbours', type=int, default=None, metavar='K',
+                        help='print the K works most like each work')
+    parser.add_argument('--distance', default='delta', choices=['delta', 'cosine', 'manhattan'],
+                        help='distance between the works used by --neighbours and '+
+                        '--distance-matrix')
+    parser.add_argument('--distance-matrix', default=None,
+                        help='path of a npz file the works x works distances are saved to')
+    parser.add_argument('--plots', nargs='+', default=list(VISUALISATIONS),
+                        choices=VISUALISATIONS,
+                        help='visualisations drawn, all of them by default')
+    parser.add_argument('--no-plot', action='store_true',
+                        help='skip the visualisations, e.g. for batch runs')
+    parser.add_argument('--plot-dir', default=None,
+                        help='folder the figures are saved to without a display')
+    parser.add_argument('--approximate', action='store_true',
+                        help='count the vocabulary of the works with sketches in bounded '+
+                        'memory, the stopwords and word lengths staying exact')
+    parser.add_argument('--sketch-epsilon', type=float, default=1e-4,
+                        help='largest overestimate of the occurrence of a word relative '+
+                        'to the number of words, with --approximate')
+    parser.add_argument('--sketch-delta', type=float, default=0.01,
+                        help='probability of exceeding that overestimate')
+    parser.add_argument('--top-words', type=int, default=1000,
+                        help='number of most frequent words kept, with --approximate')
+    parser.add_argument('--hll-precision', type=int, default=14,
+                        help='precision of the distinct words estimate, whose relative '+
+                        'error is 1.04 / sqrt(2 ** precision)')
+    parser.add_argument('--richness', action='store_true',
+                        help='print the type/token ratio, hapax legomena, Yule\'s K and '+
+                        'the other measures of the vocabulary richness of each work')
+    parser.add_argument('--ttr-window', type=int, default=500,
+                        help='number of words in a window of the moving average '+
+                        'type/token ratio, with --richness')
+    parser.add_argument('--sentences', action='store_true',
+                        help='segment the works into sentences and lines, printing their '+
+                        'number, mean number of words and punctuations per sentence')
+    parser.add_argument('--counts-only', action='store_true',
+                        help='only write the occurrences of the works as JSON lines, '+
+                        'to counts.jsonl in the output folder or to the standard output')
+    parser.add_argument('--metrics', action='store_true',
+                        help='print the time of each stage and the metrics of each work '+
+                        'at the end of the run')
+    parser.add_argument('--metrics-json', default=None,
+                        help='path of a JSON file the metrics of the run are written to')
+    parser.add_argument('--profile', action='store_true',
+                        help='profile the main process with cProfile and print the '+
+                        'functions taking the most time')
+    parser.add_argument('--profile-output', default=None,
+                        help='path the cProfile statistics are saved to, implies --profile')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='trace the peak memory of each stage with tracemalloc')
+    args = parser.parse_args(argv)
+    
+    if args.output_dir is not None:
+        if args.export is None:
+            args.export = args.output_dir
+        if args.plot_dir is None:
+            args.plot_dir = os.path.join(args.output_dir, 'plots')
+    return args
+
+
+def main(args=None):
     """Main method for controlling the flow of the stylometric analyser.
 
     Function for creating of objects for word, character, punctuation, word length
-    etc analysis.= to determine the patterns of styles in different works.
+    etc analysis.= to determine the patterns of styles in different works. The
+    modules of the attribution, export and visualisation, and the libraries
+    they need, are only imported if these stages are requested.
+
+    Arguments:
+        args (argparse Namespace): The parsed arguments, read from the command
+            line if not given.
+
+    Returns:
+        status (int): 0 if the analysis succeeded and 1 otherwise.
 
     """
     
-    #Column names
-    colnames = ['work', 'char_freq', 'punc_freq', 'stop_freq', 'word_len_freq']
-    #Initializing an empty dataframe to store all stats after analysis
-    all_text_stats = pd.DataFrame(columns=colnames)
+    if args is None:
+        args = parse_arguments()
+    
+    #Timers and counters of the run, and the optional profiler of the main process
+    metrics = instrumentation.RunMetrics(args.trace_memory)
+    profiler = None
+    if args.profile or args.profile_output is not None:
+        profiler = instrumentation.start_profile()
+    status = 1
+    #Printing the tracebacks of the errors when the run is being diagnosed
+    trace = sys.stderr if args.metrics or profiler is not None else None
     
     #Try block
     try: 
         #-----------------------------Analysis----------------------------------
-        #Main loop for doing the analysis file by file
-        for work in works:
-            #calling read_input function to read the content of each file
-            content = read_input(work)
-            
-            #Creating object for preprocessor class
-            pre_processor = prpscr.Preprocessor()
-            pre_processor.tokenise(content)
-            #Fetching the tokens
-            tokens = pre_processor.get_tokenised_list()
-            
-            #Creating object for CharacterAnalyser class
-            char_analyser = char.CharacterAnalyser()
-            #Analysing at character level
-            char_analyser.analyse_characters(tokens)
-            #Fetching the character occurences
-            ch_occ = char_analyser.char_occ
-            #Fetching the punctuation occurences
-            punc_occ = char_analyser.get_punctuation_frequency()
-            
-            #Creating object for WordAnalyser class
-            word_analyser = word.WordAnalyser() 
-            #Analysing at word level
-            word_analyser.analyse_words(tokens)
-            #Fetching the stop word occurences
-            stop_occ = word_analyser.get_stopword_frequency()
-            #Fetching the word length occurences
-            word_len_occ = word_analyser.get_word_length_frequency()
-            
-            #Temporary df to store all the analysis for one text at a time
-            temp_df = pd.DataFrame([[work,ch_occ, punc_occ, stop_occ, word_len_occ]],
-                                  columns=colnames)
+        with metrics.stage('find works'):
+            works = find_works(args.inputs, args.pattern, args.recursive)
+            names = work_names(works)
+        #Loading the stopwords once for all the works
+        with metrics.stage('stopwords'):
+            stopwords = lexicon.get_stopwords(args.stopwords, args.stopword_cache)
+        sketch = None
+        if args.approximate:
+            sketch = {'epsilon': args.sketch_epsilon, 'delta': args.sketch_delta,
+                      'top_k': args.top_words, 'precision': args.hll_precision}
+        if args.richness and sketch is not None:
+            raise ValueError('The richness needs the exact occurrences of the words, '+
+                             'it cannot be measured with --approximate')
+        #The moving average type/token ratio needs the words in order, so it is
+        #only computed when the richness is reported
+        ttr_window = args.ttr_window if args.richness else None
+        segment = args.sentences
+        #Looking up the works analysed before with the same configuration
+        with metrics.stage('cache lookup'):
+            cache = None if args.no_cache else rcache.ResultCache(args.cache,
+                                                                  args.cache_size << 20)
+            all_counts = [None]*len(works)
+            if cache is not None:
+                keys = [cache.make_key(work, stopwords, args.raw, sketch, ttr_window, segment)
+                        for work in works]
+                if not args.rebuild:
+                    all_counts = [cache.get(key) for key in keys]
+        pending = [i for i, counts in enumerate(all_counts) if counts is None]
+        metrics.count('works', len(works))
+        metrics.count('cached works', len(works) - len(pending))
+        for name, counts in zip(names, all_counts):
+            if counts is not None:
+                metrics.add_work(name, {'cached': True})
+        
+        #Analysing the remaining works file by file, or in a pool of processes
+        #which return the results in the same order as the works
+        pending_works = [works[i] for i in pending]
+        workers = args.workers or os.cpu_count()
+        with metrics.stage('analysis'):
+            if workers > 1 and len(pending) > 1:
+                from concurrent.futures import ProcessPoolExecutor
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    chunksize = max(1, len(pending) // (workers * 4))
+                    results = list(executor.map(analyse_work, pending_works,
+                                                repeat(stopwords), repeat(args.chunk_size),
+                                                repeat(args.mmap), repeat(args.raw),
+                                                repeat(True), repeat(sketch),
+                                                repeat(ttr_window), repeat(segment),
+                                                chunksize=chunksize))
+            else:
+                results = [analyse_work(work, stopwords, args.chunk_size, args.mmap,
+                                        args.raw, True, sketch, ttr_window, segment)
+                           for work in pending_works]
+        with metrics.stage('cache store'):
+            for i, (counts, work_metrics) in zip(pending, results):
+                all_counts[i] = counts
+                metrics.add_work(names[i], work_metrics)
+                if cache is not None:
+                    cache.put(keys[i], counts)
+            if cache is not None:
+                cache.close()
+        if args.counts_only:
+            with metrics.stage('write counts'):
+                write_counts(names, all_counts, args.output_dir)
+            status = 0
+            return status
+        
+        #Reporting the approximate vocabulary of the works
+        if sketch is not None:
+            for name, counts in zip(names, all_counts):
+                vocabulary = counts['vocabulary']
+                print('%-40s %d words, about %d distinct (type/token ratio %.4f)' % (
+                    name, vocabulary['tokens'], vocabulary['types'],
+                    vocabulary['type_token_ratio']))
+        
+        #Reporting the richness of the vocabulary of the works
+        if args.richness:
+            with metrics.stage('richness'):
+                import richness
+                table = [richness.richness_metrics(richness.spectrum_from_pairs(
+                    counts['spectrum'])) for counts in all_counts]
+                for values, counts in zip(table, all_counts):
+                    values['mattr'] = counts['mattr']
+            print(richness_table(names, table))
+        
+        #Storing the occurences of all the works as rows of count matrices
+        with metrics.stage('feature store'):
+            import featurestore as fstore
+            store = fstore.FeatureStore(stopwords, capacity=len(works))
+            for name, counts in zip(names, all_counts):
+                store.add_work(name, counts)
+        if args.sentences:
+            print(sentence_table(names, store.get_segment_summary()))
+        #Exporting the occurences for the downstream tools
+        if args.export is not None:
+            with metrics.stage('export'):
+                import export
+                export.export_store(store, args.export, args.export_format)
+        
+        #-----------------------------Attribution-------------------------------
+        if args.attribute is not None:
+            with metrics.stage('attribution'):
+                import attribution as attr
+                profiles = attr.profile_matrix(store)[0]
+                authors = [attr.author_from_name(work) for work in works]
+                attributor = attr.AuthorshipAttributor(profiles, authors)
+                predicted = attributor.leave_one_out(args.attribute)[0]
+            for name, author in zip(names, predicted):
+                print('%-40s %s' % (name, author))
         
-            all_text_stats = all_text_stats.append(temp_df, ignore_index=True)
+        #-----------------------------Similarity--------------------------------
+        if args.neighbours is not None or args.distance_matrix is not None:
+            with metrics.stage('similarity'):
+                import numpy as np
+                import attribution as attr
+                import similarity as sim
+                if args.distance_matrix is not None:
+                    profiles = attr.profile_matrix(store)[0]
+                    np.savez(args.distance_matrix, works=np.array(names),
+                             distances=sim.distance_matrix(profiles, args.distance))
+                if args.neighbours is not None:
+                    index = sim.NearestNeighbourIndex.from_store(store, args.distance)
+                    neighbours = [index.query_work(name, args.neighbours) for name in names]
+            for name, nearest in zip(names, neighbours if args.neighbours is not None else []):
+                print('%-40s %s' % (name, ', '.join('%s (%.4f)' % x for x in nearest)))
         
         #-----------------------------Visualisation-----------------------------
-        #Creating object for Visualiser class
-        visualiser = vis.AnalysisVisualiser(all_text_stats)
-        #Visualising punctuation frequencies in all the works
-        visualiser.visualise_punctuation_frequency()
-        #Visualising character frequencies in all the works
-        visualiser.visualise_character_frequency()
-        #Visualising stopword frequencies in all the works
-        visualiser.visualise_stopword_frequency()
-        #Visualising word length frequencies in all the works
-        visualiser.visualise_word_length_frequency()
+        if not args.no_plot and args.plots:
+            with metrics.stage('visualisation'):
+                import visualiser as vis
+                #Creating object for Visualiser class
+                #Normalising the occurences of the store once for all the visualisations
+                visualiser = vis.AnalysisVisualiser(store, stopwords, args.plot_dir)
+                #Drawing the requested visualisations of all the works, saved by the
+                #workers if an output folder is given
+                visualiser.render_all(workers if args.plot_dir is not None else 1,
+                                      args.plots)
+        
+        status = 0
+        return status
     
     #Catch for exceptions
     except ImportError as err:
+        metrics.record_error(err, trace)
         print('IMPORT ERROR :',err, '. Please check the working directory, name or '+
           'make sure that module is imported!')
     except TypeError as err:
+        metrics.record_error(err, trace)
         print('TYPE ERROR :', err)
     except IndexError as err:
+        metrics.record_error(err, trace)
         print('INDEX ERROR :', err)
     except ValueError as err:
+        metrics.record_error(err, trace)
         print('VALUE ERROR :', err)
+    #Also catches the errors of requests when fetching the stopwords
     except IOError as err:
+        metrics.record_error(err, trace)
         print('INPUT ERROR :',err, '. Please check the path of the file!')
-    except requests.RequestException as err:
-        print('REQUEST ERROR :', err)    
-    except:
-        print('UNEXPECTED ERROR!')
+    except sqlite3.Error as err:
+        metrics.record_error(err, trace)
+        print('CACHE ERROR :', err)
+    #Letting KeyboardInterrupt and SystemExit through
+    except Exception as err:
+        metrics.record_error(err, trace)
+        print('UNEXPECTED ERROR :', type(err).__name__, err)
+    #Reporting the metrics whether or not the run succeeded
+    finally:
+        metrics.finish(status)
+        if profiler is not None:
+            instrumentation.stop_profile(profiler, args.profile_output)
+        if args.metrics:
+            #Keeping the standard output for the counts if they are written to it
+            stream = sys.stderr if args.counts_only and args.output_dir is None else sys.stdout
+            print(metrics, file=stream)
+        if args.metrics_json is not None:
+            metrics.write_json(args.metrics_json)
+    return 1
+    
+    
+    
+def write_counts(names, all_counts, output_dir=None):
+    """Writes the occurrences of the works as JSON lines.
+
+    Function for writing one JSON object per work, with its name under 'work'
+    and its lists of occurrences keyed by statistic, for the jobs which only
+    need the counts.
+
+    Arguments:
+        names (list): The names of the works.
+        all_counts (list): The occurrences of each work.
+        output_dir (string): The folder counts.jsonl is written to, the
+            standard output if not given.
+
+    """
+
+    if output_dir is None:
+        file = sys.stdout
+    else:
+        os.makedirs(output_dir, exist_ok=True)
+        file = open(os.path.join(output_dir, 'counts.jsonl'), 'w', encoding='utf-8')
+    try:
+        for name, counts in zip(names, all_counts):
+            file.write(json.dumps(dict({'work': name}, **counts), ensure_ascii=False) + '\n')
+    finally:
+        if file is not sys.stdout:
+            file.close()
+
+
+def richness_table(names, table):
+    """Formats the measures of richness of the works as a table.
+
+    Arguments:
+        names (list): The names of the works.
+        table (list): The measures of each work, from richness.richness_metrics.
+
+    Returns:
+        The table as a formatted string.
+
+    """
+
+    columns = list(table[0]) if table else []
+    lines = ['%-36s' % 'work' + ''.join(' %16s' % x for x in columns)]
+    for name, values in zip(names, table):
+        lines.append('%-36s' % name + ''.join(' %16.6g' % values[x] for x in columns))
+    prefix = 'Vocabulary richness : \n' + "======================\n"
+    suffix = "\n======================"
+    return prefix + '\n'.join(lines) + suffix
+
+
+def sentence_table(names, summary):
+    """Formats the sentences and lines of the works as a table.
+
+    Arguments:
+        names (list): The names of the works.
+        summary (dict): The arrays returned by FeatureStore.get_segment_summary.
+
+    Returns:
+        The table as a formatted string.
+
+    """
+
+    lines = ['%-36s %10s %10s %14s %14s %14s' % ('work', 'sentences', 'lines', 'words/sentence',
+                                                 'words/line', 'punc/sentence')]
+    for i, name in enumerate(names):
+        lines.append('%-36s %10d %10d %14.2f %14.2f %14.2f' % (
+            name, summary['sentences'][i], summary['lines'][i],
+            summary['words_per_sentence'][i], summary['words_per_line'][i],
+            summary['punctuations_per_sentence'][i]))
+    prefix = 'Sentences and lines : \n' + "======================\n"
+    suffix = "\n======================"
+    return prefix + '\n'.join(lines) + suffix
+
+
+def analyse_work(work, stopwords, chunk_size=prpscr.DEFAULT_CHUNK_SIZE, use_mmap=False,
+                 raw=False, measure=False, sketch=None, ttr_window=None, segment=False):
+    """Analyses a single work for its character and word level statistics.
+
+    Function for streaming, tokenising and analysing a work a chunk at a time,
+    so that only one chunk of its text is held in memory. The sentences and
+    lines can be segmented in the same pass. It is run by the worker
+    processes, so it returns the compact occurrences instead of dataframes.
+
+    Arguments:
+        work (string): The name of the text to be analysed.
+        stopwords (StopwordLexicon): The stopwords to be analysed.
+        chunk_size (int): The number of bytes read at a time.
+        use_mmap (bool): Whether the work is read through a memory map.
+        raw (bool): Whether the work is tokenised as raw text.
+        measure (bool): Whether the metrics of the work are returned too.
+        sketch (dict): The parameters of a WordSketch counting the vocabulary
+            approximately, the words being counted exactly if not given.
+        ttr_window (int): The number of words in a window of the moving average
+            type/token ratio returned under 'mattr', not computed if not given.
+        segment (bool): Whether the distributions of the sentences and lines
+            are returned too, from Segmenter.get_counts.
+
+    Returns:
+        counts (dict): The lists of occurrences keyed by statistic.
+        metrics (dict): Only if measure is set, the bytes, tokens and distinct
+            words of the work, and the seconds spent reading, tokenising and
+            extracting it and in total.
+
+    """
+
+    #Creating objects for preprocessor and segmenter class
+    pre_processor = prpscr.Preprocessor()
+    segmenter = sgm.Segmenter() if segment else None
+    #Creating object for FeatureExtractor class
+    word_sketch = None
+    if sketch is not None:
+        import sketch as skt
+        word_sketch = skt.WordSketch(**sketch)
+    extractor = extr.FeatureExtractor(stopwords, word_sketch)
+    ttr = None
+    if ttr_window is not None:
+        import richness
+        ttr = richness.MovingAverageTTR(ttr_window)
+    
+    def update(tokens):
+        extractor.update(tokens)
+        if ttr is not None:
+            pattern = extractor.word_pattern
+            ttr.update([x.upper() for x in tokens if pattern.match(x)])
+    
+    def get_counts():
+        counts = extractor.get_counts()
+        if segmenter is not None:
+            counts.update(segmenter.get_counts())
+        if ttr is not None:
+            counts['mattr'] = ttr.value()
+        return counts
     
+    #Extracting the character and word level statistics chunk by chunk
+    chunks = prpscr.read_chunks(work, chunk_size, use_mmap)
+    if not measure:
+        for tokens in pre_processor.iter_tokens(chunks, raw, segmenter):
+            update(tokens)
+        return get_counts()
     
+    #Timing the reading and tokenising as the chunks are pulled through them,
+    #the time of tokenising including the reading of its chunks
+    timings = {'read': 0.0, 'tokenise': 0.0}
+    start = time.perf_counter()
+    chunks = instrumentation.timed(chunks, timings, 'read')
+    for tokens in instrumentation.timed(pre_processor.iter_tokens(chunks, raw, segmenter),
+                                        timings, 'tokenise'):
+        update(tokens)
+    counts = get_counts()
+    seconds = time.perf_counter() - start
     
-def read_input(work):
+    metrics = {'bytes': os.path.getsize(work), 'tokens': pre_processor.token_count,
+               'unique_words': len(extractor.word_count) if sketch is None else
+                               round(extractor.sketch.distinct()), 'read': timings['read'],
+               'tokenise': timings['tokenise'] - timings['read'],
+               'extract': seconds - timings['tokenise'], 'seconds': seconds}
+    return counts, metrics
+
+
+def read_input(work, keep_lines=False):
     """To read the files required for the stylometric analysis.
 
     Function for reading files.
 
     Arguments:
         work (string): The name of the text to be read.
+        keep_lines (bool): Whether the line breaks are kept, e.g. for
+            segmenting the utterances of a tokenised text.
         
     Returns:
         text (string): The content of the file.
 
     """
     
-    file = open(work, 'r')
-    text = ''
-    for line in file:
-        text += line.replace('\n', ' ')
-    file.close()
+    #Replacing the line breaks in one go instead of concatenating line by line
+    with open(work, 'r') as file:
+        text = file.read()
+    if not keep_lines:
+        text = text.replace('\n', ' ')
     
     return text
     
@@ -138,5 +619,5 @@ if __name__=='__main__':
     
     """
     
-    main()
+    sys.exit(main())
 
@@ -0,0 +1,554 @@
+# -*- coding: utf-8 -*-
+"""
+Created on         : 17/10/2026
+Last modified on   : 17/10/2026
+Author             : Satyabrat Borgohain
+Description :
+
+    This class creates objects for analysing the occurrence of character
+    n-grams (e.g. 3 or 4 letters within a word) or word n-grams (e.g. pairs of
+    consecutive words) in a tokenised list.
+
+    The vocabularies of n-grams grow quickly with n, so their memory can be
+    bounded in two ways, one at a time: feature hashing counts every n-gram in
+    one of a fixed number of buckets, and top-k pruning only keeps the k most
+    frequent n-grams using a Space-Saving heavy hitters sketch. The profiles of several
+    works are combined into a sparse works x n-grams matrix, a SciPy CSR
+    matrix if SciPy is installed.
+
+    Objects of this class can be created for standalone puposes.
+"""
+
+
+
+import heapq
+import zlib
+import numpy as np
+from collections import Counter
+import preprocessor as prpscr
+
+def has_scipy():
+    """Checks if SciPy, needed for the SciPy sparse matrices, is installed.
+
+    Returns:
+        True if scipy.sparse can be imported.
+
+    """
+
+    try:
+        import scipy.sparse
+    except ImportError:
+        return False
+    return True
+
+
+def hash_ngram(ngram, width):
+    """Maps an n-gram to its feature hashing bucket.
+
+    The CRC-32 of the n-gram is used rather than the built-in hash, which
+    differs between processes, so that works analysed by different workers
+    share their buckets.
+
+    Arguments:
+        ngram (string): The n-gram.
+        width (int): The number of buckets.
+
+    Returns:
+        bucket (int): The bucket of the n-gram.
+
+    """
+
+    return zlib.crc32(ngram.encode('utf-8')) % width
+
+
+class SpaceSavingSketch:
+    """A heavy hitters sketch class keeping the approximate counts of the k
+    most frequent items of a stream in memory proportional to k.
+
+    """
+
+    def __init__(self, k):
+        """Initializes an empty SpaceSavingSketch object.
+
+        When a new item arrives and the sketch is full, the item with the
+        smallest count is replaced and the new item inherits its count as an
+        overestimate, so a count is never below the true count of the item and
+        exceeds it by at most its error.
+
+        Arguments:
+            k (int): The number of items monitored.
+
+        """
+
+        if k < 1:
+            raise ValueError('The sketch must monitor at least one item')
+        self.k = k
+        #Instance variables for the counts of the monitored items and their
+        #possible overestimate
+        self.counts = {}
+        self.errors = {}
+        #Heap of (count, item), holding stale entries until they reach the top
+        self._heap = []
+
+
+    def __str__(self):
+        """Prints the monitored items as a formatted string.
+
+        Returns:
+            The number of monitored items as a formatted string.
+
+        """
+
+        prefix = 'Space-Saving sketch : \n' + "======================\n"
+        suffix = "\n======================"
+        return prefix + '%d of %d items' % (len(self.counts), self.k) + suffix
+
+
+    def __len__(self):
+        """Returns the number of monitored items.
+
+        """
+
+        return len(self.counts)
+
+
+    def min_count(self):
+        """Getter for the smallest count, the largest possible count of an item
+        which is not monitored.
+
+        Returns:
+            count (int): The smallest count, 0 if the sketch is not full.
+
+        """
+
+        if len(self.counts) < self.k:
+            return 0
+        return self._pop_min(remove=False)[0]
+
+
+    def _push(self, item):
+        """Records the current count of an item in the heap.
+
+        Arguments:
+            item: The item.
+
+        """
+
+        heapq.heappush(self._heap, (self.counts[item], item))
+        if len(self._heap) > 4 * self.k:
+            #Dropping the stale entries
+            self._heap = [(count, x) for x, count in self.counts.items()]
+            heapq.heapify(self._heap)
+
+
+    def _pop_min(self, remove=True):
+        """Finds the monitored item with the smallest count.
+
+        Arguments:
+            remove (bool): If the item is to be removed from the heap.
+
+        Returns:
+            The (count, item) of the smallest count.
+
+        """
+
+        heap = self._heap
+        while self.counts.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+        return heapq.heappop(heap) if remove else heap[0]
+
+
+    def update(self, item, count=1):
+        """Adds occurrences of an item.
+
+        Arguments:
+            item: The item, strings and integers being mutually unorderable
+                so a sketch only holds one of them.
+            count (int): The number of occurrences.
+
+        """
+
+        counts = self.counts
+        if item in counts:
+            counts[item] += count
+        elif len(counts) < self.k:
+            counts[item] = count
+            self.errors[item] = 0
+        else:
+            smallest, removed = self._pop_min()
+            del counts[removed]
+            del self.errors[removed]
+            counts[item] = smallest + count
+            self.errors[item] = smallest
+        self._push(item)
+
+
+    def update_counts(self, item_count):
+        """Adds the occurrences of several items.
+
+        Function for adding a batch of counted items, the most frequent ones
+        first so that they are not evicted by the rare ones of the batch.
+
+        Arguments:
+            item_count (dict): The number of occurrences keyed by item.
+
+        """
+
+        for item in sorted(item_count, key=item_count.get, reverse=True):
+            self.update(item, item_count[item])
+
+
+    def merge(self, other):
+        """Adds the items of another sketch.
+
+        Function for combining the sketches of different streams: an item
+        missing from one of the sketches is counted with its smallest count,
+        the most it could have occurred there, and the k largest counts are
+        kept.
+
+        Arguments:
+            other (SpaceSavingSketch): The sketch to be merged.
+
+        Returns:
+            self (SpaceSavingSketch): The sketch, for chaining.
+
+        """
+
+        return self._combine(other.counts, other.errors, other.min_count())
+
+
+    def merge_counts(self, item_count):
+        """Adds the occurrences of several items as a merge.
+
+        Function for adding a large batch of counted items faster than
+        update_counts: the batch is merged like a sketch holding all its items
+        with no error, then the k largest counts are kept.
+
+        Arguments:
+            item_count (dict): The number of occurrences keyed by item.
+
+        Returns:
+            self (SpaceSavingSketch): The sketch, for chaining.
+
+        """
+
+        return self._combine(item_count, {}, 0)
+
+
+    def _combine(self, other_counts, other_errors, other_min):
+        """Adds the counts of another summary, keeping the k largest counts.
+
+        Arguments:
+            other_counts (dict): The counts of the other summary.
+            other_errors (dict): The possible overestimate of its counts.
+            other_min (int): The largest possible count of an item missing from it.
+
+        Returns:
+            self (SpaceSavingSketch): The sketch, for chaining.
+
+        """
+
+        own_min = self.min_count()
+        counts = {}
+        errors = {}
+        for item in list(self.counts) + [x for x in other_counts if x not in self.counts]:
+            counts[item] = self.counts.get(item, own_min) + other_counts.get(item, other_min)
+            errors[item] = (self.errors.get(item, own_min) +
+                            other_errors.get(item, other_min))
+
+        kept = heapq.nlargest(self.k, counts, key=counts.get)
+        self.counts = dict((x, counts[x]) for x in kept)
+        self.errors = dict((x, errors[x]) for x in kept)
+        self._heap = [(count, x) for x, count in self.counts.items()]
+        heapq.heapify(self._heap)
+        return self
+
+
+    def top(self, k=None):
+        """Getter for the most frequent items.
+
+        Arguments:
+            k (int): The number of items, all the monitored ones if not given.
+
+        Returns:
+            A list of the (item, count) in decreasing order of count.
+
+        """
+
+        counts = self.counts
+        return [(x, counts[x]) for x in heapq.nlargest(k or len(counts), counts,
+                                                         key=counts.get)]
+
+
+class CSRMatrix:
+    """A compressed sparse row matrix class used when SciPy is not installed.
+
+    """
+
+    __slots__ = ('data', 'indices', 'indptr', 'shape')
+
+    def __init__(self, data, indices, indptr, shape):
+        """Initializes a CSRMatrix object with the same arrays as a SciPy
+        csr_matrix.
+
+        Arguments:
+            data (numpy array): The nonzero values, row by row.
+            indices (numpy array): The column of each value.
+            indptr (numpy array): The start of each row in data, and its end.
+            shape (tuple): The number of rows and columns.
+
+        """
+
+        self.data = data
+        self.indices = indices
+        self.indptr = indptr
+        self.shape = shape
+
+
+    def __repr__(self):
+        """Returns the shape and number of values as a string.
+
+        """
+
+        return 'CSRMatrix(%d x %d, %d values)' % (self.shape + (len(self.data),))
+
+
+    def toarray(self):
+        """Converts the matrix to a dense array.
+
+        Returns:
+            matrix (numpy array): The dense matrix.
+
+        """
+
+        matrix = np.zeros(self.shape, dtype=self.data.dtype)
+        rows = np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+        matrix[rows, self.indices] = self.data
+        return matrix
+
+
+class NGramAnalyser:
+    """An analyser class for analysing tokenised input at the 'n-gram' level.
+
+    """
+
+    #Class variable for the regex used to identify words - allows letters of any
+    #script, numerals, ' and -
+    word_pattern = prpscr.WORD_PATTERN
+
+    def __init__(self, n=3, kind='character', hash_width=None, top_k=None):
+        """Initializes an NGramAnalyser object with empty occurrences.
+
+        Character n-grams are taken within each uppercased token padded with a
+        space on both sides, so that the start and end of words are captured;
+        tokens shorter than n - 2 characters have none.
+        Word n-grams are taken over consecutive uppercased words, the tokens
+        which are not words such as punctuations being skipped.
+
+        Arguments:
+            n (int): The number of characters or words of an n-gram.
+            kind (string): 'character' or 'word'.
+            hash_width (int): The number of buckets the n-grams are hashed to,
+                exact n-grams are counted if not given.
+            top_k (int): The number of most frequent n-grams kept, all of them
+                if not given. It cannot be given with hash_width, as the
+                buckets already bound the memory and are counted exactly.
+
+        """
+
+        if n < 1:
+            raise ValueError('The n-grams must have at least one element')
+        if kind not in ('character', 'word'):
+            raise ValueError('Unknown n-gram kind : ' + str(kind))
+        if hash_width is not None and hash_width < 1:
+            raise ValueError('The hashed n-grams need at least one bucket')
+        if hash_width is not None and top_k is not None:
+            raise ValueError('The n-grams are either hashed or pruned to the top k, not both')
+        self.n = n
+        self.kind = kind
+        self.hash_width = hash_width
+        self.top_k = top_k
+        self.reset()
+
+
+    def __str__(self):
+        """Prints the most frequent n-grams as a formatted string.
+
+        Returns:
+            The n-gram occurence dataframe as a formatted string.
+
+        """
+
+        prefix = 'N-gram occurences : \n' + "======================\n"
+        suffix = "\n======================"
+        return prefix + self.get_ngram_frequency().head(20).to_string(
+            index=False, justify='left') + suffix
+
+
+    def reset(self):
+        """Clears the occurrences recorded in the instance variables.
+
+        """
+
+        if self.hash_width is not None:
+            self.ngram_count = np.zeros(self.hash_width, dtype=np.int64)
+        elif self.top_k is not None:
+            self.ngram_count = SpaceSavingSketch(self.top_k)
+        else:
+            self.ngram_count = Counter()
+        #The last words of the previous batch, which start the next n-grams
+        self._tail = []
+
+
+    def analyse_ngrams(self, tokenised_list):
+        """Analyses the tokenised list for n-gram occurrence.
+
+        Function for analysing the given tokenised list and record the number
+        of times an n-gram has appeared in the tokens. It replaces the
+        occurrences recorded in the instance variable.
+
+        Arguments:
+            tokenised_list (list): The list of tokens.
+
+        """
+
+        self.reset()
+        self.update_ngrams(tokenised_list)
+
+
+    def _count_ngrams(self, tokenised_list):
+        """Counts the n-grams of a batch of tokens.
+
+        Arguments:
+            tokenised_list (iterable): The tokens.
+
+        Returns:
+            ngram_count (Counter): The occurrences keyed by n-gram.
+
+        """
+
+        n = self.n
+        ngram_count = Counter()
+        if self.kind == 'character':
+            #Counting the n-grams of each distinct token once, weighted by its count
+            for token, count in Counter(tokenised_list).items():
+                padded = ' ' + token.upper() + ' '
+                for i in range(len(padded) - n + 1):
+                    ngram_count[padded[i:i + n]] += count
+            return ngram_count
+
+        words = self._tail + [token.upper() for token in tokenised_list
+                              if self.word_pattern.match(token)]
+        ngram_count.update(' '.join(words[i:i + n]) for i in range(len(words) - n + 1))
+        self._tail = words[len(words) - n + 1:] if n > 1 else []
+        return ngram_count
+
+
+    def update_ngrams(self, tokenised_list):
+        """Adds the n-gram occurrences of more tokens.
+
+        Function for analysing a batch of tokens, e.g. a chunk from
+        Preprocessor.iter_tokens, and adding its n-gram occurrences to the ones
+        already recorded in the instance variable. Word n-grams spanning two
+        batches are counted.
+
+        Arguments:
+            tokenised_list (iterable): The tokens.
+
+        """
+
+        ngram_count = self._count_ngrams(tokenised_list)
+        if self.hash_width is not None:
+            if ngram_count:
+                buckets = np.fromiter((hash_ngram(x, self.hash_width) for x in ngram_count),
+                                      dtype=np.int64, count=len(ngram_count))
+                weights = np.fromiter(ngram_count.values(), dtype=np.int64,
+                                      count=len(ngram_count))
+                self.ngram_count += np.bincount(buckets, weights, self.hash_width
+                                                ).astype(np.int64)
+        elif self.top_k is not None:
+            self.ngram_count.update_counts(ngram_count)
+        else:
+            self.ngram_count.update(ngram_count)
+
+
+    def get_counts(self):
+        """Getter for the n-gram occurrences.
+
+        Returns:
+            counts (dict): The occurrences keyed by n-gram, or by bucket if the
+                n-grams are hashed, in decreasing order of occurrence.
+
+        """
+
+        if self.hash_width is not None:
+            buckets = np.flatnonzero(self.ngram_count)
+            buckets = buckets[np.argsort(-self.ngram_count[buckets], kind='stable')]
+            return dict(zip(buckets.tolist(), self.ngram_count[buckets].tolist()))
+        if self.top_k is not None:
+            return dict(self.ngram_count.top())
+        return dict(self.ngram_count.most_common())
+
+
+    def get_ngram_frequency(self):
+        """Getter for the n-gram occurrences in the tokenised list.
+
+        Returns:
+            ngram_occ (pandas DataFrame): The dataframe of n-gram occurrence, in
+                decreasing order of occurrence.
+
+        """
+
+        import pandas as pd
+
+        label = 'bucket' if self.hash_width is not None else 'ngram'
+        return pd.DataFrame(list(self.get_counts().items()), columns=[label, 'occurence'])
+
+
+def sparse_matrix(analysers):
+    """Builds the sparse works x n-grams occurrence matrix of several works.
+
+    Function for combining the n-gram occurrences of one analyser per work.
+    The columns are the buckets if the n-grams are hashed, otherwise the
+    n-grams found in any of the works in the order they were first found.
+
+    Arguments:
+        analysers (list): The NGramAnalyser of each work, with the same
+            configuration.
+
+    Returns:
+        matrix: The occurrences, a SciPy csr_matrix if SciPy is installed
+            and a CSRMatrix otherwise.
+        labels (list): The n-gram or bucket of each column.
+
+    """
+
+    widths = set(analyser.hash_width for analyser in analysers)
+    if len(widths) > 1:
+        raise ValueError('The n-grams of all the works must be hashed alike')
+    width = widths.pop() if widths else None
+
+    ids = {}
+    indices = []
+    data = []
+    indptr = [0]
+    for analyser in analysers:
+        counts = analyser.get_counts()
+        if width is None:
+            for ngram in counts:
+                if ngram not in ids:
+                    ids[ngram] = len(ids)
+            indices.extend(ids[x] for x in counts)
+        else:
+            indices.extend(counts)
+        data.extend(counts.values())
+        indptr.append(len(data))
+
+    labels = list(ids) if width is None else list(range(width))
+    arrays = (np.array(data, dtype=np.int64), np.array(indices, dtype=np.int64),
+              np.array(indptr, dtype=np.int64))
+    shape = (len(analysers), len(labels))
+    if has_scipy():
+        import scipy.sparse
+        return scipy.sparse.csr_matrix(arrays, shape=shape), labels
+    return CSRMatrix(*arrays, shape=shape), labels
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 """
 Created on         : 19/05/2018
-Last modified on   : 27/05/2018
+Last modified on   : 17/10/2026
 Author             : Satyabrat Borgohain
 Description :
     
@@ -9,11 +9,90 @@ Description :
     also returns the number of tokens of a particular file after its 
     tokenisation.
 
+    Large files can also be read in chunks and tokenised as a stream, so that
+    the analysis runs in constant memory. The stream can be segmented into
+    sentences and lines in the same pass by a Segmenter.
+
+    The tokens are classified as words, numerals or punctuations by a
+    precompiled regex. Tokenised (.tok) texts are split on whitespace and each
+    distinct token is classified once, while raw texts are split into words,
+    numerals and punctuations, in any script, in a single scan of the regex.
+
     Objects of this class can be created for standalone puposes.
 """
 
 
 
+import re
+import codecs
+import locale
+import mmap
+import unicodedata
+
+#Default number of bytes read at a time when streaming a file
+DEFAULT_CHUNK_SIZE = 1 << 20
+#Classes of the tokens, in the order of the groups of the patterns
+TOKEN_CLASSES = ('word', 'numeral', 'punctuation', 'other')
+#Regex of a word - letters of any script, numerals, ' and -, starting with a
+#letter after any numerals, apostrophes and hyphens
+WORD_REGEX = r"\d*['-]*[^\W\d_](?:[^\W_]|['-])*"
+#Pattern of a whole word, shared by all the analysers counting words
+WORD_PATTERN = re.compile('^' + WORD_REGEX + '$')
+#Pattern of the whitespace separated tokens of a tokenised text. Words are
+#the tokens accepted by WORD_PATTERN, and tokens of none of the classes fall
+#in 'other'
+TOK_PATTERN = re.compile(r"(?P<word>" + WORD_REGEX + r")(?!\S)"
+                         r"|(?P<numeral>\d+(?:[.,:/-]\d+)*)(?!\S)"
+                         r"|(?P<punctuation>(?:[^\w\s]|_)+)(?!\S)"
+                         r"|(?P<other>\S+)")
+#Pattern of the tokens of a raw text. Words may contain apostrophes and
+#hyphens between letters, e.g. don't and well-known, and every other symbol
+#is a punctuation of its own
+RAW_PATTERN = re.compile(r"(?P<word>\d*[^\W\d_](?:[^\W_]|['\u2019-](?=[^\W_]))*)"
+                         r"|(?P<numeral>\d+(?:[.,]\d+)*)"
+                         r"|(?P<punctuation>[^\w\s]|_)"
+                         r"|(?P<other>\S)")
+
+def read_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE, use_mmap=False, encoding=None):
+    """Reads a file as a stream of text chunks.
+
+    Function for reading a file a chunk of bytes at a time, optionally through
+    a memory map, and decoding it incrementally so that multi-byte characters
+    split between two chunks are decoded correctly.
+
+    Arguments:
+        path (string): The path of the file to be read.
+        chunk_size (int): The number of bytes read at a time.
+        use_mmap (bool): Whether the file is read through a memory map.
+        encoding (string): The encoding of the file, the locale's if not given.
+
+    Yields:
+        text (string): The decoded chunks of the file.
+
+    """
+
+    if encoding is None:
+        encoding = locale.getpreferredencoding(False)
+    decoder = codecs.getincrementaldecoder(encoding)()
+
+    with open(path, 'rb') as file:
+        buffer = None
+        #Empty files cannot be memory mapped
+        if use_mmap and file.seek(0, 2) > 0:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        file.seek(0)
+        read = buffer.read if buffer is not None else file.read
+        try:
+            data = read(chunk_size)
+            while data:
+                yield decoder.decode(data)
+                data = read(chunk_size)
+            yield decoder.decode(b'', final=True)
+        finally:
+            if buffer is not None:
+                buffer.close()
+
+
 class Preprocessor:
     """A preprocessor class used for tokenisation.
     
@@ -26,6 +105,10 @@ class Preprocessor:
      
         #Instance variable - a list to hold the tokens
         self.tokens = []
+        #Instance variable - the number of tokens streamed by iter_tokens
+        self.token_count = 0
+        #Instance variable - the tokens of each class, keyed by class
+        self.classified = dict((x, []) for x in TOKEN_CLASSES)
     
     
     def __str__(self):
@@ -41,19 +124,36 @@ class Preprocessor:
         return prefix + str(len(self.tokens)) + suffix
     
     
-    def tokenise(self, input_sequence):
+    def tokenise(self, input_sequence, raw=False):
         """Tokenise the inputted text
     
         Function for tokenising the given input_sequence into individual tokens 
-        for further analysis.
+        for further analysis, and classifying them in the same scan.
     
         Arguments:
             input_sequence (string): Text provided
+            raw (bool): Whether the text is raw rather than tokenised
     
         """
         
-        #Splitting the individual tokens
-        self.tokens = input_sequence.split(' ')
+        if raw:
+            #Composing accented letters so that they are not split from their accents
+            input_sequence = unicodedata.normalize('NFC', input_sequence)
+            #One (word, numeral, punctuation, other) tuple per token, all but one empty
+            found = RAW_PATTERN.findall(input_sequence)
+            self.tokens = list(map(''.join, found))
+            self.classified = dict((x, list(filter(None, tokens))) for x, tokens in
+                                   zip(TOKEN_CLASSES, zip(*found) if found else [()]*4))
+            return
+
+        #Whitespace separated tokens are split faster than a regex can scan them,
+        #and each distinct token is only classified once
+        self.tokens = input_sequence.split()
+        token_classes = dict((x, TOK_PATTERN.fullmatch(x).lastgroup)
+                             for x in set(self.tokens))
+        self.classified = dict((x, []) for x in TOKEN_CLASSES)
+        for token in self.tokens:
+            self.classified[token_classes[token]].append(token)
         
         
     def get_tokenised_list(self):
@@ -67,3 +167,137 @@ class Preprocessor:
         """
 
         return self.tokens
+
+
+    def get_classified_tokens(self, token_class='word'):
+        """Getter for fetching the tokens of a class
+
+        Function for getting the tokens of a class found by tokenise, e.g.
+        only the words, in the order they appear.
+
+        Arguments:
+            token_class (string): One of TOKEN_CLASSES.
+
+        Returns:
+            tokens (list): A list of tokens.
+
+        """
+
+        return self.classified[token_class]
+
+
+    def iter_tokens(self, text_chunks, raw=False, segmenter=None):
+        """Tokenise a stream of text chunks
+
+        Function for tokenising the text chunks one at a time. The text is
+        split on any whitespace, a token split between two chunks is carried
+        over to the next one and raw texts are further split as in tokenise.
+        The number of tokens seen is recorded in the instance variable
+        token_count.
+
+        Arguments:
+            text_chunks (iterable): The text chunks, e.g. from read_chunks.
+            raw (bool): Whether the text is raw rather than tokenised.
+            segmenter (Segmenter): A segmenter the tokens are given to a line
+                at a time, finished at the end of the stream.
+
+        Yields:
+            tokens (list): The tokens of each chunk.
+
+        """
+
+        if segmenter is not None:
+            yield from self._iter_lines(text_chunks, raw, segmenter)
+            return
+
+        self.token_count = 0
+        partial = ''
+        for text in text_chunks:
+            text = partial + text
+            tokens = text.split()
+            #The last token may continue in the next chunk
+            partial = tokens.pop() if tokens and not text[-1].isspace() else ''
+            if raw and tokens:
+                self.tokenise(' '.join(tokens), raw=True)
+                tokens = self.tokens
+            self.token_count += len(tokens)
+            if tokens:
+                yield tokens
+        if partial != '':
+            tokens = [partial]
+            if raw:
+                self.tokenise(partial, raw=True)
+                tokens = self.tokens
+            self.token_count += len(tokens)
+            if tokens:
+                yield tokens
+
+
+    def _iter_lines(self, text_chunks, raw, segmenter):
+        """Tokenise a stream of text chunks a line at a time
+
+        Function for splitting the text chunks into lines, the last line of a
+        chunk being carried over to the next one, and giving the tokens of
+        the chunk and the offsets of its line ends to the segmenter before
+        yielding them.
+        A line longer than a chunk is given to the segmenter in pieces, so
+        that the memory stays bounded.
+
+        Arguments:
+            text_chunks (iterable): The text chunks, e.g. from read_chunks.
+            raw (bool): Whether the text is raw rather than tokenised.
+            segmenter (Segmenter): The segmenter of the stream.
+
+        Yields:
+            tokens (list): The tokens of each chunk.
+
+        """
+
+        self.token_count = 0
+        partial = ''
+        for text in text_chunks:
+            lines = (partial + text).split('\n')
+            #The last line may continue in the next chunk
+            partial = lines.pop()
+            tokens = self._tokenise_lines(lines, raw, segmenter)
+            if len(partial) > len(text):
+                #Keeping only the last token of a long line, which may continue
+                head = partial.split()
+                partial = head.pop() if head and not partial[-1].isspace() else ''
+                tokens += self._tokenise_lines([' '.join(head)], raw, segmenter, False)
+            if tokens:
+                yield tokens
+        tokens = self._tokenise_lines([partial], raw, segmenter) if partial else []
+        segmenter.finish()
+        if tokens:
+            yield tokens
+
+
+    def _tokenise_lines(self, lines, raw, segmenter, line_end=True):
+        """Tokenise lines and give their tokens and line ends to a segmenter
+
+        Arguments:
+            lines (list): The lines of text.
+            raw (bool): Whether the text is raw rather than tokenised.
+            segmenter (Segmenter): The segmenter of the stream.
+            line_end (bool): Whether the lines end, False for the beginning of
+                a line continuing in the next chunk.
+
+        Returns:
+            tokens (list): The tokens of all the lines.
+
+        """
+
+        tokens = []
+        line_ends = []
+        for line in lines:
+            if raw:
+                self.tokenise(line, raw=True)
+                tokens.extend(self.tokens)
+            else:
+                tokens.extend(line.split())
+            if line_end:
+                line_ends.append(len(tokens))
+        segmenter.update(tokens, line_ends)
+        self.token_count += len(tokens)
+        return tokens
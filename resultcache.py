@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""
+Created on         : 17/10/2026
+Last modified on   : 17/10/2026
+Author             : Satyabrat Borgohain
+Description :
+
+    This class caches the occurrences of analysed works on disk in an SQLite
+    database, so that re-running the analysis only recomputes the works which
+    are new or modified. Entries are keyed by the content of the file and the
+    configuration of the analysis, and the least recently used entries are
+    evicted when the cache grows beyond its size limit.
+
+    Objects of this class can be created for standalone puposes.
+"""
+
+
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import extractor as extr
+
+#Default location of the cache database
+DEFAULT_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'stylometric-analyser',
+                            'results.sqlite')
+#Default size limit of the cache in bytes
+DEFAULT_MAX_BYTES = 256 << 20
+
+def hash_file(path, chunk_size=1 << 20):
+    """Hashes the content of a file.
+
+    Arguments:
+        path (string): The path of the file.
+        chunk_size (int): The number of bytes read at a time.
+
+    Returns:
+        digest (string): The SHA-256 hex digest of the content.
+
+    """
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        data = file.read(chunk_size)
+        while data:
+            digest.update(data)
+            data = file.read(chunk_size)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """A cache class storing the occurrences of works in an SQLite database.
+
+    """
+
+    def __init__(self, path=DEFAULT_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        """Initializes a ResultCache object, creating the database if needed.
+
+        Arguments:
+            path (string): The path of the database.
+            max_bytes (int): The size limit of the stored occurrences in bytes.
+
+        """
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.connection = sqlite3.connect(path)
+        self.connection.execute('CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, '
+                                'counts TEXT NOT NULL, size INTEGER NOT NULL, '
+                                'last_used REAL NOT NULL)')
+        self.connection.commit()
+        #Instance variables for the number of lookups which hit and missed
+        self.hits = 0
+        self.misses = 0
+
+
+    def __str__(self):
+        """Prints the usage of the cache as a formatted string.
+
+        Returns:
+            The entries, size and hit rate as a formatted string.
+
+        """
+
+        entries, size = self.connection.execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results').fetchone()
+        prefix = 'Result cache : \n' + "======================\n"
+        suffix = "\n======================"
+        return prefix + '%d entries, %d bytes, %d hits, %d misses' % (
+            entries, size, self.hits, self.misses) + suffix
+
+
+    def make_key(self, work, stopwords, raw=False, sketch=None, ttr_window=None,
+                 segment=False):
+        """Builds the key of a work for the current analysis configuration.
+
+        Function for combining the hash of the content of the work with the
+        version of the feature extractor, the stopwords analysed, the
+        tokenisation, the vocabulary sketch, the window of the moving average
+        type/token ratio and the segmentation into sentences and lines, so
+        that changing any of them invalidates the entry.
+
+        Arguments:
+            work (string): The path of the work.
+            stopwords (StopwordLexicon): The stopwords analysed.
+            raw (bool): Whether the work is tokenised as raw text.
+            sketch (dict): The parameters of the WordSketch counting the
+                vocabulary, None if it is counted exactly.
+            ttr_window (int): The window of the moving average type/token
+                ratio, None if it is not computed.
+            segment (bool): Whether the sentences and lines are segmented.
+
+        Returns:
+            key (string): The key of the work.
+
+        """
+
+        config = [extr.FeatureExtractor.version, list(stopwords.words), raw]
+        if sketch is not None:
+            config.append(sorted(sketch.items()))
+        if ttr_window is not None:
+            config.append(['ttr_window', ttr_window])
+        if segment:
+            config.append(['segment', True])
+        config = json.dumps(config)
+        digest = hashlib.sha256(hash_file(work).encode('ascii'))
+        digest.update(config.encode('utf-8'))
+        return digest.hexdigest()
+
+
+    def get(self, key):
+        """Getter for the cached occurrences of a work.
+
+        Arguments:
+            key (string): The key of the work.
+
+        Returns:
+            counts (dict): The lists of occurrences, None if not cached.
+
+        """
+
+        row = self.connection.execute('SELECT counts FROM results WHERE key = ?',
+                                      (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        #Committed with the next put or on closing
+        self.connection.execute('UPDATE results SET last_used = ? WHERE key = ?',
+                                (time.time(), key))
+        return json.loads(row[0])
+
+
+    def put(self, key, counts):
+        """Stores the occurrences of a work and evicts old entries if needed.
+
+        Arguments:
+            key (string): The key of the work.
+            counts (dict): The lists of occurrences.
+
+        """
+
+        data = json.dumps(counts, separators=(',', ':'))
+        self.connection.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)',
+                                (key, data, len(data), time.time()))
+        self.evict()
+        self.connection.commit()
+
+
+    def evict(self):
+        """Removes the least recently used entries beyond the size limit.
+
+        """
+
+        total = self.connection.execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self.connection.execute('SELECT key, size FROM results '
+                                       'ORDER BY last_used').fetchall()
+        stale = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        self.connection.executemany('DELETE FROM results WHERE key = ?', stale)
+
+
+    def clear(self):
+        """Removes all the entries.
+
+        """
+
+        self.connection.execute('DELETE FROM results')
+        self.connection.commit()
+
+
+    def close(self):
+        """Evicts the entries beyond the size limit, commits the pending updates
+        and closes the database.
+
+        """
+
+        self.evict()
+        self.connection.commit()
+        self.connection.close()
@@ -0,0 +1,322 @@
+# -*- coding: utf-8 -*-
+"""
+Created on         : 17/10/2026
+Last modified on   : 17/10/2026
+Author             : Satyabrat Borgohain
+Description :
+
+    This module measures the vocabulary richness of a work: its type/token
+    ratio, hapax and dis legomena, Yule's K, Honore's R, Simpson's D and
+    similar measures. All of them only depend on the frequency spectrum of the
+    work, i.e. the number of words occurring once, twice and so on, which is
+    computed once from the word occurrences with a bincount. Every measure is
+    then a vectorised sum over the spectrum, far shorter than the vocabulary,
+    so adding measures to METRICS costs next to nothing.
+
+    The moving average type/token ratio, which unlike the type/token ratio
+    does not fall with the length of the work, is computed over sliding
+    windows of words, in a single pass and chunk by chunk if needed.
+
+    Objects of this class can be created for standalone puposes.
+"""
+
+
+
+import numpy as np
+
+#Number of words in a window of the moving average type/token ratio
+DEFAULT_WINDOW = 500
+
+class Spectrum:
+    """A spectrum class holding the frequencies occurring in a work and the
+    number of words with each of them.
+
+    """
+
+    __slots__ = ('frequencies', 'types_per_frequency', 'tokens', 'types')
+
+    def __init__(self, spectrum):
+        """Initializes a Spectrum object from a dense spectrum.
+
+        Arguments:
+            spectrum (numpy array): The number of words occurring m times at
+                index m, as returned by frequency_spectrum.
+
+        """
+
+        spectrum = np.asarray(spectrum, dtype=np.int64)
+        #Instance variables for the frequencies m with V(m) > 0 and their V(m)
+        self.frequencies = np.flatnonzero(spectrum)
+        self.types_per_frequency = spectrum[self.frequencies]
+        self.frequencies = self.frequencies.astype(np.float64)
+        #Instance variables for the number of words N and of distinct words V
+        self.tokens = float(self.frequencies @ self.types_per_frequency)
+        self.types = float(self.types_per_frequency.sum())
+
+
+    def __str__(self):
+        """Prints the number of words occurring with each frequency.
+
+        Returns:
+            The spectrum as a formatted string.
+
+        """
+
+        prefix = 'Frequency spectrum : \n' + "======================\n"
+        suffix = "\n======================"
+        return prefix + '\n'.join('%d %d' % x for x in zip(
+            self.frequencies, self.types_per_frequency)) + suffix
+
+
+    def count(self, frequency):
+        """Getter for the number of words occurring a given number of times.
+
+        Arguments:
+            frequency (int): The frequency m.
+
+        Returns:
+            The number of words V(m).
+
+        """
+
+        i = np.searchsorted(self.frequencies, frequency)
+        if i < len(self.frequencies) and self.frequencies[i] == frequency:
+            return float(self.types_per_frequency[i])
+        return 0.0
+
+
+    def moment(self, order):
+        """Sums the frequencies raised to a power over all the words.
+
+        Arguments:
+            order (int): The power.
+
+        Returns:
+            The sum of V(m) * m ** order over the spectrum.
+
+        """
+
+        return float(self.frequencies ** order @ self.types_per_frequency)
+
+
+#Measures of the richness computed from a Spectrum s, with N words, V distinct
+#words and V(m) words occurring m times
+METRICS = {
+    'tokens': lambda s: s.tokens,
+    'types': lambda s: s.types,
+    'type_token_ratio': lambda s: s.types / s.tokens,
+    'hapax_legomena': lambda s: s.count(1),
+    'dis_legomena': lambda s: s.count(2),
+    'hapax_ratio': lambda s: s.count(1) / s.types,
+    #Herdan's C = log V / log N
+    'herdans_c': lambda s: np.log(s.types) / np.log(s.tokens),
+    #Brunet's W = N ** (V ** -0.165)
+    'brunets_w': lambda s: s.tokens ** (s.types ** -0.165),
+    #Sichel's S = V(2) / V
+    'sichels_s': lambda s: s.count(2) / s.types,
+    #Honore's R = 100 log N / (1 - V(1) / V), infinite if every word is a hapax
+    'honores_r': lambda s: 100 * np.log(s.tokens) / (1 - np.float64(s.count(1)) / s.types),
+    #Yule's K = 10^4 (sum m^2 V(m) - N) / N^2
+    'yules_k': lambda s: 1e4 * (s.moment(2) - s.tokens) / s.tokens ** 2,
+    #Simpson's D = sum V(m) m (m - 1) / (N (N - 1))
+    'simpsons_d': lambda s: (s.moment(2) - s.tokens) / np.float64(s.tokens * (s.tokens - 1)),
+}
+
+def frequency_spectrum(occurrences):
+    """Computes the frequency spectrum of the word occurrences.
+
+    Arguments:
+        occurrences (iterable): The occurrence of each distinct word, e.g.
+            FeatureExtractor.word_count.values() or the 'occurence' column of
+            WordAnalyser.word_occ.
+
+    Returns:
+        spectrum (numpy array): The number of words occurring m times at index m.
+
+    """
+
+    if not isinstance(occurrences, np.ndarray):
+        occurrences = np.fromiter(occurrences, dtype=np.int64)
+    return np.bincount(occurrences.astype(np.int64, copy=False))
+
+
+def spectrum_to_pairs(spectrum):
+    """Compacts a spectrum to the pairs stored in the counts of a work.
+
+    Arguments:
+        spectrum (numpy array): The number of words occurring m times at index m.
+
+    Returns:
+        pairs (list): The [m, V(m)] pairs of the frequencies m with V(m) > 0,
+            by increasing m, as plain integers.
+
+    """
+
+    frequencies = np.flatnonzero(spectrum)
+    return np.column_stack((frequencies, spectrum[frequencies])).tolist()
+
+
+def spectrum_from_pairs(pairs):
+    """Expands the sparse spectrum stored in the counts of a work.
+
+    Arguments:
+        pairs (list): The [m, V(m)] pairs returned under 'spectrum' by
+            FeatureExtractor.get_counts.
+
+    Returns:
+        spectrum (numpy array): The number of words occurring m times at index m.
+
+    """
+
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    spectrum = np.zeros(pairs[:, 0].max(initial=0) + 1, dtype=np.int64)
+    spectrum[pairs[:, 0]] = pairs[:, 1]
+    return spectrum
+
+
+def richness_metrics(spectrum, metrics=None):
+    """Computes the measures of the vocabulary richness of a work.
+
+    Arguments:
+        spectrum (numpy array or Spectrum): The frequency spectrum of the work.
+        metrics (list): The names of the measures computed, all the ones of
+            METRICS if not given.
+
+    Returns:
+        richness (dict): The value of each measure, NaN if the work is too
+            short for it.
+
+    """
+
+    if not isinstance(spectrum, Spectrum):
+        spectrum = Spectrum(spectrum)
+    richness = {}
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for name in (METRICS if metrics is None else metrics):
+            try:
+                richness[name] = float(METRICS[name](spectrum))
+            except ZeroDivisionError:
+                richness[name] = float('nan')
+    return richness
+
+
+def _window_types(words, window):
+    """Sums the number of distinct words over all the windows of a sequence.
+
+    Function for counting, for every word, the windows in which it is the
+    first occurrence of its type: those starting after its previous
+    occurrence and before or at it. The windows are never built.
+
+    Arguments:
+        words (list): The words.
+        window (int): The number of words in a window.
+
+    Returns:
+        total (int): The number of distinct words summed over the windows.
+        windows (int): The number of windows.
+
+    """
+
+    n = len(words)
+    if n < window:
+        return 0, 0
+    ids = {}
+    sequence = np.fromiter((ids.setdefault(x, len(ids)) for x in words), dtype=np.int64,
+                           count=n)
+    #Previous occurrence of the type of each word, -1 for the first one
+    order = np.argsort(sequence, kind='stable')
+    previous = np.full(n, -1, dtype=np.int64)
+    same = sequence[order[1:]] == sequence[order[:-1]]
+    previous[order[1:][same]] = order[:-1][same]
+
+    positions = np.arange(n)
+    first = np.maximum(previous + 1, positions - window + 1)
+    last = np.minimum(positions, n - window)
+    return int(np.maximum(last - first + 1, 0).sum()), n - window + 1
+
+
+def moving_average_ttr(words, window=DEFAULT_WINDOW):
+    """Computes the moving average type/token ratio of a sequence of words.
+
+    Arguments:
+        words (list): The words, in the order of the text.
+        window (int): The number of words in a window.
+
+    Returns:
+        The type/token ratio averaged over all the windows of the words, or
+        the type/token ratio of all the words if they do not fill a window.
+
+    """
+
+    ttr = MovingAverageTTR(window)
+    ttr.update(words)
+    return ttr.value()
+
+
+class MovingAverageTTR:
+    """A streaming class for the moving average type/token ratio of words read
+    chunk by chunk.
+
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        """Initializes a MovingAverageTTR object.
+
+        Arguments:
+            window (int): The number of words in a window.
+
+        """
+
+        if window < 1:
+            raise ValueError('The window must hold at least one word')
+        self.window = window
+        #Instance variables for the last words, starting the windows which end
+        #in the next chunk, and the distinct words summed over the windows
+        self.tail = []
+        self.total = 0
+        self.windows = 0
+
+
+    def __str__(self):
+        """Prints the moving average type/token ratio as a formatted string.
+
+        Returns:
+            The ratio and the window as a formatted string.
+
+        """
+
+        prefix = 'Moving average type/token ratio : \n' + "======================\n"
+        suffix = "\n======================"
+        return prefix + '%.4f (window %d)' % (self.value(), self.window) + suffix
+
+
+    def update(self, words):
+        """Adds the windows ending in a chunk of words.
+
+        Arguments:
+            words (list): The next words.
+
+        """
+
+        #Every window of the tail and the chunk ends in the chunk, as the tail
+        #is shorter than a window
+        sequence = self.tail + list(words)
+        total, windows = _window_types(sequence, self.window)
+        self.total += total
+        self.windows += windows
+        self.tail = sequence[max(0, len(sequence) - self.window + 1):] if self.window > 1 else []
+
+
+    def value(self):
+        """Getter for the moving average type/token ratio.
+
+        Returns:
+            The average ratio, NaN if no words were read.
+
+        """
+
+        if self.windows:
+            return self.total / (self.windows * self.window)
+        if not self.tail:
+            return float('nan')
+        return len(set(self.tail)) / len(self.tail)
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+Created on         : 17/10/2026
+Last modified on   : 17/10/2026
+Author             : Satyabrat Borgohain
+Description :
+
+    This class analyses a work over sliding windows of tokens, e.g. to find
+    where the style changes in a collaboration. The character, stopword and
+    word length occurrences are kept up to date as the window slides, adding
+    the token entering it and subtracting the one leaving it, so the analysis
+    takes time linear in the length of the work whatever the window size.
+
+    The windows are stored as the rows of a FeatureStore, so they can be
+    exported, attributed and visualised like whole works.
+
+    Objects of this class can be created for standalone puposes.
+"""
+
+
+
+from collections import Counter, deque
+import character as char
+import extractor as extr
+import featurestore as fstore
+import lexicon
+
+class RollingAnalyser:
+    """A rolling analyser class for analysing tokens over sliding windows.
+
+    """
+
+    def __init__(self, window, step=None, stopwords=None):
+        """Initializes a RollingAnalyser object.
+
+        Arguments:
+            window (int): The number of tokens in a window.
+            step (int): The number of tokens between the starts of two windows,
+                a tenth of the window if not given.
+            stopwords (StopwordLexicon): The stopwords to be analysed, the
+                default lexicon if not given.
+
+        """
+
+        if window < 1:
+            raise ValueError('The window must hold at least one token')
+        self.window = window
+        self.step = step if step is not None else max(1, window // 10)
+        if self.step < 1:
+            raise ValueError('The step must be at least one token')
+        self.stopwords = lexicon.get_stopwords() if stopwords is None else stopwords
+        #Characters analysed, those beyond the ASCII ones being added as they are
+        #found and stored as extra characters like FeatureExtractor does
+        self.alphabet = char.Alphabet(char.CharacterAnalyser.characters)
+        self._stop_ids = dict((x, i) for i, x in enumerate(self.stopwords.words))
+        #Contribution of each distinct token, computed once
+        self._types = {}
+
+
+    def __str__(self):
+        """Prints the window and step as a formatted string.
+
+        Returns:
+            The window and step as a formatted string.
+
+        """
+
+        prefix = 'Rolling analysis : \n' + "======================\n"
+        suffix = "\n======================"
+        return prefix + 'window %d, step %d' % (self.window, self.step) + suffix
+
+
+    def _describe(self, token):
+        """Computes the contribution of a token to the occurrences.
+
+        Arguments:
+            token (string): The token.
+
+        Returns:
+            A tuple of the (character id, occurrence) pairs of the token, its
+            stopword id and its word length, -1 if it is not a stopword or word.
+
+        """
+
+        upper_token = token.upper()
+        characters = tuple((i, n) for i, n in ((self.alphabet.add(x), n) for x, n in
+                                               Counter(upper_token).items()) if i >= 0)
+        if extr.FeatureExtractor.word_pattern.match(token):
+            return characters, self._stop_ids.get(upper_token, -1), len(upper_token)
+        return characters, -1, -1
+
+
+    def analyse(self, tokens, work='work'):
+        """Analyses the tokens over sliding windows.
+
+        Function for sliding the window over the tokens and storing the
+        occurrences of each window. A window is stored once it is full and then
+        every step tokens; if there are fewer tokens than a window, they are
+        stored as a single window.
+
+        Arguments:
+            tokens (iterable): The tokens, empty tokens being skipped.
+            work (string): The name of the work, the windows being named
+                <work>@<index of their first token>.
+
+        Returns:
+            store (FeatureStore): The occurrences, one row per window.
+
+        """
+
+        store = fstore.FeatureStore(self.stopwords)
+        ascii_characters = len(char.CharacterAnalyser.characters)
+        char_counts = [0]*len(self.alphabet)
+        stop_counts = [0]*len(self._stop_ids)
+        wl_counts = [0]*extr.FeatureExtractor.word_lengths
+        types = self._types
+        window = deque()
+        position = 0
+
+        for token in tokens:
+            if token == '':
+                continue
+            info = types.get(token)
+            if info is None:
+                info = types[token] = self._describe(token)
+                if len(self.alphabet) > len(char_counts):
+                    char_counts.extend([0]*(len(self.alphabet) - len(char_counts)))
+
+            #Adding the entering token
+            characters, stop_id, length = info
+            for i, n in characters:
+                char_counts[i] += n
+            if stop_id >= 0:
+                stop_counts[stop_id] += 1
+            if length >= 0:
+                if length >= len(wl_counts):
+                    wl_counts.extend([0]*(length + 1 - len(wl_counts)))
+                wl_counts[length] += 1
+            window.append(info)
+
+            #Subtracting the leaving token
+            if len(window) > self.window:
+                characters, stop_id, length = window.popleft()
+                for i, n in characters:
+                    char_counts[i] -= n
+                if stop_id >= 0:
+                    stop_counts[stop_id] -= 1
+                if length >= 0:
+                    wl_counts[length] -= 1
+
+            position += 1
+            start = position - self.window
+            if start >= 0 and start % self.step == 0:
+                store.add_work('%s@%d' % (work, start), self._counts(
+                    char_counts, stop_counts, wl_counts, ascii_characters))
+
+        if 0 < position < self.window:
+            store.add_work('%s@0' % work, self._counts(char_counts, stop_counts, wl_counts,
+                                                       ascii_characters))
+
+        return store
+
+
+    def _counts(self, char_counts, stop_counts, wl_counts, ascii_characters):
+        """Builds the occurrences of a window in the format of FeatureExtractor.get_counts.
+
+        Arguments:
+            char_counts (list): The occurrences of the characters of the alphabet.
+            stop_counts (list): The occurrences of the stopwords.
+            wl_counts (list): The occurrences of the word lengths.
+            ascii_characters (int): The number of characters every analysis
+                starts with, the following ones being extra characters.
+
+        Returns:
+            counts (dict): The lists of occurrences keyed by statistic.
+
+        """
+
+        extra_count = dict((x, n) for x, n in zip(self.alphabet.characters[ascii_characters:],
+                                                  char_counts[ascii_characters:]) if n)
+        return {'char_freq': char_counts[:ascii_characters], 'stop_freq': stop_counts,
+                'word_len_freq': wl_counts, 'char_extra': extra_count}
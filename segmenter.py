@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""
+Created on         : 17/10/2026
+Last modified on   : 17/10/2026
+Author             : Satyabrat Borgohain
+Description :
+
+    This class segments a work into sentences and lines while it is streamed.
+    The tokenised (.tok) texts hold one utterance per line with spaced
+    punctuations, so the lines are kept by Preprocessor.iter_tokens when a
+    Segmenter is given, and a sentence ends at a token made of full stops,
+    question or exclamation marks, e.g. '.', '?!' or '...'.
+
+    The boundaries are recorded as compact arrays of token offsets, and the
+    distributions of the number of words per sentence and per line, and of
+    punctuations per sentence, are counted in the same pass. Only the
+    standard library is used, so the counts-only runs stay light.
+
+    Objects of this class can be created for standalone puposes.
+"""
+
+
+
+import re
+from array import array
+from collections import Counter
+from itertools import compress, repeat
+import preprocessor as prpscr
+
+#Pattern of the tokens ending a sentence
+SENTENCE_END = re.compile(r'[.?!…]+')
+#Minimum number of buckets of the sentence length, line length and punctuations
+#per sentence distributions
+SENTENCE_LENGTHS = 100
+LINE_LENGTHS = 40
+SENTENCE_PUNCTUATIONS = 20
+#Kinds of the tokens
+OTHER, WORD, PUNCTUATION, SENTENCE_END_MARK = range(4)
+
+class Segmenter:
+    """A segmenter class recording the sentence and line boundaries of tokens
+    streamed a chunk at a time.
+
+    """
+
+    def __init__(self):
+        """Initializes a Segmenter object with no sentences or lines.
+
+        """
+
+        #Instance variables for the token offsets at which each line and
+        #sentence ends, one past their last token
+        self.line_ends = array('q')
+        self.sentence_ends = array('q')
+        #Instance variables for the occurrences of the words per sentence and
+        #line, and of the punctuations per sentence
+        self.sentence_lengths = Counter()
+        self.line_lengths = Counter()
+        self.sentence_punctuations = Counter()
+        self.token_count = 0
+        #Kind of each distinct token, classified once
+        self._kinds = {}
+        #Words and punctuations of the open sentence and words of the open line
+        self._sentence_words = 0
+        self._sentence_punctuations = 0
+        self._line_words = 0
+        self._line_open = False
+        #Punctuations of the last closed sentence, extended by repeated ends
+        self._last_punctuations = None
+
+
+    def __str__(self):
+        """Prints the number of sentences and lines as a formatted string.
+
+        Returns:
+            The number of sentences and lines as a formatted string.
+
+        """
+
+        prefix = 'Sentences and lines : \n' + "======================\n"
+        suffix = "\n======================"
+        return prefix + '%d sentences, %d lines' % (len(self.sentence_ends),
+                                                    len(self.line_ends)) + suffix
+
+
+    def _classify(self, token):
+        """Finds the kind of a token.
+
+        Arguments:
+            token (string): The token.
+
+        Returns:
+            kind (int): WORD, PUNCTUATION, SENTENCE_END_MARK or OTHER.
+
+        """
+
+        if token.isalpha():
+            kind = WORD
+        elif SENTENCE_END.fullmatch(token):
+            kind = SENTENCE_END_MARK
+        else:
+            kind = {'word': WORD, 'punctuation': PUNCTUATION}.get(
+                prpscr.TOK_PATTERN.fullmatch(token).lastgroup, OTHER)
+        self._kinds[token] = kind
+        return kind
+
+
+    def update(self, tokens, line_ends=None):
+        """Adds tokens, e.g. the lines of a chunk, ending lines at the given offsets.
+
+        Function for writing the kinds of the tokens as bytes and counting the
+        words and punctuations between the sentence ends and line breaks with
+        bytes.count, so that only the boundaries, not the tokens, are visited
+        one at a time.
+
+        Arguments:
+            tokens (list): The tokens.
+            line_ends (list): The offsets in the tokens, in order, at which
+                lines end, the tokens after the last one beginning a line which
+                continues in the next update. All the tokens end a line if not
+                given.
+
+        """
+
+        #Classifying each new distinct token once
+        for token in set(tokens).difference(self._kinds):
+            self._classify(token)
+        kinds = bytes(map(self._kinds.__getitem__, tokens))
+        n = len(kinds)
+
+        #Counting the words and punctuations of the sentences between their ends
+        start = 0
+        while True:
+            end = kinds.find(SENTENCE_END_MARK, start)
+            if end < 0:
+                break
+            self._sentence_words += kinds.count(WORD, start, end)
+            self._sentence_punctuations += kinds.count(PUNCTUATION, start, end)
+            self._end_sentence(self.token_count + end + 1)
+            start = end + 1
+        self._sentence_words += kinds.count(WORD, start)
+        self._sentence_punctuations += kinds.count(PUNCTUATION, start)
+
+        #Counting the words of the lines, blank lines being skipped, the first
+        #line continuing the one left open by the last update
+        ends = [n] if line_ends is None else list(line_ends)
+        start = 0
+        if ends:
+            starts = [0] + ends[:-1]
+            lengths = list(map(kinds.count, repeat(WORD), starts, ends))
+            lengths[0] += self._line_words
+            filled = list(map(int.__lt__, starts, ends))
+            filled[0] = filled[0] or self._line_open
+            self.line_ends.extend(map(self.token_count.__add__, compress(ends, filled)))
+            self.line_lengths.update(compress(lengths, filled))
+            self._line_words = 0
+            self._line_open = False
+            start = ends[-1]
+        if n > start:
+            self._line_words += kinds.count(WORD, start)
+            self._line_open = True
+        self.token_count += n
+
+
+    def _end_sentence(self, offset):
+        """Records the end of a sentence at a sentence end mark.
+
+        Arguments:
+            offset (int): The token offset one past the mark.
+
+        """
+
+        if self._sentence_words:
+            self._close_sentence(offset, self._sentence_punctuations + 1)
+        elif self._last_punctuations is not None and not self._sentence_punctuations:
+            #Repeated ends, e.g. '? !' or the split '. . .' of raw texts,
+            #extend the last sentence
+            self.sentence_ends[-1] = offset
+            self.sentence_punctuations[self._last_punctuations] -= 1
+            if not self.sentence_punctuations[self._last_punctuations]:
+                del self.sentence_punctuations[self._last_punctuations]
+            self._last_punctuations += 1
+            self.sentence_punctuations[self._last_punctuations] += 1
+        else:
+            self._sentence_punctuations += 1
+
+
+    def _close_sentence(self, offset, punctuations):
+        """Records a sentence and starts the next one.
+
+        Arguments:
+            offset (int): The token offset one past its last token.
+            punctuations (int): The number of punctuations of the sentence.
+
+        """
+
+        self.sentence_ends.append(offset)
+        self.sentence_lengths[self._sentence_words] += 1
+        self.sentence_punctuations[punctuations] += 1
+        self._last_punctuations = punctuations
+        self._sentence_words = self._sentence_punctuations = 0
+
+
+    def finish(self):
+        """Closes the last line and sentence, if they were not ended.
+
+        """
+
+        if self._line_open:
+            self.update([], [0])
+        if self._sentence_words:
+            self._close_sentence(self.token_count, self._sentence_punctuations)
+
+
+    def get_sentences(self):
+        """Getter for the token offsets of the sentences.
+
+        Returns:
+            A list of the (start, end) offsets of each sentence in the tokens.
+
+        """
+
+        return list(zip([0] + self.sentence_ends[:-1].tolist(), self.sentence_ends))
+
+
+    def get_lines(self):
+        """Getter for the token offsets of the lines.
+
+        Returns:
+            A list of the (start, end) offsets of each line in the tokens.
+
+        """
+
+        return list(zip([0] + self.line_ends[:-1].tolist(), self.line_ends))
+
+
+    def get_counts(self):
+        """Getter for the compact distributions of the sentences and lines.
+
+        Returns:
+            counts (dict): The occurrences of each number of words per sentence
+                under 'sent_len_freq' and per line under 'line_len_freq', and
+                of each number of punctuations per sentence under
+                'sent_punc_freq', as lists with at least the default number
+                of buckets.
+
+        """
+
+        return {'sent_len_freq': _histogram(self.sentence_lengths, SENTENCE_LENGTHS),
+                'line_len_freq': _histogram(self.line_lengths, LINE_LENGTHS),
+                'sent_punc_freq': _histogram(self.sentence_punctuations,
+                                             SENTENCE_PUNCTUATIONS)}
+
+
+def _histogram(occurrences, buckets):
+    """Converts the occurrences of lengths to a list indexed by length.
+
+    Arguments:
+        occurrences (Counter): The occurrence of each length.
+        buckets (int): The minimum length of the list.
+
+    Returns:
+        histogram (list): The occurrence of each length.
+
+    """
+
+    histogram = [0]*max(buckets, max(occurrences, default=0) + 1)
+    for length, count in occurrences.items():
+        histogram[length] += count
+    return histogram
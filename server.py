@@ -0,0 +1,529 @@
+# -*- coding: utf-8 -*-
+"""
+Created on         : 17/10/2026
+Last modified on   : 17/10/2026
+Author             : Satyabrat Borgohain
+Description :
+
+    This script runs the stylometric analyser as a long running local service,
+    so that the interpreter start, the imports and the stopword lexicon are only
+    paid for once instead of once per job. The stopwords and the author profiles
+    of the reference works are kept in memory, requests are handled by an
+    asyncio event loop and the tokenising and extraction run on a pool of
+    processes behind it.
+
+    Usage : python server.py [--port 8765 | --unix /tmp/stylometry.sock]
+                             [--workers 4] [--reference sample_dataset]
+
+    The requests and responses are JSON over HTTP/1.1, keeping the connections
+    alive between requests:
+
+        GET  /health      the status, number of requests and reference authors
+        GET  /vocabulary  the labels of the statistics returned, or how to read
+                          the ones which are not lists of occurrences
+        POST /analyse     {"text": "...", "raw": false} or {"path": "..."}, returns
+                          the counts of the work, its number of tokens and, if
+                          there are reference works, its nearest author and the
+                          distances to all of them
+
+    Objects of this class can be created for standalone puposes.
+"""
+
+
+
+import os
+import sys
+import json
+import time
+import signal
+import asyncio
+import argparse
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
+import main
+import preprocessor as prpscr
+import extractor as extr
+import character as char
+import lexicon
+
+#Address the server listens on by default, only reachable from this machine
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+#Largest request body accepted, in bytes
+MAX_BODY = 64 << 20
+#Reason phrases of the HTTP statuses returned
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+#Stopwords of a worker process, sent once when the worker starts
+_stopwords = None
+
+def _init_worker(stopwords):
+    """Keeps the stopwords in a worker process for all its requests.
+
+    Arguments:
+        stopwords (StopwordLexicon): The stopwords to be analysed.
+
+    """
+
+    global _stopwords
+    _stopwords = stopwords
+
+
+def _analyse_text(text, raw=False):
+    """Analyses a text in a worker process.
+
+    Arguments:
+        text (string): The text of the work.
+        raw (bool): Whether the text is tokenised as raw text.
+
+    Returns:
+        counts (dict): The lists of occurrences keyed by statistic.
+        tokens (int): The number of tokens of the text.
+
+    """
+
+    pre_processor = prpscr.Preprocessor()
+    extractor = extr.FeatureExtractor(_stopwords)
+    for tokens in pre_processor.iter_tokens([text], raw):
+        extractor.update(tokens)
+    return extractor.get_counts(), pre_processor.token_count
+
+
+def _analyse_path(path, raw=False, chunk_size=prpscr.DEFAULT_CHUNK_SIZE):
+    """Analyses a file in a worker process, streaming it a chunk at a time.
+
+    Arguments:
+        path (string): The path of the work.
+        raw (bool): Whether the work is tokenised as raw text.
+        chunk_size (int): The number of bytes read at a time.
+
+    Returns:
+        counts (dict): The lists of occurrences keyed by statistic.
+        tokens (int): The number of tokens of the work.
+
+    """
+
+    counts, metrics = main.analyse_work(path, _stopwords, chunk_size, raw=raw, measure=True)
+    return counts, metrics['tokens']
+
+
+class RequestError(Exception):
+    """An error of a request, answered with an HTTP status and a JSON message.
+
+    """
+
+    def __init__(self, status, message):
+        """Initializes a RequestError object.
+
+        Arguments:
+            status (int): The HTTP status of the response.
+            message (string): The description of the error.
+
+        """
+
+        super().__init__(message)
+        self.status = status
+
+
+class AnalysisServer:
+    """A server class answering analysis requests from warm in-memory state.
+
+    """
+
+    def __init__(self, stopwords, workers=1, method='delta', max_body=MAX_BODY):
+        """Initializes an AnalysisServer object and starts its worker processes.
+
+        Arguments:
+            stopwords (StopwordLexicon): The stopwords to be analysed.
+            workers (int): The number of processes analysing the works, one per
+                CPU if 0.
+            method (string): The distance used for attribution, 'delta' for
+                Burrows' Delta or 'cosine'.
+            max_body (int): The largest request body accepted, in bytes.
+
+        """
+
+        self.stopwords = stopwords
+        self.workers = workers or os.cpu_count()
+        self.method = method
+        self.max_body = max_body
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                        initargs=(stopwords,))
+        #Instance variables for the attribution, set by load_reference
+        self.attributor = None
+        self.features = {}
+        #Instance variables for the number of requests and their total time
+        self.requests = 0
+        self.seconds = 0.0
+
+
+    def __str__(self):
+        """Prints the workers and reference authors as a formatted string.
+
+        Returns:
+            The state of the server as a formatted string.
+
+        """
+
+        prefix = 'Analysis server : \n' + "======================\n"
+        suffix = "\n======================"
+        authors = ', '.join(self.attributor.authors) if self.attributor is not None else '-'
+        return prefix + '%d workers, %d requests, authors %s' % (
+            self.workers, self.requests, authors) + suffix
+
+
+    def load_reference(self, works, names=None):
+        """Builds the author profiles of the reference works and keeps them.
+
+        Function for analysing the reference works on the pool and computing
+        the author centroids once, so that each request is only compared with
+        them. The author of a work is taken from its name as in
+        Hamlet_Shakespeare.tok.
+
+        Arguments:
+            works (list): The paths of the reference works.
+            names (list): The names of the works, their paths if not given.
+
+        """
+
+        import featurestore as fstore
+        import attribution as attr
+
+        names = works if names is None else names
+        results = list(self.pool.map(_analyse_path, works, repeat(False)))
+        store = fstore.FeatureStore(self.stopwords, capacity=len(works))
+        for name, (counts, tokens) in zip(names, results):
+            store.add_work(name, counts)
+        profiles, features = attr.profile_matrix(store)
+        self.attributor = attr.AuthorshipAttributor(profiles, [attr.author_from_name(x)
+                                                               for x in names])
+        self.features = dict((x, i) for i, x in enumerate(features))
+
+
+    def attribute(self, counts):
+        """Attributes the counts of a work to the nearest reference author.
+
+        Arguments:
+            counts (dict): The lists of occurrences returned by
+                FeatureExtractor.get_counts.
+
+        Returns:
+            author (string): The nearest author.
+            distances (dict): The distance to each author.
+
+        """
+
+        import numpy as np
+        import featurestore as fstore
+        import attribution as attr
+
+        store = fstore.FeatureStore(self.stopwords, capacity=1)
+        store.add_work('request', counts)
+        profile, features = attr.profile_matrix(store)
+        #Aligning the features with the ones of the reference works, the ones
+        #they never use being left out
+        vector = np.zeros(len(self.features))
+        for value, feature in zip(profile[0], features):
+            column = self.features.get(feature)
+            if column is not None:
+                vector[column] = value
+        authors, distances = self.attributor.attribute(vector, self.method)
+        return authors[0], dict(zip(self.attributor.authors, distances[0].tolist()))
+
+
+    async def analyse(self, payload):
+        """Analyses the text or file of a request on the pool.
+
+        Arguments:
+            payload (dict): The request, with either a text or a path and
+                optionally raw.
+
+        Returns:
+            response (dict): The counts and tokens of the work, and its
+                attribution if there are reference works.
+
+        """
+
+        if not isinstance(payload, dict):
+            raise RequestError(400, 'The request must be a JSON object')
+        raw = bool(payload.get('raw', False))
+        loop = asyncio.get_running_loop()
+        if isinstance(payload.get('text'), str):
+            job = loop.run_in_executor(self.pool, _analyse_text, payload['text'], raw)
+        elif isinstance(payload.get('path'), str):
+            if not os.path.isfile(payload['path']):
+                raise RequestError(404, 'No such file : ' + payload['path'])
+            job = loop.run_in_executor(self.pool, _analyse_path, payload['path'], raw)
+        else:
+            raise RequestError(400, 'The request needs a text or a path')
+        try:
+            counts, tokens = await job
+        except (IOError, UnicodeDecodeError) as err:
+            raise RequestError(400, str(err))
+
+        response = {'tokens': tokens, 'counts': counts}
+        if self.attributor is not None:
+            response['author'], response['distances'] = self.attribute(counts)
+        return response
+
+
+    def vocabulary(self):
+        """Getter for the labels of the statistics returned, in their order.
+
+        Function for describing every key of FeatureExtractor.get_counts: the
+        labels of the lists of occurrences, and how to read the statistics
+        which are not lists of occurrences in a fixed order.
+
+        Returns:
+            labels (dict): The labels or the description of each statistic.
+
+        """
+
+        import string
+
+        return {'char_freq': list(char.CharacterAnalyser.characters),
+                'punc_freq': list(string.punctuation),
+                'stop_freq': list(self.stopwords.words),
+                'word_len_freq': 'the index of each count is the word length',
+                'char_extra': 'the occurrence of each character beyond the ASCII ones, '
+                              'keyed by character',
+                'spectrum': 'the [m, V(m)] pairs of the number of words V(m) occurring '
+                            'm times, by increasing m, for the measures of richness',
+                'vocabulary': 'only with a word sketch, in place of the spectrum : the '
+                              'words, estimated distinct words and type/token ratio, '
+                              'the most frequent words and the error bounds'}
+
+
+    async def dispatch(self, method, target, body):
+        """Answers a request.
+
+        Arguments:
+            method (string): The HTTP method.
+            target (string): The path requested.
+            body (bytes): The body of the request.
+
+        Returns:
+            response (dict): The JSON response.
+
+        """
+
+        path = target.split('?', 1)[0]
+        if path == '/analyse':
+            if method != 'POST':
+                raise RequestError(405, 'Use POST for ' + path)
+            try:
+                payload = json.loads(body)
+            except ValueError as err:
+                raise RequestError(400, 'Invalid JSON : ' + str(err))
+            return await self.analyse(payload)
+        if path in ('/health', '/vocabulary'):
+            if method != 'GET':
+                raise RequestError(405, 'Use GET for ' + path)
+            if path == '/vocabulary':
+                return self.vocabulary()
+            return {'status': 'ok', 'workers': self.workers, 'requests': self.requests,
+                    'seconds': self.seconds, 'authors': self.attributor.authors
+                    if self.attributor is not None else []}
+        raise RequestError(404, 'Unknown path : ' + path)
+
+
+    async def read_request(self, reader):
+        """Reads an HTTP request from a connection.
+
+        Arguments:
+            reader (asyncio StreamReader): The connection.
+
+        Returns:
+            request (tuple): The method, target, body and whether the connection
+                is kept alive, or None if the client closed the connection.
+
+        """
+
+        line = await reader.readline()
+        if not line.strip():
+            return None
+        try:
+            method, target, version = line.decode('latin-1').split()
+        except ValueError:
+            raise RequestError(400, 'Malformed request line')
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            key, _, value = line.decode('latin-1').partition(':')
+            headers[key.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get('content-length', 0) or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise RequestError(400, 'Invalid Content-Length : ' + headers['content-length'])
+        if length > self.max_body:
+            raise RequestError(413, 'The body is larger than %d bytes' % self.max_body)
+        body = await reader.readexactly(length) if length else b''
+        connection = headers.get('connection', '').lower()
+        keep_alive = connection != 'close' and (version != 'HTTP/1.0' or
+                                                connection == 'keep-alive')
+        return method, target, body, keep_alive
+
+
+    async def handle(self, reader, writer):
+        """Answers the requests of a connection until the client closes it.
+
+        Arguments:
+            reader (asyncio StreamReader): The incoming side of the connection.
+            writer (asyncio StreamWriter): The outgoing side of the connection.
+
+        """
+
+        try:
+            keep_alive = True
+            while keep_alive:
+                start = time.perf_counter()
+                request = None
+                try:
+                    request = await self.read_request(reader)
+                    if request is None:
+                        break
+                    method, target, body, keep_alive = request
+                    status, response = 200, await self.dispatch(method, target, body)
+                except RequestError as err:
+                    status, response = err.status, {'error': str(err)}
+                    #The rest of a request rejected before its body was read
+                    #cannot be skipped reliably
+                    keep_alive = keep_alive and request is not None
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except Exception as err:
+                    status, response = 500, {'error': '%s : %s' % (type(err).__name__, err)}
+                    keep_alive = keep_alive and request is not None
+
+                data = json.dumps(response).encode('utf-8')
+                writer.write(('HTTP/1.1 %d %s\r\nContent-Type: application/json\r\n'
+                              'Content-Length: %d\r\nConnection: %s\r\n\r\n' % (
+                                  status, REASONS[status], len(data),
+                                  'keep-alive' if keep_alive else 'close')).encode('latin-1')
+                             + data)
+                await writer.drain()
+                self.requests += 1
+                self.seconds += time.perf_counter() - start
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT, unix=None):
+        """Serves requests until the process is interrupted.
+
+        Arguments:
+            host (string): The address listened on.
+            port (int): The port listened on.
+            unix (string): The path of a Unix socket listened on instead of the
+                address and port.
+
+        """
+
+        if unix is not None:
+            server = await asyncio.start_unix_server(self.handle, path=unix)
+        else:
+            server = await asyncio.start_server(self.handle, host, port)
+        address = unix or '%s:%d' % server.sockets[0].getsockname()[:2]
+        print('Serving on', address, 'with', self.workers, 'workers', flush=True)
+        #Stopping cleanly when the server is terminated, e.g. by the load test
+        stop = asyncio.Event()
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+        except NotImplementedError:
+            pass
+        async with server:
+            await stop.wait()
+
+
+    def close(self):
+        """Stops the worker processes.
+
+        """
+
+        self.pool.shutdown()
+
+
+def parse_arguments(argv=None):
+    """Parses the command line arguments of the analysis server.
+
+    Arguments:
+        argv (list): The arguments to be parsed, sys.argv if not given.
+
+    Returns:
+        args (argparse Namespace): The parsed arguments.
+
+    """
+
+    parser = argparse.ArgumentParser(description='Local stylometric analysis service.')
+    parser.add_argument('--host', default=DEFAULT_HOST, help='address listened on')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='port listened on')
+    parser.add_argument('--unix', default=None,
+                        help='path of a Unix socket listened on instead of the port')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='number of processes analysing the works, 0 for one per CPU')
+    parser.add_argument('--stopwords', default=None,
+                        help='path or URL of the stopword list, the bundled list if not given')
+    parser.add_argument('--stopword-cache', default=None,
+                        help='folder for caching the stopword lists fetched from a URL')
+    parser.add_argument('--reference', nargs='*', default=[main.DEFAULT_DATASET],
+                        help='files, folders or glob patterns of the works of known '+
+                        'authors, the sample dataset if not given and none if empty')
+    parser.add_argument('--pattern', default=main.DEFAULT_PATTERN,
+                        help='glob pattern of the reference files in the folders given')
+    parser.add_argument('--method', default='delta', choices=['delta', 'cosine'],
+                        help='distance used to attribute the works')
+    return parser.parse_args(argv)
+
+
+def serve(args=None):
+    """Starts the analysis server from the command line arguments.
+
+    Arguments:
+        args (argparse Namespace): The parsed arguments, read from the command
+            line if not given.
+
+    Returns:
+        status (int): 0 when the server is interrupted and 1 if it fails to start.
+
+    """
+
+    if args is None:
+        args = parse_arguments()
+
+    try:
+        stopwords = lexicon.get_stopwords(args.stopwords, args.stopword_cache)
+        server = AnalysisServer(stopwords, args.workers, args.method)
+    except IOError as err:
+        print('INPUT ERROR :', err, '. Please check the path of the file!')
+        return 1
+    try:
+        if args.reference:
+            works = main.find_works(args.reference, args.pattern)
+            server.load_reference(works, main.work_names(works))
+        asyncio.run(server.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    except (ValueError, IOError) as err:
+        print('SERVER ERROR :', err)
+        return 1
+    finally:
+        server.close()
+        if args.unix is not None and os.path.exists(args.unix):
+            os.remove(args.unix)
+    return 0
+
+
+if __name__=='__main__':
+    """Function for execution of serve() on running the module
+
+    """
+
+    sys.exit(serve())
@@ -0,0 +1,480 @@
+# -*- coding: utf-8 -*-
+"""
+Created on         : 17/10/2026
+Last modified on   : 17/10/2026
+Author             : Satyabrat Borgohain
+Description :
+
+    This class compares works with each other from their stopword, character
+    and word length profiles. The works x works distance matrix is computed
+    with the cosine, Manhattan or Delta distance in square tiles, so that the
+    temporary arrays stay within a memory budget however many works there are.
+
+    The nearest neighbours of a work are found with an inverted file index: the
+    profiles are clustered with k-means and a query is only compared with the
+    works of the few clusters nearest to it, instead of with the whole corpus.
+
+    Objects of this class can be created for standalone puposes.
+"""
+
+
+
+import numpy as np
+import attribution as attr
+
+#Distances between the profiles
+METHODS = ('cosine', 'manhattan', 'delta')
+#Memory budget of the temporary arrays, in bytes
+DEFAULT_MEMORY = 256 << 20
+#Largest side of the tiles of Manhattan distances, which stay in the CPU cache
+MANHATTAN_TILE = 256
+
+def transform(profiles, method, mean=None, std=None):
+    """Transforms relative frequency profiles for a distance.
+
+    Function for z-scoring the profiles for Delta, as in the attribution, and
+    normalising them to unit length for the cosine distance, so that the
+    distances are then plain Manhattan distances or dot products.
+
+    Arguments:
+        profiles (numpy array): The works x features relative frequencies.
+        method (string): One of METHODS.
+        mean (numpy array): The mean of each feature for Delta, the one of the
+            profiles if not given.
+        std (numpy array): The standard deviation of each feature for Delta,
+            the one of the profiles if not given.
+
+    Returns:
+        vectors (numpy array): The transformed profiles.
+
+    """
+
+    if method not in METHODS:
+        raise ValueError('Unknown distance : ' + str(method))
+    vectors = np.atleast_2d(np.asarray(profiles, dtype=np.float64))
+    if method == 'delta':
+        mean = vectors.mean(axis=0) if mean is None else mean
+        if std is None:
+            std = vectors.std(axis=0)
+            #Features constant across the corpus carry no information
+            std = np.where(std > 0, std, 1.0)
+        return (vectors - mean) / std
+    if method == 'cosine':
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms > 0, norms, 1.0)
+    return vectors
+
+
+def pairwise(a, b, method):
+    """Computes the distances between two blocks of transformed profiles.
+
+    Arguments:
+        a (numpy array): The first works x features block.
+        b (numpy array): The second works x features block.
+        method (string): One of METHODS.
+
+    Returns:
+        distances (numpy array): The len(a) x len(b) distances.
+
+    """
+
+    if method == 'cosine':
+        distances = a @ b.T
+        return np.subtract(1.0, distances, out=distances)
+
+    #Accumulating the differences one feature at a time, so that the temporary
+    #array is the size of the tile instead of tile x features
+    distances = np.zeros((len(a), len(b)))
+    difference = np.empty_like(distances)
+    for x, y in zip(np.ascontiguousarray(a.T), np.ascontiguousarray(b.T)):
+        np.subtract(x[:, None], y[None, :], out=difference)
+        np.abs(difference, out=difference)
+        distances += difference
+    if method == 'delta':
+        distances /= a.shape[1]
+    return distances
+
+
+def distances_to(vectors, vector, method, memory=DEFAULT_MEMORY):
+    """Computes the distances of transformed profiles to a single one.
+
+    Arguments:
+        vectors (numpy array): The works x features transformed profiles.
+        vector (numpy array): The transformed profile compared with them.
+        method (string): One of METHODS.
+        memory (int): The memory budget of the temporary arrays in bytes.
+
+    Returns:
+        distances (numpy array): The distance of each work.
+
+    """
+
+    if method == 'cosine':
+        return 1.0 - vectors @ vector
+    distances = np.empty(len(vectors))
+    block = max(1, memory // (8 * max(1, len(vector))))
+    for start in range(0, len(vectors), block):
+        distances[start:start + block] = np.abs(vectors[start:start + block] -
+                                                vector).sum(axis=1)
+    if method == 'delta':
+        distances /= len(vector)
+    return distances
+
+
+def tile_size(method, memory=DEFAULT_MEMORY):
+    """Computes the number of works of a tile whose temporaries fit in memory.
+
+    Arguments:
+        method (string): One of METHODS.
+        memory (int): The memory budget in bytes.
+
+    Returns:
+        size (int): The number of works of a side of a tile.
+
+    """
+
+    #A tile needs two works x works arrays, and the Manhattan distances are
+    #faster in small tiles which stay in the cache
+    size = max(1, int(np.sqrt(memory / 16)))
+    return size if method == 'cosine' else min(size, MANHATTAN_TILE)
+
+
+def distance_matrix(profiles, method='delta', memory=DEFAULT_MEMORY, out=None):
+    """Computes the works x works distance matrix.
+
+    Function for computing the distances one square tile at a time, only for
+    the tiles on or above the diagonal since the matrix is symmetric. The
+    matrix itself can be given as out, e.g. a memory mapped file, when it is
+    too large to be held in memory.
+
+    Arguments:
+        profiles (numpy array): The works x features relative frequencies.
+        method (string): One of METHODS.
+        memory (int): The memory budget of the temporary arrays in bytes.
+        out (numpy array): The works x works array the distances are written
+            to, a new one if not given.
+
+    Returns:
+        distances (numpy array): The distances between all the works.
+
+    """
+
+    vectors = transform(profiles, method)
+    works = len(vectors)
+    distances = np.empty((works, works)) if out is None else out
+    size = tile_size(method, memory)
+    for i in range(0, works, size):
+        for j in range(i, works, size):
+            tile = pairwise(vectors[i:i + size], vectors[j:j + size], method)
+            distances[i:i + size, j:j + size] = tile
+            if j != i:
+                distances[j:j + size, i:i + size] = tile.T
+    #Rounding errors of the dot products are not distances
+    np.fill_diagonal(distances, 0.0)
+    if method == 'cosine':
+        np.maximum(distances, 0.0, out=distances)
+
+    return distances
+
+
+def nearest_centroids(vectors, centroids, memory=DEFAULT_MEMORY):
+    """Finds the nearest centroid of each vector by Euclidean distance.
+
+    Arguments:
+        vectors (numpy array): The works x features vectors.
+        centroids (numpy array): The clusters x features centroids.
+        memory (int): The memory budget of the temporary arrays in bytes.
+
+    Returns:
+        labels (numpy array): The index of the nearest centroid of each vector.
+
+    """
+
+    labels = np.empty(len(vectors), dtype=np.int64)
+    squares = (centroids ** 2).sum(axis=1)
+    block = max(1, memory // (8 * max(1, len(centroids))))
+    for start in range(0, len(vectors), block):
+        #The squared norm of the vector is the same for all the centroids
+        scores = squares - 2 * vectors[start:start + block] @ centroids.T
+        labels[start:start + block] = scores.argmin(axis=1)
+    return labels
+
+
+def kmeans(vectors, clusters, iterations=10, seed=0, memory=DEFAULT_MEMORY):
+    """Clusters vectors with Lloyd's k-means algorithm.
+
+    Arguments:
+        vectors (numpy array): The works x features vectors.
+        clusters (int): The number of clusters.
+        iterations (int): The number of iterations.
+        seed (int): The seed of the initial centroids.
+        memory (int): The memory budget of the temporary arrays in bytes.
+
+    Returns:
+        centroids (numpy array): The clusters x features centroids.
+        labels (numpy array): The cluster of each vector.
+
+    """
+
+    rng = np.random.default_rng(seed)
+    clusters = max(1, min(clusters, len(vectors)))
+    centroids = vectors[rng.choice(len(vectors), clusters, replace=False)].copy()
+    for _ in range(iterations):
+        labels = nearest_centroids(vectors, centroids, memory)
+        #Summing the vectors of each cluster, grouped by sorting
+        order = np.argsort(labels, kind='stable')
+        sizes = np.bincount(labels, minlength=clusters)
+        present = np.flatnonzero(sizes)
+        starts = np.searchsorted(labels[order], present)
+        centroids[present] = (np.add.reduceat(vectors[order], starts, axis=0) /
+                              sizes[present][:, None])
+        #Moving the empty clusters to random vectors
+        empty = np.flatnonzero(sizes == 0)
+        if len(empty):
+            centroids[empty] = vectors[rng.choice(len(vectors), len(empty), replace=False)]
+    return centroids, nearest_centroids(vectors, centroids, memory)
+
+
+def inverse_permutation(order):
+    """Inverts a permutation, so that looking up a position takes constant time.
+
+    Arguments:
+        order (numpy array): The permutation of 0 to N - 1.
+
+    Returns:
+        position (numpy array): The position of each element in the permutation.
+
+    """
+
+    position = np.empty_like(order)
+    position[order] = np.arange(len(order))
+    return position
+
+
+class NearestNeighbourIndex:
+    """An index class finding the works nearest to a profile.
+
+    """
+
+    def __init__(self, profiles, names, method='delta', lists=None, probes=None,
+                 iterations=10, sample=64, seed=0, memory=DEFAULT_MEMORY):
+        """Initializes a NearestNeighbourIndex object, building its clusters.
+
+        The profiles are transformed for the distance and clustered with
+        k-means on a sample of them, then stored grouped by cluster so that the
+        works of a cluster are contiguous.
+
+        Arguments:
+            profiles (numpy array): The works x features relative frequencies.
+            names (list): The name of each work.
+            method (string): One of METHODS.
+            lists (int): The number of clusters, about the square root of the
+                number of works if not given.
+            probes (int): The number of clusters searched by a query by default,
+                about a tenth of the clusters if not given.
+            iterations (int): The number of k-means iterations.
+            sample (int): The number of works per cluster the k-means is trained
+                on, at most.
+            seed (int): The seed of the k-means.
+            memory (int): The memory budget of the temporary arrays in bytes.
+
+        """
+
+        profiles = np.atleast_2d(np.asarray(profiles, dtype=np.float64))
+        if len(profiles) != len(names):
+            raise ValueError('There must be one name per profile')
+        if len(profiles) == 0:
+            raise ValueError('The index needs at least one work')
+        self.method = method
+        self.memory = memory
+        self.names = list(names)
+        self.ids = dict((x, i) for i, x in enumerate(self.names))
+        #Corpus statistics used to z-score the queries for Delta
+        self.mean = profiles.mean(axis=0)
+        std = profiles.std(axis=0)
+        self.std = np.where(std > 0, std, 1.0)
+        vectors = transform(profiles, method, self.mean, self.std)
+
+        lists = lists or int(np.sqrt(len(vectors)))
+        lists = max(1, min(lists, len(vectors)))
+        rng = np.random.default_rng(seed)
+        training = vectors
+        if len(vectors) > sample * lists:
+            training = vectors[rng.choice(len(vectors), sample * lists, replace=False)]
+        self.centroids = kmeans(training, lists, iterations, seed, memory)[0]
+        labels = nearest_centroids(vectors, self.centroids, memory)
+
+        #Grouping the works by cluster, the works of cluster c being the rows
+        #offsets[c] to offsets[c + 1] of vectors
+        self.order = np.argsort(labels, kind='stable')
+        self.vectors = vectors[self.order]
+        #Row of vectors of each work, the inverse of order
+        self.position = inverse_permutation(self.order)
+        self.offsets = np.concatenate(([0], np.cumsum(np.bincount(labels,
+                                                                 minlength=len(self.centroids)))))
+        self.probes = probes or max(1, int(np.ceil(len(self.centroids) / 10)))
+
+
+    @classmethod
+    def from_store(cls, store, method='delta', statistics=attr.DEFAULT_STATISTICS, **kwargs):
+        """Creates a NearestNeighbourIndex object from the works of a store.
+
+        Arguments:
+            store (FeatureStore): The store of the works.
+            method (string): One of METHODS.
+            statistics (tuple): The statistics used as features.
+            kwargs: The other arguments of the index.
+
+        Returns:
+            index (NearestNeighbourIndex): The index of the works.
+
+        """
+
+        profiles = attr.profile_matrix(store, statistics)[0]
+        return cls(profiles, [record.work for record in store.records], method, **kwargs)
+
+
+    def __str__(self):
+        """Prints the size of the index as a formatted string.
+
+        Returns:
+            The size of the index as a formatted string.
+
+        """
+
+        prefix = 'Nearest neighbour index : \n' + "======================\n"
+        suffix = "\n======================"
+        return prefix + '%d works, %d clusters, %d probes, %s distance' % (
+            len(self.names), len(self.centroids), self.probes, self.method) + suffix
+
+
+    def __len__(self):
+        """Returns the number of works.
+
+        """
+
+        return len(self.names)
+
+
+    def query(self, profile, k=10, probes=None, exclude=None):
+        """Finds the works nearest to a profile.
+
+        Function for comparing the profile with the centroids, then with the
+        works of its nearest clusters only. The search is exact if all the
+        clusters are probed.
+
+        Arguments:
+            profile (numpy array): The relative frequencies of the features.
+            k (int): The number of works returned.
+            probes (int): The number of clusters searched, the one of the index
+                if not given, and more if they hold fewer than k works.
+            exclude (int): The index of a work left out of the results, e.g.
+                the work queried.
+
+        Returns:
+            neighbours (list): The (name, distance) of the nearest works, nearest
+                first.
+
+        """
+
+        vector = transform(profile, self.method, self.mean, self.std)
+        return self._search(vector, k, probes, exclude)
+
+
+    def _search(self, vector, k, probes, exclude):
+        """Finds the works nearest to a transformed profile.
+
+        Arguments:
+            vector (numpy array): The 1 x features transformed profile.
+            k (int): The number of works returned.
+            probes (int): The number of clusters searched.
+            exclude (int): The index of a work left out of the results.
+
+        Returns:
+            neighbours (list): The (name, distance) of the nearest works.
+
+        """
+
+        scores = (self.centroids ** 2).sum(axis=1) - 2 * (self.centroids @ vector[0])
+        sizes = np.diff(self.offsets)[np.argsort(scores)]
+        #Probing more clusters if the nearest ones hold fewer than k other works
+        wanted = k + (exclude is not None)
+        probes = max(probes or self.probes, int(np.searchsorted(np.cumsum(sizes), wanted)) + 1)
+        clusters = np.argsort(scores)[:probes]
+        #The works of a cluster are contiguous, so they are compared without copying
+        distances = np.concatenate([distances_to(self.vectors[self.offsets[c]:
+                                                              self.offsets[c + 1]],
+                                                 vector[0], self.method, self.memory)
+                                    for c in clusters])
+        works = np.concatenate([self.order[self.offsets[c]:self.offsets[c + 1]]
+                                for c in clusters])
+        if exclude is not None:
+            keep = works != exclude
+            works, distances = works[keep], distances[keep]
+
+        k = min(k, len(works))
+        if k <= 0:
+            return []
+        nearest = np.argpartition(distances, k - 1)[:k]
+        nearest = nearest[np.argsort(distances[nearest], kind='stable')]
+        return [(self.names[works[i]], float(distances[i])) for i in nearest]
+
+
+    def query_work(self, name, k=10, probes=None):
+        """Finds the works nearest to a work of the index, other than itself.
+
+        Arguments:
+            name (string): The name of the work.
+            k (int): The number of works returned.
+            probes (int): The number of clusters searched.
+
+        Returns:
+            neighbours (list): The (name, distance) of the nearest works, nearest
+                first.
+
+        """
+
+        work = self.ids[name]
+        row = int(self.position[work])
+        return self._search(self.vectors[row:row + 1], k, probes, work)
+
+
+    def save(self, path):
+        """Saves the index to a npz file.
+
+        Arguments:
+            path (string): The path of the file.
+
+        """
+
+        #Saved as fixed width strings so that loading never unpickles objects
+        np.savez(path, method=np.array(self.method, dtype=str),
+                 names=np.array(self.names, dtype=str),
+                 mean=self.mean, std=self.std, centroids=self.centroids, order=self.order,
+                 vectors=self.vectors, offsets=self.offsets, probes=self.probes,
+                 memory=self.memory)
+
+
+    @classmethod
+    def load(cls, path):
+        """Loads an index saved by save without clustering the works again.
+
+        Arguments:
+            path (string): The path of the file.
+
+        Returns:
+            index (NearestNeighbourIndex): The index.
+
+        """
+
+        with np.load(path, allow_pickle=False) as data:
+            index = cls.__new__(cls)
+            index.method = str(data['method'])
+            index.names = data['names'].tolist()
+            index.ids = dict((x, i) for i, x in enumerate(index.names))
+            for name in ('mean', 'std', 'centroids', 'order', 'vectors', 'offsets'):
+                setattr(index, name, data[name])
+            index.probes = int(data['probes'])
+            index.memory = int(data['memory'])
+        index.position = inverse_permutation(index.order)
+        return index
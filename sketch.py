@@ -0,0 +1,503 @@
+# -*- coding: utf-8 -*-
+"""
+Created on         : 17/10/2026
+Last modified on   : 17/10/2026
+Author             : Satyabrat Borgohain
+Description :
+
+    This class counts the vocabulary of a work approximately in bounded memory,
+    for works or concatenated corpora whose distinct words do not fit in an
+    exact Counter. A Count-Min sketch estimates the occurrence of any word, a
+    Space-Saving sketch keeps the most frequent words and a HyperLogLog
+    estimates the number of distinct words, and hence the type/token ratio.
+
+    The memory of the sketches only depends on their error bounds: a Count-Min
+    estimate exceeds the true occurrence by at most epsilon times the number of
+    words with probability 1 - delta, and the relative error of the distinct
+    words is about 1.04 / sqrt(2 ** precision).
+
+    Objects of this class can be created for standalone puposes.
+"""
+
+
+
+import sys
+import math
+import hashlib
+import numpy as np
+import ngram
+
+def hash_words(words):
+    """Hashes words to 64 bit integers.
+
+    BLAKE2 is used rather than the built-in hash, which differs between
+    processes, so that the sketches of works analysed by different workers can
+    be merged.
+
+    Arguments:
+        words (iterable): The words.
+
+    Returns:
+        hashes (numpy array): The unsigned 64 bit hash of each word.
+
+    """
+
+    words = list(words)
+    return np.fromiter((int.from_bytes(hashlib.blake2b(x.encode('utf-8'), digest_size=8)
+                                       .digest(), 'little') for x in words),
+                       dtype=np.uint64, count=len(words))
+
+
+class CountMinSketch:
+    """A frequency sketch class estimating the occurrences of items from a
+    fixed size table of counters.
+
+    """
+
+    def __init__(self, epsilon=1e-4, delta=0.01):
+        """Initializes an empty CountMinSketch object.
+
+        Each item is counted in one counter of every row of the table and its
+        estimate is the smallest of them, which is never below its true count.
+
+        Arguments:
+            epsilon (float): The error of an estimate relative to the total
+                count, giving the width of the table.
+            delta (float): The probability of exceeding the error, giving the
+                depth of the table.
+
+        """
+
+        if not 0 < epsilon < 1 or not 0 < delta < 1:
+            raise ValueError('epsilon and delta must be between 0 and 1')
+        self.epsilon = epsilon
+        self.delta = delta
+        self.width = int(math.ceil(math.e / epsilon))
+        self.depth = int(math.ceil(math.log(1 / delta)))
+        #Instance variables for the counters and the total count
+        self.table = np.zeros((self.depth, self.width), dtype=np.int64)
+        self.total = 0
+
+
+    def __str__(self):
+        """Prints the size of the table as a formatted string.
+
+        Returns:
+            The size of the table as a formatted string.
+
+        """
+
+        prefix = 'Count-Min sketch : \n' + "======================\n"
+        suffix = "\n======================"
+        return prefix + '%d x %d counters, %d counted' % (self.depth, self.width,
+                                                          self.total) + suffix
+
+
+    def _columns(self, hashes):
+        """Finds the counter of each item in every row of the table.
+
+        The rows use the hashes h1 + i * h2 of the two halves of the 64 bit
+        hash of the item.
+
+        Arguments:
+            hashes (numpy array): The 64 bit hashes of the items.
+
+        Returns:
+            columns (numpy array): The depth x items columns.
+
+        """
+
+        low = hashes & np.uint64(0xffffffff)
+        high = (hashes >> np.uint64(32)) | np.uint64(1)
+        rows = np.arange(self.depth, dtype=np.uint64)[:, None]
+        return ((low[None, :] + rows * high[None, :]) % np.uint64(self.width)).astype(np.int64)
+
+
+    def update_hashes(self, hashes, counts):
+        """Adds the occurrences of hashed items.
+
+        Arguments:
+            hashes (numpy array): The 64 bit hashes of the items.
+            counts (numpy array): The occurrences of each item.
+
+        """
+
+        counts = np.asarray(counts, dtype=np.int64)
+        flat = (self._columns(hashes) + np.arange(self.depth)[:, None] * self.width).ravel()
+        weights = np.tile(counts, self.depth)
+        self.table += np.bincount(flat, weights, self.depth * self.width).astype(
+            np.int64).reshape(self.depth, self.width)
+        self.total += int(counts.sum())
+
+
+    def update_counts(self, item_count):
+        """Adds the occurrences of several items.
+
+        Arguments:
+            item_count (dict): The number of occurrences keyed by item.
+
+        """
+
+        if item_count:
+            self.update_hashes(hash_words(item_count), list(item_count.values()))
+
+
+    def estimate_hashes(self, hashes):
+        """Estimates the occurrences of hashed items.
+
+        Arguments:
+            hashes (numpy array): The 64 bit hashes of the items.
+
+        Returns:
+            estimates (numpy array): The estimated occurrences of each item.
+
+        """
+
+        columns = self._columns(hashes)
+        return self.table[np.arange(self.depth)[:, None], columns].min(axis=0)
+
+
+    def estimate(self, item):
+        """Estimates the occurrence of an item.
+
+        Arguments:
+            item (string): The item.
+
+        Returns:
+            estimate (int): The estimated occurrence, at least the true one.
+
+        """
+
+        return int(self.estimate_hashes(hash_words([item]))[0])
+
+
+    def error_bound(self):
+        """Getter for the largest overestimate expected with probability 1 - delta.
+
+        Returns:
+            bound (float): epsilon times the total count.
+
+        """
+
+        return self.epsilon * self.total
+
+
+    def merge(self, other):
+        """Adds the counts of another sketch of the same size.
+
+        Arguments:
+            other (CountMinSketch): The sketch to be merged.
+
+        Returns:
+            self (CountMinSketch): The sketch, for chaining.
+
+        """
+
+        if other.table.shape != self.table.shape:
+            raise ValueError('Cannot merge Count-Min sketches of different sizes')
+        self.table += other.table
+        self.total += other.total
+        return self
+
+
+class HyperLogLog:
+    """A cardinality sketch class estimating the number of distinct items.
+
+    """
+
+    def __init__(self, precision=14):
+        """Initializes an empty HyperLogLog object.
+
+        The first precision bits of the hash of an item choose one of
+        2 ** precision registers, which keeps the longest run of leading zeros
+        seen in the rest of the hashes.
+
+        Arguments:
+            precision (int): The number of bits choosing the register, between
+                4 and 18.
+
+        """
+
+        if not 4 <= precision <= 18:
+            raise ValueError('The precision must be between 4 and 18')
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+
+    def __str__(self):
+        """Prints the estimated number of distinct items as a formatted string.
+
+        Returns:
+            The estimate as a formatted string.
+
+        """
+
+        prefix = 'HyperLogLog : \n' + "======================\n"
+        suffix = "\n======================"
+        return prefix + '%d registers, about %d distinct items' % (
+            len(self.registers), self.estimate()) + suffix
+
+
+    def update_hashes(self, hashes):
+        """Adds hashed items.
+
+        Arguments:
+            hashes (numpy array): The 64 bit hashes of the items.
+
+        """
+
+        bits = 64 - self.precision
+        registers = (hashes >> np.uint64(bits)).astype(np.int64)
+        rest = hashes & np.uint64((1 << bits) - 1)
+        #Number of bits of the rest, found from the exponents of floats which
+        #are exact below 2 ** 53
+        high = rest >> np.uint64(11)
+        lengths = np.where(high > 0, np.frexp(high.astype(np.float64))[1] + 11,
+                           np.frexp(rest.astype(np.float64))[1])
+        np.maximum.at(self.registers, registers, (bits - lengths + 1).astype(np.uint8))
+
+
+    def update(self, items):
+        """Adds items.
+
+        Arguments:
+            items (iterable): The items, counted once however often they occur.
+
+        """
+
+        self.update_hashes(hash_words(items))
+
+
+    def estimate(self):
+        """Estimates the number of distinct items.
+
+        Returns:
+            estimate (float): The estimated number of distinct items.
+
+        """
+
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.ldexp(1.0, -self.registers.astype(np.int64)).sum()
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            #Linear counting is more accurate for small numbers of items
+            estimate = m * math.log(m / zeros)
+        return float(estimate)
+
+
+    def relative_error(self):
+        """Getter for the standard error of the estimate relative to the count.
+
+        Returns:
+            error (float): 1.04 / sqrt(number of registers).
+
+        """
+
+        return 1.04 / math.sqrt(len(self.registers))
+
+
+    def merge(self, other):
+        """Adds the items of another sketch of the same precision.
+
+        Arguments:
+            other (HyperLogLog): The sketch to be merged.
+
+        Returns:
+            self (HyperLogLog): The sketch, for chaining.
+
+        """
+
+        if other.precision != self.precision:
+            raise ValueError('Cannot merge HyperLogLogs of different precisions')
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+
+class WordSketch:
+    """A vocabulary class counting the words of a work approximately in bounded
+    memory.
+
+    """
+
+    def __init__(self, epsilon=1e-4, delta=0.01, top_k=1000, precision=14):
+        """Initializes an empty WordSketch object.
+
+        Arguments:
+            epsilon (float): The error of the occurrence of a word relative to
+                the number of words.
+            delta (float): The probability of exceeding that error.
+            top_k (int): The number of most frequent words kept.
+            precision (int): The precision of the distinct words estimate.
+
+        """
+
+        self.frequencies = CountMinSketch(epsilon, delta)
+        self.heavy_hitters = ngram.SpaceSavingSketch(top_k)
+        self.types = HyperLogLog(precision)
+
+
+    def __str__(self):
+        """Prints the words, distinct words and memory as a formatted string.
+
+        Returns:
+            The summary of the sketch as a formatted string.
+
+        """
+
+        prefix = 'Word sketch : \n' + "======================\n"
+        suffix = "\n======================"
+        return prefix + '%d words, about %d distinct, %d bytes' % (
+            self.frequencies.total, self.distinct(), self.nbytes()) + suffix
+
+
+    def config(self):
+        """Getter for the parameters of the sketch, e.g. for the cache keys.
+
+        Returns:
+            config (dict): The epsilon, delta, top_k and precision.
+
+        """
+
+        return {'epsilon': self.frequencies.epsilon, 'delta': self.frequencies.delta,
+                'top_k': self.heavy_hitters.k, 'precision': self.types.precision}
+
+
+    def update_counts(self, word_count):
+        """Adds the occurrences of several words.
+
+        Function for adding a batch of counted words, e.g. the words of a chunk,
+        hashing each distinct word only once for the Count-Min sketch and the
+        HyperLogLog.
+
+        Arguments:
+            word_count (dict): The number of occurrences keyed by word.
+
+        """
+
+        if not word_count:
+            return
+        hashes = hash_words(word_count)
+        self.frequencies.update_hashes(hashes, list(word_count.values()))
+        self.types.update_hashes(hashes)
+        self.heavy_hitters.merge_counts(word_count)
+
+
+    def estimate(self, word):
+        """Estimates the occurrence of a word.
+
+        Both sketches overestimate, so the smaller of their counts is kept.
+
+        Arguments:
+            word (string): The word.
+
+        Returns:
+            estimate (int): The estimated occurrence, at least the true one.
+
+        """
+
+        estimate = self.frequencies.estimate(word)
+        return min(estimate, self.heavy_hitters.counts.get(word, estimate))
+
+
+    def top(self, k=None):
+        """Getter for the most frequent words.
+
+        Arguments:
+            k (int): The number of words, all the ones kept if not given.
+
+        Returns:
+            A list of the (word, estimated occurrence) in decreasing order.
+
+        """
+
+        top = self.heavy_hitters.top(k)
+        if not top:
+            return []
+        estimates = self.frequencies.estimate_hashes(hash_words(x for x, n in top))
+        top = [(x, min(n, int(estimate))) for (x, n), estimate in zip(top, estimates)]
+        return sorted(top, key=lambda x: x[1], reverse=True)
+
+
+    def tokens(self):
+        """Getter for the number of words counted, which is exact.
+
+        Returns:
+            tokens (int): The number of words.
+
+        """
+
+        return self.frequencies.total
+
+
+    def distinct(self):
+        """Getter for the estimated number of distinct words.
+
+        Returns:
+            types (float): The estimated number of distinct words.
+
+        """
+
+        return self.types.estimate()
+
+
+    def type_token_ratio(self):
+        """Getter for the estimated type/token ratio.
+
+        Returns:
+            ratio (float): The distinct words over the words, 0 if there are none.
+
+        """
+
+        return self.distinct() / self.tokens() if self.tokens() else 0.0
+
+
+    def merge(self, other):
+        """Adds the words counted by another sketch with the same parameters.
+
+        Arguments:
+            other (WordSketch): The sketch to be merged.
+
+        Returns:
+            self (WordSketch): The sketch, for chaining.
+
+        """
+
+        self.frequencies.merge(other.frequencies)
+        self.heavy_hitters.merge(other.heavy_hitters)
+        self.types.merge(other.types)
+        return self
+
+
+    def nbytes(self):
+        """Getter for the memory used by the sketch, approximately.
+
+        Returns:
+            size (int): The bytes of the tables, registers and kept words.
+
+        """
+
+        counts = self.heavy_hitters.counts
+        return (self.frequencies.table.nbytes + self.types.registers.nbytes +
+                sys.getsizeof(counts) + sys.getsizeof(self.heavy_hitters.errors) +
+                sum(sys.getsizeof(x) for x in counts))
+
+
+    def summary(self, k=100):
+        """Getter for the vocabulary of the work and the error bounds.
+
+        Arguments:
+            k (int): The number of most frequent words returned.
+
+        Returns:
+            summary (dict): The words, estimated distinct words and type/token
+                ratio, the k most frequent words and the error bounds.
+
+        """
+
+        return {'tokens': self.tokens(), 'types': round(self.distinct()),
+                'type_token_ratio': self.type_token_ratio(),
+                'top': [list(x) for x in self.top(k)],
+                'count_error_bound': self.frequencies.error_bound(),
+                'types_relative_error': self.types.relative_error(),
+                'config': self.config()}
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Created on         : 17/10/2026
+Last modified on   : 17/10/2026
+Author             : Satyabrat Borgohain
+Description :
+
+    Tests that an export replaces the earlier one in the same folder, whatever
+    their formats, so that loading never mixes the files of two exports.
+"""
+
+
+
+import os
+import pytest
+import extractor as extr
+import featurestore as fstore
+import export
+import lexicon
+
+def make_store(works):
+    stopwords = lexicon.StopwordLexicon(['THE'])
+    store = fstore.FeatureStore(stopwords)
+    extractor = extr.FeatureExtractor(stopwords)
+    for work in works:
+        extractor.extract(work.split())
+        store.add_work(work, extractor.get_counts())
+    return store
+
+
+def test_newer_export_replaces_older_format(tmp_path):
+    pytest.importorskip('pyarrow')
+    export.export_store(make_store(['the old cat']), str(tmp_path), 'npz')
+    for export_format in ('parquet', 'feather', 'npz'):
+        works = ['the cat sat', 'a new ' + export_format]
+        export.export_store(make_store(works), str(tmp_path), export_format)
+        store = export.load_store(str(tmp_path))
+        assert [record.work for record in store.records] == works
+    assert sorted(os.listdir(str(tmp_path))) == [export.MANIFEST_NAME, export.NPZ_NAME]
+
+
+def test_sentences_exported_only_when_segmented(tmp_path):
+    store = make_store(['the cat sat'])
+    assert store.get_statistics() == ['char_freq', 'punc_freq', 'stop_freq', 'word_len_freq']
+    export.export_store(store, str(tmp_path), 'npz')
+    assert not export.load_store(str(tmp_path)).has_segments()
+
+    store.add_work('segmented', {'sent_len_freq': [0, 0, 1], 'line_len_freq': [0, 0, 1],
+                                 'sent_punc_freq': [0, 1]})
+    export.export_store(store, str(tmp_path), 'npz')
+    store = export.load_store(str(tmp_path))
+    assert store.has_segments()
+    assert store.get_matrix('sent_len_freq')[:, 2].tolist() == [0, 1]
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""
+Created on         : 17/10/2026
+Last modified on   : 17/10/2026
+Author             : Satyabrat Borgohain
+Description :
+
+    Tests that the rolling windows count the same characters as the whole
+    work analysis, including the ones beyond ASCII.
+"""
+
+
+
+import preprocessor as prpscr
+import extractor as extr
+import featurestore as fstore
+import rolling
+import lexicon
+
+def character_counts(store, row=0):
+    labels = store.vocabularies['char_freq'].labels
+    return dict((x, n) for x, n in zip(labels, store.get_matrix('char_freq')[row]) if n)
+
+
+def test_windows_count_extra_characters():
+    stopwords = lexicon.StopwordLexicon(['THE'])
+    pre_processor = prpscr.Preprocessor()
+    pre_processor.tokenise('Café naïve über Zoë the cat sat. Ça va, señor ?', raw=True)
+    tokens = pre_processor.get_tokenised_list()
+
+    windows = rolling.RollingAnalyser(5, step=1, stopwords=stopwords).analyse(tokens)
+    extractor = extr.FeatureExtractor(stopwords)
+    for start in range(len(tokens) - 4):
+        extractor.extract(tokens[start:start + 5])
+        store = fstore.FeatureStore(stopwords)
+        store.add_work('window', extractor.get_counts())
+        assert character_counts(windows, start) == character_counts(store)
+    assert 'Ñ' in windows.vocabularies['char_freq'].ids
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+Created on         : 17/10/2026
+Last modified on   : 17/10/2026
+Author             : Satyabrat Borgohain
+Description :
+
+    Tests that a request with an invalid Content-Length is rejected and its
+    connection closed, so that its body is never read as the next request.
+"""
+
+
+
+import json
+import asyncio
+import pytest
+import lexicon
+import server
+
+async def exchange(analysis_server, request):
+    listener = await asyncio.start_server(analysis_server.handle, '127.0.0.1', 0)
+    port = listener.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(request)
+    await writer.drain()
+    response = await asyncio.wait_for(reader.read(), 10)
+    writer.close()
+    listener.close()
+    await listener.wait_closed()
+    return response
+
+
+@pytest.mark.parametrize('length', [b'abc', b'-5'])
+def test_invalid_content_length_closes_connection(length):
+    analysis_server = server.AnalysisServer(lexicon.StopwordLexicon(['THE']))
+    try:
+        request = (b'POST /analyse HTTP/1.1\r\nContent-Length: ' + length + b'\r\n\r\n'
+                   b'GET /health HTTP/1.1\r\n\r\n')
+        response = asyncio.run(exchange(analysis_server, request))
+    finally:
+        analysis_server.pool.shutdown()
+    head, _, body = response.partition(b'\r\n\r\n')
+    assert head.startswith(b'HTTP/1.1 400 ')
+    assert b'Connection: close' in head
+    assert 'Content-Length' in json.loads(body)['error']
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""
+Created on         : 17/10/2026
+Last modified on   : 17/10/2026
+Author             : Satyabrat Borgohain
+Description :
+
+    Tests that a saved nearest neighbour index is loaded without unpickling
+    and answers the same queries as the index it was saved from.
+"""
+
+
+
+import os
+import numpy as np
+import similarity as sim
+
+def test_saved_index_answers_same_queries(tmp_path):
+    profiles = np.random.default_rng(0).random((200, 8))
+    names = ['work_%d' % i for i in range(len(profiles))]
+    index = sim.NearestNeighbourIndex(profiles, names, 'cosine', lists=8)
+    assert (index.order[index.position] == np.arange(len(names))).all()
+
+    path = os.path.join(str(tmp_path), 'index.npz')
+    index.save(path)
+    with np.load(path, allow_pickle=False) as data:
+        assert data['names'].dtype.kind == 'U'
+    loaded = sim.NearestNeighbourIndex.load(path)
+    assert loaded.method == 'cosine'
+    assert loaded.names == names
+    for name in ('work_0', 'work_57', 'work_199'):
+        assert loaded.query_work(name, 5) == index.query_work(name, 5)
+        assert name not in [x for x, _ in index.query_work(name, 5)]
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Created on         : 17/10/2026
+Last modified on   : 17/10/2026
+Author             : Satyabrat Borgohain
+Description :
+
+    Tests that the words of any script are counted by every analyser, and not
+    only the ASCII ones.
+"""
+
+
+
+import pytest
+import main
+import preprocessor as prpscr
+import extractor as extr
+import word
+import ngram
+import lexicon
+import richness
+
+TEXT = 'Café naïve über Zoë the cat sat.'
+WORDS = ['CAFÉ', 'NAÏVE', 'ÜBER', 'ZOË', 'THE', 'CAT', 'SAT']
+
+def raw_tokens(text=TEXT):
+    pre_processor = prpscr.Preprocessor()
+    pre_processor.tokenise(text, raw=True)
+    return pre_processor.get_tokenised_list()
+
+
+def test_word_pattern():
+    for token in ['Café', 'naïve', 'über', 'Zoë', "l'été", 'well-known', '2nd']:
+        assert prpscr.WORD_PATTERN.match(token)
+    for token in ['42', '.', '_', '--']:
+        assert not prpscr.WORD_PATTERN.match(token)
+
+
+def test_extractor_counts_unicode_words():
+    extractor = extr.FeatureExtractor(lexicon.StopwordLexicon(['THE', 'ÜBER']))
+    extractor.extract(raw_tokens())
+    assert sorted(extractor.word_count) == sorted(WORDS)
+    counts = extractor.get_counts()
+    assert counts['stop_freq'] == [1, 1]
+    assert sum(counts['word_len_freq']) == len(WORDS)
+    assert counts['spectrum'] == [[1, len(WORDS)]]
+
+
+def test_word_analyser_counts_unicode_words():
+    analyser = word.WordAnalyser()
+    analyser.analyse_words(raw_tokens())
+    assert sorted(analyser.word_occ['word']) == sorted(WORDS)
+    analyser.update_words(raw_tokens('Zoë'))
+    assert dict(zip(analyser.word_occ['word'], analyser.word_occ['occurence']))['ZOË'] == 2
+
+
+def test_word_ngrams_count_unicode_words():
+    analyser = ngram.NGramAnalyser(n=2, kind='word')
+    analyser.update_ngrams(raw_tokens())
+    assert analyser.get_counts()['CAFÉ NAÏVE'] == 1
+    assert sum(analyser.get_counts().values()) == len(WORDS) - 1
+
+
+def test_moving_average_ttr_counts_unicode_words(tmp_path):
+    path = tmp_path / 'work.txt'
+    path.write_text(TEXT, encoding='utf-8')
+    counts = main.analyse_work(str(path), lexicon.StopwordLexicon(['THE']), raw=True,
+                               ttr_window=len(WORDS))
+    assert counts['mattr'] == 1.0
+    assert counts['spectrum'] == [[1, len(WORDS)]]
+
+
+def test_word_analyser_batches_match_whole_text():
+    tokens = raw_tokens(TEXT + ' The cat ran.')
+    whole = word.WordAnalyser()
+    whole.analyse_words(tokens)
+    batched = word.WordAnalyser()
+    for i in range(0, len(tokens), 3):
+        batched.update_words(tokens[i:i + 3])
+    assert batched.word_occ.values.tolist() == whole.word_occ.values.tolist()
+    other = word.WordAnalyser()
+    other.analyse_words(raw_tokens('the cat'))
+    batched.merge(other).subtract(other)
+    assert batched.word_count == whole.word_count
+    assert (batched.get_word_length_frequency().values.tolist() ==
+            whole.get_word_length_frequency().values.tolist())
+
+
+def test_spectrum_matches_word_occurrences():
+    extractor = extr.FeatureExtractor(lexicon.StopwordLexicon(['THE']))
+    extractor.extract('the cat and the dog and the bird'.split())
+    pairs = extractor.get_counts()['spectrum']
+    assert pairs == [[1, 3], [2, 1], [3, 1]]
+    assert richness.spectrum_from_pairs(pairs).tolist() == [0, 3, 1, 1]
+
+
+def test_ngrams_are_hashed_or_pruned_not_both():
+    with pytest.raises(ValueError):
+        ngram.NGramAnalyser(n=2, kind='word', hash_width=64, top_k=10)
@@ -1,22 +1,99 @@
 # -*- coding: utf-8 -*-
 """
 Created on         : 19/05/2018
-Last modified on   : 27/05/2018
+Last modified on   : 17/10/2026
 Author             : Satyabrat Borgohain
 Description :
     
     This class visulises the results of the previous analysis done by the other
     classes. It is used to help extract the stylometrics of the different works.
+    NumPy and pandas are only imported when the statistics are read, and
+    Matplotlib when the figures are drawn.
 
     Objects of this class can be created for standalone puposes.
 """
 
 
 
-import string
-import pandas as pd
-from lxml import html
-import requests
+import os
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+import character as char
+import featurestore as fstore
+
+#Names of the visualisations drawn by render_all, in order
+VISUALISATIONS = ('punctuation', 'character', 'stopword', 'wordlength')
+
+def figure_digest(df, plots):
+    """Hashes the data and the settings of a group of figures.
+
+    Arguments:
+        df (pandas DataFrame): The data plotted.
+        plots (list): The kind and keyword arguments of each plot.
+
+    Returns:
+        digest (string): The SHA-256 hex digest.
+
+    """
+
+    import matplotlib
+    import pandas as pd
+
+    digest = hashlib.sha256(pd.util.hash_pandas_object(df).values.tobytes())
+    digest.update(repr((list(df.columns), plots, matplotlib.__version__)).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def render_figures(name, df, plots, output_dir=None):
+    """Draws a group of figures from the data of a visualisation.
+
+    Function for plotting each figure of a group. If an output folder is given,
+    the figures are saved as <name>_<number>.png and closed at once, and they
+    are not drawn again if the data and settings are the same as the last time
+    they were saved. It can be run in a worker process.
+
+    Arguments:
+        name (string): The name of the group.
+        df (pandas DataFrame): The data plotted, one column per work.
+        plots (list): The kind and keyword arguments of each plot.
+        output_dir (string): The folder the figures are saved to.
+
+    Returns:
+        paths (list): The paths of the saved figures.
+
+    """
+
+    if output_dir is None:
+        for kind, kwargs in plots:
+            getattr(df.plot, kind)(**kwargs)
+        return []
+
+    import numpy as np
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    paths = [os.path.join(output_dir, '%s_%d.png' % (name, i))
+             for i in range(1, len(plots) + 1)]
+    digest = figure_digest(df, plots)
+    digest_path = os.path.join(output_dir, name + '.sha256')
+    #Skipping the group if its figures were saved from the same data
+    if os.path.exists(digest_path) and all(os.path.exists(x) for x in paths):
+        with open(digest_path, 'r') as file:
+            if file.read() == digest:
+                return paths
+
+    for path, (kind, kwargs) in zip(paths, plots):
+        axes = getattr(df.plot, kind)(**kwargs)
+        figure = np.ravel(axes)[0].get_figure()
+        figure.savefig(path)
+        plt.close(figure)
+    with open(digest_path, 'w') as file:
+        file.write(digest)
+
+    return paths
+
+
 
 class AnalysisVisualiser:
     """A visualiser class with methods to visualise and produce plots for analysis
@@ -24,18 +101,115 @@ class AnalysisVisualiser:
     
     """
     
-    def __init__(self, all_text_stats):
+    def __init__(self, all_text_stats, stopwords=None, output_dir=None):
         """Creates a AnalysisVisualiser object, a dataframe of dataframe, containing
         all analysis statistics, which needes to be passed during the initialisation.
         
+        The occurrences are converted to relative frequencies once, into the
+        works x features dataframe self.features, which the visualisations
+        only read. A FeatureStore can be passed instead of the dataframe of
+        dataframes, in which case self.all_stats is None.
+        
         Arguments:
             all_text_stats (pandas DataFrame): The list of tokens.
+            stopwords (StopwordLexicon): The stopwords to be visualised, the ones
+                in the statistics if not given.
+            output_dir (string): The folder the figures are saved to without
+                being displayed, the figures are left open if not given.
         
         """
 
-        self.all_stats = all_text_stats.copy()
-        #Storing the works (different written texts)
-        self.works = self.all_stats['work'].tolist()
+        import pandas as pd
+
+        if isinstance(all_text_stats, fstore.FeatureStore):
+            self.all_stats = None
+            #Storing the works (different written texts)
+            self.works = [record.work for record in all_text_stats.records]
+            counts = dict((name, pd.DataFrame(all_text_stats.get_matrix(name),
+                                              columns=all_text_stats.vocabularies[name].labels))
+                          for name in all_text_stats.get_statistics())
+        else:
+            self.all_stats = all_text_stats.copy()
+            #Storing the works (different written texts)
+            self.works = self.all_stats['work'].tolist()
+            #Aligning the occurrences of the works on their labels, as long words
+            #add extra word length buckets, older stats having no sentences and lines
+            counts = dict((name, pd.concat([x.set_index(label)['occurence'] for x in
+                                            self.all_stats[name]], axis=1).T.fillna(0))
+                          for name, label in fstore.LABELS.items()
+                          if name in self.all_stats)
+        if stopwords is not None:
+            counts['stop_freq'] = counts['stop_freq'].reindex(columns=list(stopwords),
+                                                              fill_value=0)
+        self.features = self._normalise(counts)
+        self.output_dir = output_dir
+        if output_dir is not None:
+            #Rendering without a display
+            import matplotlib
+            matplotlib.use('Agg')
+            os.makedirs(output_dir, exist_ok=True)
+        #Figure groups collected by render_all instead of being drawn at once
+        self._pending = None
+    
+    
+    def _normalise(self, counts):
+        """Converts the occurrences of all the works to relative frequencies.
+    
+        Function for dividing the occurrences of each statistic by the total it
+        is relative to: the alphabets and numerals for the characters, all the
+        characters for the punctuations, the words for the stopwords and
+        word lengths and the sentences or lines for their distributions.
+    
+        Arguments:
+            counts (dict): The works x labels occurrences of each statistic.
+    
+        Returns:
+            features (pandas DataFrame): The works x features dataframe, with
+                the 'count' and 'frequency' of each (statistic, label) side by side.
+    
+        """
+        
+        import numpy as np
+        import pandas as pd
+
+        characters = counts['char_freq']
+        alphanumerics = [x for x in characters.columns
+                         if char.character_group(x) in ('letter', 'numeral')]
+        counts = dict(counts, char_freq=characters[alphanumerics])
+        totals = {'char_freq': counts['char_freq'].sum(axis=1),
+                  'punc_freq': characters.sum(axis=1),
+                  'stop_freq': counts['word_len_freq'].sum(axis=1),
+                  'word_len_freq': counts['word_len_freq'].sum(axis=1)}
+        for name in fstore.SEGMENTS:
+            if name in counts:
+                totals[name] = counts[name].sum(axis=1)
+        
+        #Works without any occurrence get frequencies of zero
+        frequencies = dict((name, counts[name].div(totals[name].replace(0, np.nan),
+                                                   axis=0).fillna(0))
+                           for name in counts)
+        features = pd.concat({'count': pd.concat(counts, axis=1),
+                              'frequency': pd.concat(frequencies, axis=1)}, axis=1)
+        features.index = self.works
+        
+        return features
+    
+    
+    def get_frequency_frame(self, name):
+        """Getter for the relative frequencies of a statistic across all the works.
+    
+        Arguments:
+            name (string): The statistic, one of the keys of featurestore.LABELS.
+    
+        Returns:
+            df (pandas DataFrame): A copy of the frequencies with one row per label
+                and one column per work, without the labels absent from every work.
+    
+        """
+        
+        df = self.features['frequency'][name].T
+        # Filtering all rows with only zeros and discarding them
+        return df[(df.T != 0).any()]
     
     
     def visualise_character_frequency(self):
@@ -52,35 +226,18 @@ class AnalysisVisualiser:
     
         """
         
-        #Location of the character frequency column in the df
-        j = self.all_stats.columns.get_loc("char_freq")
-        
-        for i in range(0,len(self.all_stats)):
-            temp_df = self.all_stats.iloc[i, j]
-            #Droping all rows with punctuations based on ASCII order of characters
-            temp_df.drop(temp_df[(temp_df.character < '0') | (temp_df.character > 
-                                 '9') & (temp_df.character < 'A') | 
-                                (temp_df.character > 'Z')].index, inplace=True)
-
-        
-            #Convert occurences to frequencies
-            total = self.all_stats.iloc[i, j]['occurence'].sum()
-            self.all_stats.iloc[i, j]['occurence'] = self.all_stats.iloc[i, j]['occurence'].map(lambda x: x / total)
-        
-        df_columns = dict([(x,list(self.all_stats.iloc[idx, j]['occurence'])) for idx,x in enumerate(self.works)])
-        df = pd.DataFrame(df_columns, index=list(string.ascii_uppercase+string.digits))
-        
-        # Filtering all rows with only zeros and discarding them
-        df = df[(df.T != 0).any()]
+        df = self.get_frequency_frame('char_freq')
         
         #Plotting graphs
-        #1. Bar chart - with subplots
-        df.plot.bar(rot=0,subplots=True,sharey=True,width=0.9,title=['Relative Character frequencies']+
-                    ['']*(len(self.all_stats)-1),figsize=(12, 10))
-        #2. Bar chart - without subplots
-        df.plot.bar(rot=0,figsize=(20, 10),title='Relative Character frequencies')
-        #3. Line chart
-        df.plot.line(rot=0,figsize=(12, 10),title='Relative Character frequencies')
+        plots = [
+            #1. Bar chart - with subplots
+            ('bar', dict(rot=0,subplots=True,sharey=True,width=0.9,title=['Relative Character frequencies']+
+                         ['']*(len(self.works)-1),figsize=(12, 10))),
+            #2. Bar chart - without subplots
+            ('bar', dict(rot=0,figsize=(20, 10),title='Relative Character frequencies')),
+            #3. Line chart
+            ('line', dict(rot=0,figsize=(12, 10),title='Relative Character frequencies'))]
+        self._render('character_frequency', df, plots)
         
         
     def visualise_punctuation_frequency(self):
@@ -95,27 +252,17 @@ class AnalysisVisualiser:
     
         """
         
-        j = self.all_stats.columns.get_loc("punc_freq")
-        k = self.all_stats.columns.get_loc("char_freq")
-        
-        #Converting occurences to frequencies
-        for i in range(0,len(self.all_stats)):
-            total = self.all_stats.iloc[i, k]['occurence'].sum()
-            self.all_stats.iloc[i, j]['occurence'] = self.all_stats.iloc[i, j]['occurence'].map(lambda x: x / total)
-        
-        df_columns = dict([(x,list(self.all_stats.iloc[idx, j]['occurence'])) for idx,x in enumerate(self.works)])
-        df = pd.DataFrame(df_columns, index=list(string.punctuation))
-        
-        # Filtering all rows with only zeros and discarding them
-        df = df[(df.T != 0).any()]
+        df = self.get_frequency_frame('punc_freq')
         
         #Plotting graphs
-        #1. Bar chart - with subplots
-        df.plot.bar(rot=0,subplots=True,sharey=True,width=0.9,title=['Relative Punctuation frequencies']+['']*(len(self.all_stats)-1),figsize=(12, 10))
-        #2. Bar chart - without subplots
-        df.plot.bar(rot=0,figsize=(20, 10),title='Relative Punctuation frequencies')
-        #3. Line chart
-        df.plot.line(rot=0,figsize=(12, 10),title='Relative Punctuation frequencies')
+        plots = [
+            #1. Bar chart - with subplots
+            ('bar', dict(rot=0,subplots=True,sharey=True,width=0.9,title=['Relative Punctuation frequencies']+['']*(len(self.works)-1),figsize=(12, 10))),
+            #2. Bar chart - without subplots
+            ('bar', dict(rot=0,figsize=(20, 10),title='Relative Punctuation frequencies')),
+            #3. Line chart
+            ('line', dict(rot=0,figsize=(12, 10),title='Relative Punctuation frequencies'))]
+        self._render('punctuation_frequency', df, plots)
         
         
     def visualise_stopword_frequency(self):
@@ -129,32 +276,14 @@ class AnalysisVisualiser:
     
         """
         
-        #Stopwords taken from : http://www.lextek.com/manuals/onix/stopwords1.html
-        html_page = requests.get('http://www.lextek.com/manuals/onix/stopwords1.html')
-        dom = html.fromstring(html_page.content)
-        stopwords = dom.xpath('//pre/text()')[0]
-        stopwords = stopwords.split('\n')
-        #Extracting only the stopwords and storing in a list
-        stopwords = [x.upper() for x in stopwords if x != '' and not x.startswith('#')]
-        
-        j = self.all_stats.columns.get_loc("stop_freq")
-        k = self.all_stats.columns.get_loc("word_len_freq")
-        
-        #Convert occurrences to frequencies
-        for i in range(0,len(self.all_stats)):
-            total = self.all_stats.iloc[i, k]['occurence'].sum()
-            self.all_stats.iloc[i, j]['occurence'] = self.all_stats.iloc[i, j]['occurence'].map(lambda x: x / total)
+        df = self.get_frequency_frame('stop_freq')
         
-        df_columns = dict([(x,list(self.all_stats.iloc[idx, j]['occurence'])) for idx,x in enumerate(self.works)])
-        df = pd.DataFrame(df_columns, index=stopwords)
-        
-        # Filtering all rows with only zeros and discarding them
-        df = df[(df.T != 0).any()]
-        
-        #1. Bar chart - with subplots
-        df.plot.bar(rot=90,subplots=True,sharey=True,width=0.9,title=['Relative Stopword frequencies']+['']*(len(self.all_stats)-1),figsize=(20, 10))
-        #2. Bar chart - without subplots
-        df.plot.bar(rot=90,figsize=(20, 10),title='Relative Stopword frequencies')
+        plots = [
+            #1. Bar chart - with subplots
+            ('bar', dict(rot=90,subplots=True,sharey=True,width=0.9,title=['Relative Stopword frequencies']+['']*(len(self.works)-1),figsize=(20, 10))),
+            #2. Bar chart - without subplots
+            ('bar', dict(rot=90,figsize=(20, 10),title='Relative Stopword frequencies'))]
+        self._render('stopword_frequency', df, plots)
         
     
     def visualise_word_length_frequency(self):
@@ -168,23 +297,71 @@ class AnalysisVisualiser:
     
         """
         
-        j = self.all_stats.columns.get_loc("word_len_freq")
+        df = self.get_frequency_frame('word_len_freq')
         
-        #Convert occurences to frequencies
-        for i in range(0,len(self.all_stats)):
-            total = self.all_stats.iloc[i, j]['occurence'].sum()
-            self.all_stats.iloc[i, j]['occurence'] = self.all_stats.iloc[i, j]['occurence'].map(lambda x: x / total)
-        
-        df_columns = dict([(x,list(self.all_stats.iloc[idx, j]['occurence'])) for idx,x in enumerate(self.works)])
-        df = pd.DataFrame(df_columns, index=range(0,40))
+        plots = [
+            #1. Bar chart - with subplots
+            ('bar', dict(rot=0,subplots=True,sharey=True,width=0.9,title=['Relative Word length frequencies']+['']*(len(self.works)-1),figsize=(12, 10))),
+            #2. Bar chart - without subplots
+            ('bar', dict(rot=0,figsize=(20, 10),title='Relative Word length frequencies')),
+            #3. Line chart
+            ('line', dict(rot=0,figsize=(12, 10),title='Relative Word length frequencies'))]
+        self._render('word_length_frequency', df, plots)
+
         
-        # Filtering all rows with only zeros and discarding them
-        df = df[(df.T != 0).any()]
-        
-        #1. Bar chart - with subplots
-        df.plot.bar(rot=0,subplots=True,sharey=True,width=0.9,title=['Relative Word length frequencies']+['']*(len(self.all_stats)-1),figsize=(12, 10))
-        #2. Bar chart - without subplots
-        df.plot.bar(rot=0,figsize=(20, 10),title='Relative Word length frequencies')
-        #3. Line chart
-        df.plot.line(rot=0,figsize=(12, 10),title='Relative Word length frequencies')
-        
\ No newline at end of file
+
+
+    def render_all(self, workers=1, visualisations=VISUALISATIONS):
+        """Renders the figures of all the visualisations.
+
+        Function for preparing the data of every visualisation and drawing
+        their figures, in a pool of processes if an output folder is given and
+        more than one worker is requested.
+
+        Arguments:
+            workers (int): The number of processes drawing the figures.
+            visualisations (iterable): The names of the visualisations drawn,
+                among VISUALISATIONS.
+
+        Returns:
+            paths (list): The paths of the saved figures.
+
+        """
+
+        methods = {'punctuation': self.visualise_punctuation_frequency,
+                   'character': self.visualise_character_frequency,
+                   'stopword': self.visualise_stopword_frequency,
+                   'wordlength': self.visualise_word_length_frequency}
+        self._pending = []
+        try:
+            for name in visualisations:
+                methods[name]()
+            groups = self._pending
+        finally:
+            self._pending = None
+
+        if not groups:
+            return []
+        if self.output_dir is not None and workers > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(groups))) as executor:
+                results = list(executor.map(render_figures, *zip(*groups)))
+        else:
+            results = [render_figures(*group) for group in groups]
+
+        return [path for paths in results for path in paths]
+
+
+    def _render(self, name, df, plots):
+        """Draws a group of figures, or collects it when called by render_all.
+
+        Arguments:
+            name (string): The name of the group.
+            df (pandas DataFrame): The data plotted, one column per work.
+            plots (list): The kind and keyword arguments of each plot.
+
+        """
+
+        if self._pending is not None:
+            self._pending.append((name, df, plots, self.output_dir))
+        else:
+            render_figures(name, df, plots, self.output_dir)
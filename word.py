@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 """
 Created on         : 19/5/2018
-Last modified on   : 27/5/2018
+Last modified on   : 17/10/2026
 Author             : Satyabrat Borgohain
 Description :
   
@@ -13,25 +13,54 @@ Description :
 
 
 
-import pandas as pd
 from collections import Counter
-import requests
-from lxml import html
-import re
+import lexicon
+import preprocessor as prpscr
 
 class WordAnalyser:
     """A analyser class for analysing tokenised input at the 'word' level.
     
     """
     
+    #Class variable for the regex used to identify words - allows letters of any
+    #script, numerals, ' and -
+    word_pattern = prpscr.WORD_PATTERN
+    #Class variable for the minimum number of word length buckets
+    word_lengths = 40
+    
     def __init__(self):
-        """Initializes a WordAnalyser object which is a pandas DataFrame 
-        with two columns as : 'word' which contains the word and 
-        'occurrence' which holds its corresponding occurrence in the tokenised list.
+        """Initializes a WordAnalyser object which is a Counter of the 
+        occurrence of each word in the tokenised list, read as a pandas 
+        DataFrame with two columns as : 'word' which contains the word and 
+        'occurrence' which holds its corresponding occurrence.
         
         """
         
-        self.word_occ = pd.DataFrame(columns=['word','occurence'])
+        #Instance variable for the occurrences keyed by word, in the order the
+        #words first appeared, and the dataframe built from them when read
+        self.word_count = Counter()
+        self._word_occ = None
+
+
+    @property
+    def word_occ(self):
+        """Getter for the dataframe of word occurrence.
+
+        Function for building the dataframe from the recorded occurrences the
+        first time it is read after they changed, so that adding batches of
+        tokens only updates the Counter.
+
+        Returns:
+            word_occ (pandas DataFrame): The dataframe of word occurrence.
+
+        """
+
+        if self._word_occ is None:
+            import pandas as pd
+
+            self._word_occ = pd.DataFrame(list(self.word_count.items()),
+                                          columns=['word', 'occurence'])
+        return self._word_occ
         
         
     def __str__(self):
@@ -61,44 +90,104 @@ class WordAnalyser:
         
         #Finding the word count in the tokenised list
         #Regex allows only alphabets, numerals, ' and -
-        word_count=Counter([token.upper() for token in tokenised_list if 
-                            re.match("^\d*['-]*[a-zA-Z][a-zA-Z0-9'-]*$", token)])
+        words = list(filter(self.word_pattern.match, tokenised_list))
+        #Words have no spaces, so they are uppercased in one go
+        word_count=Counter(' '.join(words).upper().split(' ') if words else [])
         
         
     
         #Updating the instance variable with the word occurrences
-        self.word_occ = pd.DataFrame(list(word_count.items()), columns=['word', 'occurence'])
+        self.word_count = word_count
+        self._word_occ = None
                 
 
-    def get_stopword_frequency(self):
+    def update_words(self, tokenised_list):
+        """Adds the word occurrences of more tokens.
+    
+        Function for analysing a batch of tokens, e.g. a chunk from
+        Preprocessor.iter_tokens, and adding its word occurrences to the ones
+        already recorded in the instance variable, in time proportional to the
+        batch rather than to the vocabulary.
+
+        Arguments:
+            tokenised_list (iterable): The tokens.
+    
+        """
+        
+        self.word_count.update(token.upper() for token in tokenised_list if
+                               self.word_pattern.match(token))
+        self._word_occ = None
+
+
+    def merge(self, other):
+        """Adds the word occurrences recorded by another analyser.
+    
+        Function for combining the occurrences of analysers fed with different
+        texts, e.g. to build the profile of an author from their works. Words
+        new to this analyser are appended after its own.
+
+        Arguments:
+            other (WordAnalyser): The analyser to be merged.
+
+        Returns:
+            self (WordAnalyser): The analyser, for chaining.
+    
+        """
+        
+        self.word_count.update(other.word_count)
+        self._word_occ = None
+        return self
+
+
+    def subtract(self, other):
+        """Removes the word occurrences recorded by another analyser.
+    
+        Function for taking a text, analysed on its own by the other analyser,
+        back out of the combined occurrences. Words left without any
+        occurrence are dropped.
+
+        Arguments:
+            other (WordAnalyser): The analyser to be subtracted.
+
+        Returns:
+            self (WordAnalyser): The analyser, for chaining.
+    
+        """
+        
+        if any(self.word_count[key] < value for key, value in other.word_count.items()):
+            raise ValueError('Cannot subtract occurrences which were not recorded')
+        self.word_count.subtract(other.word_count)
+        self.word_count = Counter(dict((key, value) for key, value in self.word_count.items()
+                                       if value))
+        self._word_occ = None
+        return self
+                
+
+    def get_stopword_frequency(self, stopwords=None):
         """Getter and analysis of the stopword frequency in the tokenised list.
     
         Function for analysing the stopwords occurrence in the tokenised list.
     
+        Arguments:
+            stopwords (StopwordLexicon): The stopwords to be analysed, the
+                default lexicon if not given.
+    
         Returns:
             stop_occ (pandas DataFrame): The dataframe of stopword occurrence.
     
         """
         
-        #Stopwords taken from : http://www.lextek.com/manuals/onix/stopwords1.html
-        html_page = requests.get('http://www.lextek.com/manuals/onix/stopwords1.html')
-        dom = html.fromstring(html_page.content)
-        stopwords = dom.xpath('//pre/text()')[0]
-        stopwords = stopwords.split('\n')
-        #Extracting only the stopwords and storing in a list
-        stopwords = [x.upper() for x in stopwords if x != '' and not x.startswith('#')]
-
-        #Initializing dataframe to store the stopword occurences only
-        stop_occ = pd.DataFrame({'stopword': stopwords,
-                                 'occurence': [0]*len(stopwords)})
-        #Getting the indices of all stop words in the instance variable
-        indices = pd.Index(stop_occ['stopword'].tolist())
-        for i, row in self.word_occ.iterrows():
-            if row['word'] in stopwords:
-                #Get the index of the stopword in the new dataframe
-                index = indices.get_loc(row['word'])
-                # Assign the occurence of that word
-                stop_occ.iloc[index,stop_occ.columns.get_loc("occurence")] = row['occurence']
+        import numpy as np
+        import pandas as pd
+
+        if stopwords is None:
+            stopwords = lexicon.get_stopwords()
+
+        #Looking up the occurence of every stopword, zero if it is absent
+        stop_occ = pd.DataFrame({'stopword': list(stopwords),
+                                 'occurence': np.fromiter((self.word_count.get(x, 0)
+                                                           for x in stopwords),
+                                                          dtype=np.int64)})
         
         return stop_occ
         
@@ -114,29 +203,18 @@ class WordAnalyser:
     
         """
         
-        #Initializing a df with max word length of 20
-        wl_occ = pd.DataFrame({'wordlength': range(0,40),
-                                 'occurence': [0]*40})
-        
-        word_len_occ = self.word_occ.copy()
-        #Function to calculate the length of each words
-        get_length = lambda x: len(x)
-        #Function to convert/coerce occurence datatype to integer
-        to_integer = lambda y: int(y)
-        word_len_occ['word'] = word_len_occ['word'].map(get_length)
-        word_len_occ['occurence'] = word_len_occ['occurence'].map(to_integer)
-        #Renaming the 'word' column
-        word_len_occ = word_len_occ.rename(columns={'word': 'wordlength'})
-        #Grouping the words with similar lengths and getting the sum of occurence
-        word_len_occ = word_len_occ.groupby('wordlength').sum().reset_index()
-        
-        indices = pd.Index(wl_occ['wordlength'].tolist())
-        for i, row in word_len_occ.iterrows():
-            if row['occurence'] != 0:
-                #Get the index of the word in the new dataframe
-                index = indices.get_loc(row['wordlength'])
-                # Assign the occurence of that word
-                wl_occ.iloc[index,wl_occ.columns.get_loc("occurence")] = row['occurence']
+        import numpy as np
+        import pandas as pd
+
+        lengths = np.fromiter(map(len, self.word_count), dtype=np.int64,
+                              count=len(self.word_count))
+        occurences = np.fromiter(self.word_count.values(), dtype=np.int64,
+                                 count=len(self.word_count))
+        #Summing the occurences of the words of each length, with at least the
+        #default number of buckets and as many as the longest word needs
+        wl_count = np.bincount(lengths, weights=occurences, minlength=self.word_lengths)
+        wl_occ = pd.DataFrame({'wordlength': range(0,len(wl_count)),
+                               'occurence': wl_count.astype(np.int64)})
         
         return wl_occ
         